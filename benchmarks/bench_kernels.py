@@ -0,0 +1,104 @@
+__author__ = "Regenplatz"
+__version__ = "1.0.0"
+
+
+## Compare the per-element zone and direction helpers (np.vectorize and Python loops)
+## and the per-window loop of rule 5 and rule 6 with the array kernels. Run from the repository root:
+##     python -m benchmarks.bench_kernels [number_of_points]
+
+import sys
+import time
+
+import numpy as np
+
+from src.nelson_rules import kernels
+
+
+def _vectorized_outof_std(arr: np.ndarray, f_mean: float, f_std: float, f_std_value: float) -> np.ndarray:
+    def check(x):
+        if x < (f_mean - (f_std_value * f_std)):
+            return 1
+        elif x > (f_mean + (f_std_value * f_std)):
+            return 1
+        else:
+            return 0
+    return np.vectorize(check)(arr)
+
+
+def _vectorized_zscore(arr: np.ndarray, f_mean: float, f_std: float) -> np.ndarray:
+    return np.vectorize(lambda x: (x - f_mean) / f_std)(arr)
+
+
+def _loop_direction_to_mean(arr: np.ndarray, f_mean: float) -> np.ndarray:
+    arr_directions = np.zeros(arr.shape[0], dtype=int)
+    for i in range(arr.shape[0]):
+        if arr[i] < f_mean:
+            arr_directions[i] = -1
+        elif arr[i] > f_mean:
+            arr_directions[i] = 1
+    return arr_directions
+
+
+def _loop_direction_to_previous(arr: np.ndarray) -> np.ndarray:
+    arr_directions = np.zeros(arr.shape[0], dtype=int)
+    for i in range(1, arr.shape[0]):
+        if arr[i] < arr[i - 1]:
+            arr_directions[i] = -1
+        elif arr[i] > arr[i - 1]:
+            arr_directions[i] = 1
+    return arr_directions
+
+
+def _loop_k_of_m(arr_directions: np.ndarray, arr_outof_std: np.ndarray, i_points_window: int,
+                 i_points_out: int) -> np.ndarray:
+    arr_result_points = np.zeros(arr_directions.shape[0], dtype=int)
+    for i in range(i_points_window, arr_directions.shape[0]):
+        arr_window = arr_directions[i - i_points_window : i]
+        if (arr_window == -1).sum() >= i_points_out:
+            arr_cond1 = (arr_window == -1)
+        elif (arr_window == 1).sum() >= i_points_out:
+            arr_cond1 = (arr_window == 1)
+        else:
+            arr_cond1 = np.zeros(i_points_window, dtype=bool)
+        arr_window = arr_outof_std[i - i_points_window : i]
+        if arr_window.sum() >= i_points_out:
+            res_window = arr_cond1 * arr_window
+            if res_window.sum() >= i_points_out:
+                arr_result_points[i - i_points_window : i] = res_window
+    return arr_result_points
+
+
+def _kernel_k_of_m(arr_directions: np.ndarray, arr_outof_std: np.ndarray, i_points_window: int,
+                   i_points_out: int) -> np.ndarray:
+    arr_valid = kernels.valid_windows(np.array([0, arr_directions.shape[0]]), i_points_window, i_skip_last=1)
+    arr_sides = kernels.find_k_of_m_windows(arr_directions, arr_outof_std, i_points_window, i_points_out, arr_valid)
+    return kernels.mark_k_of_m_points(arr_directions, arr_outof_std, arr_sides, i_points_window)
+
+
+def _time(func, *args) -> float:
+    f_start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - f_start
+
+
+def main(i_length: int) -> None:
+    arr = np.random.default_rng(0).normal(size=i_length)
+    f_mean, f_std = np.mean(arr), np.std(arr)
+    l_cases = [
+        ("outof_std", _vectorized_outof_std, kernels.outof_std, (arr, f_mean, f_std, 2.0)),
+        ("zscore", _vectorized_zscore, kernels.zscore, (arr, f_mean, f_std)),
+        ("direction_to_mean", _loop_direction_to_mean, kernels.direction_to_mean, (arr, f_mean)),
+        ("direction_to_previous", _loop_direction_to_previous, kernels.direction_to_previous, (arr,)),
+        ("k_of_m (4 of 5)", _loop_k_of_m, _kernel_k_of_m,
+         (kernels.direction_to_mean(arr, f_mean), kernels.outof_std(arr, f_mean, f_std, 1.0), 5, 4)),
+    ]
+    print(f"{i_length:,} points")
+    print(f"{'kernel':<24}{'per element [s]':>16}{'array [s]':>12}{'speed-up':>10}")
+    for s_name, func_reference, func_kernel, t_args in l_cases:
+        f_reference = _time(func_reference, *t_args)
+        f_kernel = _time(func_kernel, *t_args)
+        print(f"{s_name:<24}{f_reference:>16.3f}{f_kernel:>12.4f}{f_reference / f_kernel:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main(int(float(sys.argv[1])) if len(sys.argv) > 1 else 1_000_000)
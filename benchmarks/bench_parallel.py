@@ -0,0 +1,42 @@
+__author__ = "Regenplatz"
+__version__ = "1.0.0"
+
+
+## Scaling of apply_many with the number of worker processes on synthetic series.
+## Run from the repository root, e.g. for the 10k x 10k workload (about 6 GB of memory):
+##     python -m benchmarks.bench_parallel --series 10000 --points 10000
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from src.nelson_rules.parallel import apply_many
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Scaling of apply_many with the number of workers")
+    parser.add_argument("--series", type=int, default=10_000, help="number of series")
+    parser.add_argument("--points", type=int, default=1_000, help="number of points per series")
+    parser.add_argument("--workers", type=int, nargs="+", default=None, help="numbers of workers to time")
+    args = parser.parse_args()
+
+    i_cpus = os.cpu_count() or 1
+    l_workers = args.workers or sorted({1, 2, 4, 8, 16, i_cpus} & set(range(1, i_cpus + 1)))
+    rng = np.random.default_rng(0)
+    l_series = [rng.normal(size=args.points) for _ in range(args.series)]
+
+    print(f"{args.series:,} series x {args.points:,} points, {i_cpus} CPUs")
+    print(f"{'workers':>8}{'time [s]':>10}{'speed-up':>10}")
+    f_single = None
+    for i_workers in l_workers:
+        f_start = time.perf_counter()
+        apply_many(l_series, i_workers=i_workers)
+        f_time = time.perf_counter() - f_start
+        f_single = f_single or f_time
+        print(f"{i_workers:>8}{f_time:>10.2f}{f_single / f_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
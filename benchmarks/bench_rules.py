@@ -0,0 +1,167 @@
+__author__ = "Regenplatz"
+__version__ = "1.0.0"
+
+
+## Time the construction of NelsonRules, every rule and apply_rules across input sizes,
+## in-control and violation-dense data, and default and other rule settings.
+## Results are stored as JSON, and a previous JSON file can be compared against to spot regressions.
+## Run from the repository root, e.g.:
+##     python -m benchmarks.bench_rules --sizes 1e3 1e5 --output benchmarks/results/new.json --compare old.json
+
+import argparse
+import json
+import os
+import platform
+import time
+import tomllib
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from src.nelson_rules.config import RuleConfig, d_rules
+from src.nelson_rules.nelson_rules import NelsonRules
+
+
+d_other_rules = {
+    "rule1": {"f_std": 2.5},
+    "rule2": {"i_points": 7},
+    "rule3": {"i_points": 5},
+    "rule4": {"i_points": 10},
+    "rule5": {"i_points": 3, "i_points_window": 5, "f_std": 2.0},
+    "rule6": {"i_points": 4, "i_points_window": 5, "f_std": 1.0},
+    "rule7": {"i_points": 12, "f_std": 1.0},
+    "rule8": {"i_points": 6, "f_std": 1.0},
+}
+d_settings = {"default": d_rules, "other": RuleConfig(d_other_rules)}
+
+
+def _in_control(i_length: int, rng: np.random.Generator) -> np.ndarray:
+    return rng.normal(size=i_length)
+
+
+def _violation_dense(i_length: int, rng: np.random.Generator) -> np.ndarray:
+    ## blocks of 50 points: shifts, trends, alternations, stratification and mixtures
+    arr = rng.normal(size=i_length)
+    arr_block = np.arange(i_length) // 50 % 5
+    arr_position = np.arange(i_length) % 50
+    arr[arr_block == 0] += 2.0
+    arr[arr_block == 1] += np.linspace(-3.0, 3.0, 50)[arr_position[arr_block == 1]]
+    arr[arr_block == 2] = np.where(arr_position[arr_block == 2] % 2 == 0, 1.5, -1.5)
+    arr[arr_block == 3] *= 0.2
+    arr[arr_block == 4] += np.where(arr_position[arr_block == 4] % 4 < 2, 2.5, -2.5)
+    return arr
+
+
+d_data = {"in_control": _in_control, "violation_dense": _violation_dense}
+
+
+def _rule_calls(d_rule_settings: Dict) -> Dict[str, Callable[[NelsonRules], None]]:
+    d = d_rule_settings
+    return {
+        "rule1": lambda nr: nr.rule1(f_std_value=d["rule1"]["f_std"]),
+        "rule2": lambda nr: nr.rule2(i_points=d["rule2"]["i_points"]),
+        "rule3": lambda nr: nr.rule3(i_points=d["rule3"]["i_points"]),
+        "rule4": lambda nr: nr.rule4(i_points=d["rule4"]["i_points"]),
+        "rule5": lambda nr: nr.rule5(i_points_window=d["rule5"]["i_points_window"], i_points_out=d["rule5"]["i_points"],
+                                     f_std_value=d["rule5"]["f_std"]),
+        "rule6": lambda nr: nr.rule6(i_points_window=d["rule6"]["i_points_window"], i_points_out=d["rule6"]["i_points"],
+                                     f_std_value=d["rule6"]["f_std"]),
+        "rule7": lambda nr: nr.rule7(i_points=d["rule7"]["i_points"], f_std_value=d["rule7"]["f_std"]),
+        "rule8": lambda nr: nr.rule8(i_points=d["rule8"]["i_points"], f_std_value=d["rule8"]["f_std"]),
+        "apply_rules": lambda nr: nr.apply_rules(),
+        "apply_rules_flags": lambda nr: nr.apply_rules(s_output="flags"),
+    }
+
+
+def _time(func_setup: Callable, func: Callable, f_min_time: float, i_max_repeats: int) -> List[float]:
+    """
+    Time a function on fresh input from func_setup (not timed) until f_min_time is spent or i_max_repeats is reached.
+    """
+    l_times = []
+    while (len(l_times) < i_max_repeats) and (sum(l_times) < f_min_time or len(l_times) < 1):
+        obj = func_setup()
+        f_start = time.perf_counter()
+        func(obj)
+        l_times.append(time.perf_counter() - f_start)
+    return l_times
+
+
+def run(l_sizes: List[int], f_min_time: float, i_max_repeats: int, s_backend: str) -> List[Dict]:
+    l_results = []
+    for i_length in l_sizes:
+        for s_data, func_data in d_data.items():
+            arr = func_data(i_length, np.random.default_rng(0))
+            l_cases = [
+                ("construct_ndarray", "default", lambda: arr, NelsonRules),
+                ("construct_list", "default", lambda: arr.tolist(), NelsonRules),
+                ("construct_series", "default", lambda: pd.Series(arr), NelsonRules),
+            ]
+            for s_settings, d_rule_settings in d_settings.items():
+                for s_case, func in _rule_calls(d_rule_settings).items():
+                    func_setup = lambda d=d_rule_settings: NelsonRules(arr, d, backend=s_backend)
+                    l_cases.append((s_case, s_settings, func_setup, func))
+
+            for s_case, s_settings, func_setup, func in l_cases:
+                l_times = _time(func_setup, func, f_min_time, i_max_repeats)
+                l_results.append({"case": s_case, "points": i_length, "data": s_data, "settings": s_settings,
+                                  "best_s": min(l_times), "mean_s": float(np.mean(l_times)),
+                                  "repeats": len(l_times)})
+                print(f"{s_case:<20}{s_settings:<9}{s_data:<17}{i_length:>12,}{min(l_times):>12.5f}")
+    return l_results
+
+
+def compare(l_results: List[Dict], s_previous: str, f_threshold: float) -> None:
+    """
+    Print the cases that are slower than in a previous JSON file by more than f_threshold (ratio of best times).
+    """
+    with open(s_previous) as f:
+        d_previous = json.load(f)
+    d_best = {(d["case"], d["points"], d["data"], d["settings"]): d["best_s"] for d in d_previous["results"]}
+    print(f"\ncompared to version {d_previous['version']} ({s_previous}, "
+          f"backend {d_previous.get('backend', 'numpy')}), ratio > {f_threshold}:")
+    i_regressions = 0
+    for d in l_results:
+        t_key = (d["case"], d["points"], d["data"], d["settings"])
+        if (t_key in d_best) and (d["best_s"] > f_threshold * d_best[t_key]):
+            i_regressions += 1
+            print(f"{d['case']:<20}{d['settings']:<9}{d['data']:<17}{d['points']:>12,}"
+                  f"{d['best_s'] / d_best[t_key]:>9.2f}x")
+    print(f"{i_regressions} regression(s)")
+
+
+def main() -> None:
+    with open(os.path.join(os.path.dirname(__file__), "..", "pyproject.toml"), "rb") as f:
+        s_version = tomllib.load(f)["project"]["version"]
+
+    parser = argparse.ArgumentParser(description="Timings of every rule across input sizes and settings")
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1e3, 1e4, 1e5, 1e6, 1e7],
+                        help="numbers of points")
+    parser.add_argument("--min-time", type=float, default=0.2, help="minimum time per case [s]")
+    parser.add_argument("--max-repeats", type=int, default=20, help="maximum number of repeats per case")
+    parser.add_argument("--output", default=None,
+                        help="JSON file to store the results in, default: benchmarks/results/bench_rules_<version>")
+    parser.add_argument("--compare", default=None, help="JSON file of previous results")
+    parser.add_argument("--backend", default="numpy", choices=["numpy", "numba"], help="backend of the rules")
+    parser.add_argument("--threshold", type=float, default=1.2, help="ratio of best times reported as regression")
+    args = parser.parse_args()
+    if args.output is None:
+        s_suffix = "" if args.backend == "numpy" else f"_{args.backend}"
+        args.output = os.path.join("benchmarks", "results", f"bench_rules_{s_version}{s_suffix}.json")
+
+    print(f"{'case':<20}{'settings':<9}{'data':<17}{'points':>12}{'best [s]':>12}")
+    l_results = run([int(f_size) for f_size in args.sizes], args.min_time, args.max_repeats, args.backend)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump({"version": s_version, "backend": args.backend, "timestamp": datetime.now(timezone.utc).isoformat(),
+                   "python": platform.python_version(), "numpy": np.__version__, "machine": platform.machine(),
+                   "cpus": os.cpu_count(), "results": l_results}, f, indent=1)
+    print(f"results stored in {args.output}")
+    if args.compare is not None:
+        compare(l_results, args.compare, args.threshold)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+__author__ = "Regenplatz"
+__version__ = "1.0.0"
+
+
+## Synthetic load on the asyncio SPC service: many streams push batches of measurements concurrently,
+## some streams drift out of control. Reports throughput and the p50/p99 ingest-to-alert latency.
+## Run from the repository root:
+##     python -m benchmarks.bench_service [number_of_streams] [batches_per_stream] [points_per_batch]
+
+import asyncio
+import sys
+import time
+
+import numpy as np
+
+from src.nelson_rules.limits import ControlLimits
+from src.nelson_rules.service import SPCService
+
+
+async def _produce(service: SPCService, i_stream: int, i_batches: int, i_batch_size: int) -> None:
+    rng = np.random.default_rng(i_stream)
+    ## every 10th stream drifts away from the mean in its second half
+    f_shift = 1.5 if i_stream % 10 == 0 else 0.0
+    for i_batch in range(i_batches):
+        arr_batch = rng.normal(size=i_batch_size) + (f_shift if i_batch >= i_batches // 2 else 0.0)
+        await service.push(f"stream-{i_stream}", arr_batch)
+        ## yield to the other producers, as a network server would between requests
+        await asyncio.sleep(0)
+
+
+async def _consume(service: SPCService) -> int:
+    i_events = 0
+    async for _ in service.events():
+        i_events += 1
+    return i_events
+
+
+async def run(i_streams: int, i_batches: int, i_batch_size: int) -> None:
+    service = SPCService(ControlLimits(0.0, 1.0), i_queue_size=64)
+    await service.start()
+    task_consumer = asyncio.create_task(_consume(service))
+    f_start = time.perf_counter()
+    await asyncio.gather(*[_produce(service, i_stream, i_batches, i_batch_size) for i_stream in range(i_streams)])
+    await service.stop()
+    f_seconds = time.perf_counter() - f_start
+    i_events = await task_consumer
+
+    d_latencies = service.latency_percentiles((50, 99))
+    print(f"{i_streams:,} streams x {i_batches:,} batches x {i_batch_size:,} points")
+    print(f"{'points/s':<12}{service.i_points / f_seconds:>14,.0f}")
+    print(f"{'events':<12}{i_events:>14,}")
+    for s_percentile, f_latency in d_latencies.items():
+        print(f"{s_percentile + ' [ms]':<12}{f_latency * 1000:>14.3f}")
+
+
+if __name__ == "__main__":
+    l_args = [int(float(s_arg)) for s_arg in sys.argv[1:4]]
+    asyncio.run(run(*(l_args + [1000, 20, 50][len(l_args):])))
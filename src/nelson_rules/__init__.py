@@ -1,4 +1,15 @@
 
+from .batch import BatchNelsonRules
+from .chunked import apply_rules_chunked
+from .config import RuleConfig
+from .flags import pack_flags, unpack_flags, unpack_rule
+from .instrumentation import Instrumentation
+from .limits import ControlLimits, LimitAccumulator
 from .nelson_rules import NelsonRules
+from .parallel import apply_many, summarize_many
+from .service import SPCService, Violation
+from .streaming import StreamingNelsonRules
 
-__all__ = ["NelsonRules"]
\ No newline at end of file
+__all__ = ["BatchNelsonRules", "ControlLimits", "Instrumentation", "LimitAccumulator", "NelsonRules", "RuleConfig",
+           "SPCService", "StreamingNelsonRules", "Violation", "apply_many", "apply_rules_chunked", "pack_flags",
+           "summarize_many", "unpack_flags", "unpack_rule"]
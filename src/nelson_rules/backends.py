@@ -0,0 +1,24 @@
+import warnings
+from types import ModuleType
+
+from . import kernels, kernels_numba
+
+
+l_backends = ["numpy", "numba"]
+
+
+def get_backend(s_backend: str) -> ModuleType:
+    """
+    Get the module of run-length and window kernels (find_runs, find_mixed_windows, find_k_of_m) of a backend.
+    If numba is not installed, the numba backend falls back to numpy with a warning.
+    :param s_backend: str, "numpy" or "numba"
+    :return: module of kernels.
+    """
+    if s_backend == "numpy":
+        return kernels
+    if s_backend == "numba":
+        if kernels_numba.b_available:
+            return kernels_numba
+        warnings.warn("numba is not installed, the numpy backend is used instead", RuntimeWarning, stacklevel=3)
+        return kernels
+    raise ValueError(f"Unknown backend: {s_backend}, choose from {l_backends}")
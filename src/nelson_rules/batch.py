@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Union
+
+from .kernels import segment_mean_std
+from .backends import get_backend
+from .config import RuleConfig, RuleSettings, d_rules
+from .export import to_record_batch
+from .nelson_rules import NelsonRules, dtype_intervals, summary_frame
+
+
+## record of a run of points of a series fulfilling a rule, see BatchNelsonRules.apply_rules(s_output="intervals")
+dtype_batch_intervals = np.dtype([("series", np.int64)] + dtype_intervals.descr)
+
+
+class BatchNelsonRules(NelsonRules):
+    """
+    Evaluation of the Nelson rules on many series (e.g. sensor channels) at once.
+    Each series is checked against its own mean and standard deviation, and no run or window
+    crosses the boundary between two series. All rules run as a few array operations on all series.
+    """
+
+    def __init__(self, arr: Union[np.ndarray, List[np.ndarray]], arr_offsets: Optional[np.ndarray] = None,
+                 d_rule_settings: RuleSettings = d_rules, backend: str = "numpy") -> None:
+        """
+        :param arr: 2D array (series x time), list of 1D arrays of different lengths,
+                or 1D array of all series one after the other (requires arr_offsets)
+        :param arr_offsets: array of series boundaries of a 1D array, e.g. [0, 20, 50] for series of 20 and 30 points
+        :param d_rule_settings: RuleConfig or dictionary of rule settings
+        :param backend: str, "numpy" or "numba", see NelsonRules
+        """
+        if isinstance(arr, list):
+            arr_offsets = np.concatenate(([0], np.cumsum([len(arr_series) for arr_series in arr])))
+            arr = np.concatenate(arr)
+        arr = np.asarray(arr)
+
+        if arr.ndim == 2:
+            ## series of equal length: mean and std along the time axis
+            self.t_shape = arr.shape
+            self.arr_mean = np.mean(arr, axis=1)
+            self.arr_std = np.std(arr, axis=1)
+            self.arr = arr.reshape(-1)
+            self.arr_offsets = np.arange(arr.shape[0] + 1) * arr.shape[1]
+        elif arr_offsets is not None:
+            self.t_shape = None
+            self.arr = arr
+            self.arr_offsets = np.asarray(arr_offsets)
+            self.arr_mean, self.arr_std = segment_mean_std(self.arr, self.arr_offsets)
+        else:
+            raise Exception("Please provide 2D numpy array or 1D numpy array with offsets as input data!")
+
+        ## limits of each point are those of its series
+        arr_lengths = np.diff(self.arr_offsets)
+        self.f_mean = np.repeat(self.arr_mean, arr_lengths)
+        self.f_std = np.repeat(self.arr_std, arr_lengths)
+        self.d_results = {"input_data": self.arr}
+
+        ## rows of a DataFrame, see from_frame
+        self.arr_order: Optional[np.ndarray] = None
+        self.index: Optional[pd.Index] = None
+        self.df_groups: Optional[pd.DataFrame] = None
+
+        self.d_rules = RuleConfig.from_settings(d_rule_settings)
+        self.backend = backend
+        self._kernels = get_backend(backend)
+
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, by: Union[str, List[str]], value: str, order: Optional[str] = None,
+                   d_rule_settings: RuleSettings = d_rules, backend: str = "numpy") -> "BatchNelsonRules":
+        """
+        Set up the evaluation of a long-format DataFrame with one series per group (e.g. per machine and
+        characteristic). Rows are sorted once by group (and order), so that all groups are evaluated at once.
+        :param df: DataFrame of input data
+        :param by: str or list of str, column(s) defining the groups
+        :param value: str, column of data points
+        :param order: str, column defining the order of data points within each group, default: order of the rows
+        :param d_rule_settings: RuleConfig or dictionary of rule settings
+        :param backend: str, "numpy" or "numba", see NelsonRules
+        :return: BatchNelsonRules of all groups, see apply_rules(s_output="frame") for results aligned to the rows.
+        """
+        l_by = [by] if isinstance(by, str) else list(by)
+        arr_groups = df.groupby(l_by, sort=False, dropna=False).ngroup().to_numpy()
+        if order is None:
+            arr_order = np.argsort(arr_groups, kind="stable")
+        else:
+            arr_order = np.lexsort((df[order].to_numpy(), arr_groups))
+        arr_offsets = np.concatenate(([0], np.cumsum(np.bincount(arr_groups))))
+
+        br = cls(df[value].to_numpy()[arr_order], arr_offsets=arr_offsets, d_rule_settings=d_rule_settings,
+                 backend=backend)
+        br.arr_order = arr_order
+        br.index = df.index
+        br.df_groups = df[l_by].iloc[arr_order[arr_offsets[:-1]]].reset_index(drop=True)
+        return br
+
+
+    def _to_columns(self, rules: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Evaluate z-scores and rule results as narrow columns (see NelsonRules._to_columns),
+        in the order of the rows of the input DataFrame for from_frame.
+        :param rules: list of rules to evaluate, e.g. ["rule1", "rule2"], default: all rules
+        :return: dictionary of result columns.
+        """
+        d_columns = super()._to_columns(rules)
+        if self.arr_order is None:
+            return d_columns
+        ## scatter results back from the sorted rows to the rows of the DataFrame
+        arr_rows = np.empty_like(self.arr_order)
+        arr_rows[self.arr_order] = np.arange(self.arr_order.shape[0])
+        return {s_key: arr_column[arr_rows] for s_key, arr_column in d_columns.items()}
+
+
+    def apply_rules(self, s_output: str = "dict",
+                    rules: Optional[List[str]] = None) -> Union[Dict[str, np.array], np.ndarray, pd.DataFrame]:
+        """
+        Apply all rules to all series and load results to result dictionary.
+        :param s_output: str, "dict" for the result dictionary, "flags" for a compact uint16 array
+                with one bit per rule result for each point (see flags.unpack_rule), "intervals"
+                for a structured array of runs of points (series, rule, start, exclusive end) fulfilling each rule,
+                "frame" for a DataFrame of z-scores and int8 rule results aligned to the rows of the input data,
+                or "arrow" for a pa.RecordBatch of the same columns (requires pyarrow)
+        :param rules: list of rules to evaluate, e.g. ["rule1", "rule2"], default: all rules
+        :return: result dictionary or array of flags, containing 2D arrays (series x time) for 2D input data
+                and 1D arrays of all series one after the other otherwise, array of intervals with indices
+                relative to the start of each series, DataFrame, or pa.RecordBatch.
+        """
+        if s_output == "frame":
+            return pd.DataFrame(self._to_columns(rules), index=self.index, copy=False)
+        if s_output == "arrow":
+            return to_record_batch(self._to_columns(rules))
+        results = super().apply_rules(s_output=s_output, rules=rules)
+        if s_output == "intervals":
+            arr_intervals = np.empty(results.shape[0], dtype=dtype_batch_intervals)
+            arr_intervals["series"] = np.searchsorted(self.arr_offsets, results["start"], side="right") - 1
+            arr_intervals["rule"] = results["rule"]
+            arr_intervals["start"] = results["start"] - self.arr_offsets[arr_intervals["series"]]
+            arr_intervals["end"] = results["end"] - self.arr_offsets[arr_intervals["series"]]
+            return arr_intervals
+        if self.t_shape is None:
+            return results
+        if isinstance(results, np.ndarray):
+            return results.reshape(self.t_shape)
+        return {s_key: arr_result.reshape(self.t_shape) for s_key, arr_result in results.items()}
+
+
+    def summarize(self, rules: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Apply all rules (or the selected rules) to all series and aggregate their results per series
+        (see NelsonRules.summarize), without result arrays per point.
+        :param rules: list of rules to evaluate, e.g. ["rule1", "rule2"], default: all rules
+        :return: DataFrame with one row per series and rule result: series (and the group columns for
+                from_frame), result, points, events, first and last (indices relative to the start of the series).
+        """
+        df_summary = summary_frame(self._summarize(rules))
+        if self.df_groups is None:
+            return df_summary
+        df_groups = self.df_groups.iloc[df_summary["series"].to_numpy()].reset_index(drop=True)
+        return pd.concat([df_summary[["series"]], df_groups, df_summary.drop(columns="series")], axis=1)
@@ -0,0 +1,55 @@
+import os
+import numpy as np
+from typing import Optional, Union
+
+from .config import RuleConfig, RuleSettings, d_rules
+from .limits import ControlLimits, LimitAccumulator
+from .nelson_rules import NelsonRules, as_input_array
+
+
+def apply_rules_chunked(arr_input: Union[np.ndarray, memoryview], arr_output: Union[np.ndarray, str, None] = None,
+                        i_chunk_size: int = 1_000_000,
+                        d_rule_settings: RuleSettings = d_rules,
+                        limits: Optional[ControlLimits] = None) -> np.ndarray:
+    """
+    Apply all rules to data that does not fit into memory, e.g. a np.memmap of a binary float64 file.
+    Unless fixed control limits are given, mean and standard deviation are evaluated in one pass over the data
+    first. The rules are then applied chunk by chunk, and each chunk is extended by the largest window on both
+    sides, so that runs crossing the boundary between two chunks are detected. Memory usage depends on the
+    chunk size only.
+    :param arr_input: 1D array (e.g. np.memmap) or object with buffer interface (e.g. memoryview) of numeric values;
+            raw bytes (e.g. bytes, or a memoryview of format "B") are read as float64 values
+    :param arr_output: uint16 array (e.g. np.memmap) or path of a file to write the flags to,
+            default: a new array in memory
+    :param i_chunk_size: int, number of points per chunk
+    :param d_rule_settings: RuleConfig or dictionary of rule settings
+    :param limits: fixed control limits (mean, std), default: mean and std of the input data
+    :return: uint16 array of flags, one bit per rule result (see flags.unpack_rule).
+    """
+    if not isinstance(arr_input, np.ndarray):
+        if memoryview(arr_input).format == "B":
+            arr_input = np.frombuffer(arr_input, dtype=np.float64)
+        else:
+            ## typed buffers are read in their own format, e.g. float32 values
+            arr_input = as_input_array(arr_input)
+    i_length = arr_input.shape[0]
+    if isinstance(arr_output, (str, os.PathLike)):
+        arr_output = np.memmap(arr_output, dtype=np.uint16, mode="w+", shape=(i_length,))
+    elif arr_output is None:
+        arr_output = np.zeros(i_length, dtype=np.uint16)
+
+    config = RuleConfig.from_settings(d_rule_settings)
+    i_halo = config.i_max_window
+    if limits is None:
+        limits = LimitAccumulator.from_data(arr_input, i_chunk_size).to_limits()
+
+    for i_start in range(0, i_length, i_chunk_size):
+        i_end = min(i_start + i_chunk_size, i_length)
+        i_halo_start, i_halo_end = max(i_start - i_halo, 0), min(i_end + i_halo, i_length)
+        nr = NelsonRules(np.asarray(arr_input[i_halo_start:i_halo_end]), config, limits=limits)
+        arr_flags = nr.apply_rules(s_output="flags")
+        arr_output[i_start:i_end] = arr_flags[i_start - i_halo_start : i_end - i_halo_start]
+
+    if isinstance(arr_output, np.memmap):
+        arr_output.flush()
+    return arr_output
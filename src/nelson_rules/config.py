@@ -0,0 +1,141 @@
+import numbers
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Dict, Iterator, Optional, Union
+
+
+d_rules = {
+    "rule1": {"f_std": 3.0},
+    "rule2": {"i_points": 9},
+    "rule3": {"i_points": 6},
+    "rule4": {"i_points": 14},
+    "rule5": {"i_points": 3, "i_points_window": 2, "f_std": 2.0},
+    "rule6": {"i_points": 5, "i_points_window": 4, "f_std": 1.0},
+    "rule7": {"i_points": 15, "f_std": 1.0},
+    "rule8": {"i_points": 8, "f_std": 1.0},
+}
+
+
+class RuleConfig(Mapping):
+    """
+    Immutable, validated rule settings. The settings of each rule are merged into the default settings (d_rules),
+    e.g. RuleConfig({"rule2": {"i_points": 7}}). A RuleConfig can be shared by any number of evaluations
+    (also in several threads or processes) and is read like the dictionary of rule settings,
+    e.g. config["rule5"]["i_points_window"].
+    """
+
+    __slots__ = ("_d_rules", "_i_hash", "i_max_window")
+
+    def __init__(self, d_rule_settings: Optional[Dict[str, Dict[str, Union[float, int]]]] = None) -> None:
+        """
+        :param d_rule_settings: dictionary of rule settings, default: d_rules
+        """
+        d_settings = {s_rule: dict(d_defaults) for s_rule, d_defaults in d_rules.items()}
+        for s_rule, d_rule in (d_rule_settings or {}).items():
+            if s_rule not in d_rules:
+                raise ValueError(f"Unknown rule: {s_rule}")
+            for s_setting, value in d_rule.items():
+                d_settings[s_rule][s_setting] = self._validate(s_rule, s_setting, value)
+
+        object.__setattr__(self, "_d_rules", MappingProxyType(
+            {s_rule: MappingProxyType(d_rule) for s_rule, d_rule in d_settings.items()}))
+        object.__setattr__(self, "_i_hash", hash(tuple(
+            (s_rule, tuple(sorted(d_rule.items()))) for s_rule, d_rule in d_settings.items())))
+
+        ## largest number of points in a row that any rule looks at
+        object.__setattr__(self, "i_max_window", max(
+            [d_settings[s_rule]["i_points"] for s_rule in ["rule2", "rule3", "rule4", "rule7", "rule8"]] +
+            [d_settings[s_rule]["i_points_window"] for s_rule in ["rule5", "rule6"]] + [1]))
+
+
+    @staticmethod
+    def _validate(s_rule: str, s_setting: str, value: Union[float, int]) -> Union[float, int]:
+        """
+        Check a setting: numbers of points are non-negative integers, numbers of standard deviations
+        are non-negative numbers.
+        :param s_rule: str, rule, e.g. "rule5"
+        :param s_setting: str, setting, e.g. "i_points"
+        :param value: value of the setting
+        :return: value as int or float.
+        """
+        if s_setting not in d_rules[s_rule]:
+            raise ValueError(f"Unknown setting of {s_rule}: {s_setting}")
+        if s_setting.startswith("i_"):
+            if isinstance(value, bool) or not isinstance(value, numbers.Integral) or (value < 0):
+                raise ValueError(f"{s_rule}.{s_setting} must be a non-negative integer, got {value!r}")
+            return int(value)
+        if isinstance(value, bool) or not isinstance(value, numbers.Real) or not (0 <= value < float("inf")):
+            raise ValueError(f"{s_rule}.{s_setting} must be a non-negative number, got {value!r}")
+        return float(value)
+
+
+    @classmethod
+    def from_settings(cls, d_rule_settings: Union["RuleConfig", Dict[str, Dict[str, Union[float, int]]], None]
+                      ) -> "RuleConfig":
+        """
+        Get the rule configuration of rule settings, without validating them again if they are a RuleConfig already.
+        :param d_rule_settings: RuleConfig or dictionary of rule settings
+        :return: RuleConfig.
+        """
+        if isinstance(d_rule_settings, cls):
+            return d_rule_settings
+        if (d_rule_settings is None) or (d_rule_settings is d_rules):
+            return rule_config_default
+        return cls(d_rule_settings)
+
+
+    def replace(self, d_rule_settings: Dict[str, Dict[str, Union[float, int]]]) -> "RuleConfig":
+        """
+        Get a new rule configuration with some settings changed.
+        :param d_rule_settings: dictionary of rule settings to change
+        :return: RuleConfig.
+        """
+        d_settings = self.to_dict()
+        for s_rule, d_rule in d_rule_settings.items():
+            d_settings.setdefault(s_rule, {}).update(d_rule)
+        return RuleConfig(d_settings)
+
+
+    def to_dict(self) -> Dict[str, Dict[str, Union[float, int]]]:
+        """
+        :return: dictionary of rule settings (a copy).
+        """
+        return {s_rule: dict(d_rule) for s_rule, d_rule in self._d_rules.items()}
+
+
+    def __getitem__(self, s_rule: str) -> Mapping:
+        return self._d_rules[s_rule]
+
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._d_rules)
+
+
+    def __len__(self) -> int:
+        return len(self._d_rules)
+
+
+    def __hash__(self) -> int:
+        return self._i_hash
+
+
+    def __setattr__(self, s_name: str, value) -> None:
+        raise AttributeError("RuleConfig is immutable, use replace() to change settings")
+
+
+    def __delattr__(self, s_name: str) -> None:
+        raise AttributeError("RuleConfig is immutable, use replace() to change settings")
+
+
+    def __reduce__(self):
+        return RuleConfig, (self.to_dict(),)
+
+
+    def __repr__(self) -> str:
+        return f"RuleConfig({self.to_dict()!r})"
+
+
+rule_config_default = RuleConfig()
+
+## rule settings accepted by all evaluations: RuleConfig or dictionary of rule settings
+RuleSettings = Union[RuleConfig, Dict[str, Dict[str, Union[float, int]]]]
@@ -0,0 +1,47 @@
+import numpy as np
+from typing import Dict, Union
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+## Columnar export of results (see NelsonRules.apply_rules(s_output="arrow")). The Arrow arrays use the buffers
+## of the result arrays without copying them. pyarrow is optional: without it, b_available is False.
+
+b_available = pa is not None
+
+
+def _check_pyarrow() -> None:
+    """
+    Check that pyarrow is installed.
+    """
+    if not b_available:
+        raise ImportError("Please install pyarrow for Arrow and Parquet output, e.g. pip install nelson-rules[arrow]")
+
+
+def to_record_batch(d_columns: Dict[str, np.ndarray]) -> "pa.RecordBatch":
+    """
+    Convert result columns into an Arrow record batch without copying them.
+    :param d_columns: dictionary of 1D result arrays, e.g. {"zscore": [...], "rule1": [...]}
+    :return: pa.RecordBatch with one column per result.
+    """
+    _check_pyarrow()
+    return pa.RecordBatch.from_arrays([pa.array(arr_column) for arr_column in d_columns.values()],
+                                      names=list(d_columns))
+
+
+def write_parquet(results: Union["pa.RecordBatch", "pa.Table"], path, **kwargs) -> None:
+    """
+    Write results to a Parquet file.
+    :param results: pa.RecordBatch or pa.Table, e.g. NelsonRules.apply_rules(s_output="arrow")
+    :param path: path of the Parquet file
+    :param kwargs: further arguments of pyarrow.parquet.write_table, e.g. compression="zstd"
+    """
+    _check_pyarrow()
+    if isinstance(results, pa.RecordBatch):
+        results = pa.Table.from_batches([results])
+    pq.write_table(results, path, **kwargs)
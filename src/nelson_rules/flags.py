@@ -0,0 +1,37 @@
+import numpy as np
+from typing import Dict
+
+from .nelson_rules import d_rule_bits
+
+
+def unpack_rule(arr_flags: np.ndarray, s_key: str, dtype: type = int) -> np.ndarray:
+    """
+    Expand the result of a single rule from compact flags (see NelsonRules.apply_rules(s_output="flags")).
+    :param arr_flags: uint16 array of flags, one bit per rule result
+    :param s_key: str, name of the rule result, e.g. "rule4" or "rule5_points"
+    :param dtype: data type of the result array, e.g. bool
+    :return: array containing classification info.
+    """
+    return ((arr_flags >> d_rule_bits[s_key]) & 1).astype(dtype)
+
+
+def unpack_flags(arr_flags: np.ndarray, dtype: type = int) -> Dict[str, np.ndarray]:
+    """
+    Expand the results of all rules from compact flags.
+    :param arr_flags: uint16 array of flags, one bit per rule result
+    :param dtype: data type of the result arrays, e.g. bool
+    :return: dictionary of result arrays, see NelsonRules.apply_rules().
+    """
+    return {s_key: unpack_rule(arr_flags, s_key, dtype=dtype) for s_key in d_rule_bits}
+
+
+def pack_flags(d_results: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Pack the rule results of a result dictionary into compact flags.
+    :param d_results: result dictionary, see NelsonRules.apply_rules()
+    :return: uint16 array of flags, one bit per rule result.
+    """
+    arr_flags = np.zeros(np.shape(d_results["rule1"]), dtype=np.uint16)
+    for s_key, i_bit in d_rule_bits.items():
+        arr_flags |= np.asarray(d_results[s_key], dtype=np.uint16) << i_bit
+    return arr_flags
@@ -0,0 +1,128 @@
+import functools
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, Optional, Union
+
+import numpy as np
+
+
+## instrumentation that records the evaluations of the current thread, None if disabled
+_active: ContextVar[Optional["Instrumentation"]] = ContextVar("nelson_rules_instrumentation", default=None)
+
+## metrics recorded for each step: name, Prometheus type and help text
+l_metrics = [
+    ("calls", "counter", "Number of evaluations of each step."),
+    ("seconds", "counter", "Wall time spent in each step."),
+    ("points", "counter", "Number of data points processed by each step."),
+    ("bytes", "counter", "Number of bytes allocated for the results of each step."),
+]
+
+
+class Instrumentation:
+    """
+    Opt-in recording of wall time, number of data points and bytes allocated for the results of each rule
+    (rule1, ..., rule8) and each shared pre-pass (e.g. zscore, direction_mean, zone_index, outof_std_2.0).
+    Evaluations are recorded while the instrumentation is active as context manager in the current thread,
+    e.g. with Instrumentation() as ins: nr.apply_rules(). The time of a rule includes the pre-passes it
+    evaluates first, which are recorded separately, too. Without active instrumentation, nothing is recorded.
+    """
+
+    def __init__(self, callback: Optional[Callable[[str, float, int, int], None]] = None) -> None:
+        """
+        :param callback: function called after each step with name, seconds, number of points and bytes
+        """
+        self.callback = callback
+        self.d_steps: Dict[str, Dict[str, Union[int, float]]] = {}
+        self._l_tokens = []
+
+
+    def __enter__(self) -> "Instrumentation":
+        self._l_tokens.append(_active.set(self))
+        return self
+
+
+    def __exit__(self, *args) -> None:
+        _active.reset(self._l_tokens.pop())
+
+
+    def record(self, s_name: str, f_seconds: float, i_points: int, i_bytes: int) -> None:
+        """
+        Add the evaluation of a step to the records.
+        :param s_name: str, name of the step, e.g. "rule1" or "zone_index"
+        :param f_seconds: float, wall time
+        :param i_points: int, number of data points
+        :param i_bytes: int, number of bytes of the results
+        """
+        d_step = self.d_steps.setdefault(s_name, {"calls": 0, "seconds": 0.0, "points": 0, "bytes": 0})
+        d_step["calls"] += 1
+        d_step["seconds"] += f_seconds
+        d_step["points"] += i_points
+        d_step["bytes"] += i_bytes
+        if self.callback is not None:
+            self.callback(s_name, f_seconds, i_points, i_bytes)
+
+
+    def to_dict(self) -> Dict[str, Dict[str, Union[int, float]]]:
+        """
+        Export the records.
+        :return: dictionary of the metrics (calls, seconds, points, bytes) of each step.
+        """
+        return {s_name: dict(d_step) for s_name, d_step in self.d_steps.items()}
+
+
+    def to_prometheus(self, s_prefix: str = "nelson_rules") -> str:
+        """
+        Export the records in Prometheus text format, one metric family per metric with a label per step.
+        :param s_prefix: str, prefix of the metric names
+        :return: str, e.g. 'nelson_rules_step_seconds_total{step="rule1"} 0.0012'.
+        """
+        l_lines = []
+        for s_metric, s_type, s_help in l_metrics:
+            s_family = f"{s_prefix}_step_{s_metric}_total"
+            l_lines.append(f"# HELP {s_family} {s_help}")
+            l_lines.append(f"# TYPE {s_family} {s_type}")
+            for s_name, d_step in self.d_steps.items():
+                l_lines.append(f'{s_family}{{step="{s_name}"}} {d_step[s_metric]}')
+        return "\n".join(l_lines) + "\n"
+
+
+def _nbytes(result) -> int:
+    """
+    Get the number of bytes of an array or of a tuple of arrays (e.g. intervals).
+    """
+    if isinstance(result, tuple):
+        return sum(_nbytes(x) for x in result)
+    return result.nbytes if isinstance(result, np.ndarray) else 0
+
+
+def measure(s_name: str, i_points: int, func: Callable, /, *args, **kwargs):
+    """
+    Call a function and record the call as step, if instrumentation is active.
+    :param s_name: str, name of the step
+    :param i_points: int, number of data points
+    :param func: function to call
+    :return: result of the function.
+    """
+    instrumentation = _active.get()
+    if instrumentation is None:
+        return func(*args, **kwargs)
+    f_start = time.perf_counter()
+    result = func(*args, **kwargs)
+    instrumentation.record(s_name, time.perf_counter() - f_start, i_points, _nbytes(result))
+    return result
+
+
+def instrumented(s_name: str) -> Callable:
+    """
+    Decorator of NelsonRules methods that records each call as step, if instrumentation is active.
+    :param s_name: str, name of the step
+    :return: decorator.
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if _active.get() is None:
+                return func(self, *args, **kwargs)
+            return measure(s_name, self.arr_length, func, self, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,384 @@
+import numpy as np
+from typing import Optional, Tuple
+
+
+##### RUN-LENGTH ENGINE ##########################################################
+
+def find_runs(arr_states: np.ndarray, i_points: int,
+              arr_offsets: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find runs of equal, non-zero states that are at least i_points elements long.
+    :param arr_states: 1D array of states, e.g. directions (-1, 0, 1); zero marks "no state"
+    :param i_points: int, minimum number of points in a row
+    :param arr_offsets: array of segment boundaries (e.g. [0, 20, 40] for two series of 20 points);
+            runs do not cross segment boundaries
+    :return: arrays of start indices and (exclusive) end indices of the runs.
+    """
+    i_length = arr_states.shape[0]
+    if (i_points < 1) or (i_length < i_points):
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+
+    ## change points (and segment boundaries) split the array into runs of equal states
+    arr_changes = arr_states[1:] != arr_states[:-1]
+    if arr_offsets is not None:
+        arr_changes[arr_offsets[(arr_offsets > 0) & (arr_offsets < i_length)] - 1] = True
+    arr_bounds = np.flatnonzero(arr_changes) + 1
+    arr_starts = np.concatenate(([0], arr_bounds))
+    arr_ends = np.concatenate((arr_bounds, [i_length]))
+
+    arr_keep = (arr_states[arr_starts] != 0) & ((arr_ends - arr_starts) >= i_points)
+    return arr_starts[arr_keep], arr_ends[arr_keep]
+
+
+def count_windows(arr_mask: np.ndarray, i_points: int) -> np.ndarray:
+    """
+    Count the True values within each window of i_points elements in a row.
+    :param arr_mask: 1D boolean array
+    :param i_points: int, number of points per window
+    :return: array of counts, one per window start (0 ... length - i_points).
+    """
+    i_length = arr_mask.shape[0]
+    if (i_points < 1) or (i_length < i_points):
+        return np.zeros(0, dtype=int)
+    arr_cumsum = np.concatenate(([0], np.cumsum(arr_mask, dtype=int)))
+    return arr_cumsum[i_points:] - arr_cumsum[:-i_points]
+
+
+def valid_windows(arr_offsets: np.ndarray, i_points: int, i_skip_last: int = 0) -> np.ndarray:
+    """
+    Check which windows of i_points elements lie within a single segment.
+    :param arr_offsets: array of segment boundaries, e.g. [0, 20, 40] for two series of 20 points
+    :param i_points: int, number of points per window (at least 1)
+    :param i_skip_last: int, number of windows at the end of each segment that are not taken into account
+    :return: boolean array, one value per window start (0 ... length - i_points).
+    """
+    arr_lengths = np.diff(arr_offsets)
+    arr_valid_counts = np.clip(arr_lengths - i_points + 1 - i_skip_last, 0, arr_lengths)
+
+    ## every segment starts with its valid windows followed by the invalid ones
+    arr_counts = np.stack((arr_valid_counts, arr_lengths - arr_valid_counts), axis=1).reshape(-1)
+    arr_valid = np.repeat(np.tile([True, False], arr_lengths.shape[0]), arr_counts)
+    return arr_valid[: max(arr_offsets[-1] - i_points + 1, 0)]
+
+
+def find_windows(arr_qualifies: np.ndarray, i_points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Merge all qualifying windows of i_points elements into non-overlapping intervals.
+    :param arr_qualifies: 1D boolean array, one value per window start
+    :param i_points: int, number of points per window
+    :return: arrays of start indices and (exclusive) end indices of the merged windows.
+    """
+    arr_positions = np.flatnonzero(arr_qualifies)
+    if arr_positions.size == 0:
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+
+    ## windows that overlap or touch the previous one belong to the same interval
+    arr_breaks = np.flatnonzero(np.diff(arr_positions) > i_points) + 1
+    arr_starts = arr_positions[np.concatenate(([0], arr_breaks))]
+    arr_ends = arr_positions[np.concatenate((arr_breaks - 1, [arr_positions.size - 1]))] + i_points
+    return arr_starts, arr_ends
+
+
+def find_k_of_m_windows(arr_directions: np.ndarray, arr_outof_std: np.ndarray, i_points_window: int,
+                        i_points_out: int, arr_valid: np.ndarray) -> np.ndarray:
+    """
+    Find windows of m points in which n points are out of std on the same side of the mean (Rule 05 and Rule 06).
+    The side below the mean is checked first: if at least n points of a window are below the mean,
+    the window qualifies only if n of these points are out of std.
+    :param arr_directions: array of directions compared to the mean (-1, 0, 1)
+    :param arr_outof_std: boolean array, points out of std
+    :param i_points_window: int, number of points for window of interest (m)
+    :param i_points_out: int, number of points within this window that fulfill the condition (n)
+    :param arr_valid: boolean array, windows that are taken into account (one value per window start)
+    :return: array of the side of each qualifying window (-1, 1) and 0 for all other windows.
+    """
+    arr_below = arr_directions == -1
+    arr_above = arr_directions == 1
+    arr_below_windows = count_windows(arr_below, i_points_window) >= i_points_out
+    arr_above_windows = ~arr_below_windows & (count_windows(arr_above, i_points_window) >= i_points_out)
+    arr_below_windows &= count_windows(arr_below & arr_outof_std, i_points_window) >= i_points_out
+    arr_above_windows &= count_windows(arr_above & arr_outof_std, i_points_window) >= i_points_out
+
+    arr_sides = np.zeros(arr_valid.shape[0], dtype=np.int8)
+    arr_sides[arr_below_windows & arr_valid] = -1
+    arr_sides[arr_above_windows & arr_valid] = 1
+    return arr_sides
+
+
+def mark_k_of_m_points(arr_directions: np.ndarray, arr_outof_std: np.ndarray, arr_sides: np.ndarray,
+                       i_points_window: int) -> np.ndarray:
+    """
+    Mark the points that fulfill the condition of Rule 05 and Rule 06 within qualifying windows.
+    Where qualifying windows overlap, the latest window decides about each point.
+    :param arr_directions: array of directions compared to the mean (-1, 0, 1)
+    :param arr_outof_std: boolean array, points out of std
+    :param arr_sides: array of the side of each qualifying window (see find_k_of_m_windows)
+    :param i_points_window: int, number of points for window of interest (m)
+    :return: boolean array containing classification info.
+    """
+    i_length = arr_directions.shape[0]
+    if arr_sides.shape[0] == 0:
+        return np.zeros(i_length, dtype=bool)
+
+    ## latest qualifying window that starts at or before each point
+    arr_latest = np.where(arr_sides != 0, np.arange(arr_sides.shape[0]), -1)
+    np.maximum.accumulate(arr_latest, out=arr_latest)
+    arr_latest = arr_latest[np.minimum(np.arange(i_length), arr_sides.shape[0] - 1)]
+
+    arr_covered = (arr_latest >= 0) & (arr_latest > np.arange(i_length) - i_points_window)
+    return arr_covered & arr_outof_std & (arr_directions == arr_sides[arr_latest])
+
+
+def find_mixed_windows(arr_directions: np.ndarray, arr_condition: np.ndarray, i_points: int,
+                       arr_offsets: np.ndarray, i_skip_last: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find windows of i_points elements in a row that contain points on both sides of the mean and of which
+    all points fulfill a condition (Rule 07 and Rule 08).
+    :param arr_directions: array of directions compared to the mean (-1, 0, 1)
+    :param arr_condition: boolean array, e.g. points within std
+    :param i_points: int, number of points per window
+    :param arr_offsets: array of segment boundaries, e.g. [0, 20, 40] for two series of 20 points
+    :param i_skip_last: int, number of windows at the end of each segment that are not taken into account
+    :return: arrays of start indices and (exclusive) end indices of the merged windows.
+    """
+    arr_qualifies = (count_windows(arr_directions == -1, i_points) >= 1) & \
+                    (count_windows(arr_directions == 1, i_points) >= 1) & \
+                    (count_windows(arr_condition, i_points) == i_points)
+    if i_points >= 1:
+        arr_qualifies &= valid_windows(arr_offsets, i_points, i_skip_last=i_skip_last)
+    return find_windows(arr_qualifies, i_points)
+
+
+def find_k_of_m(arr_directions: np.ndarray, arr_outof_std: np.ndarray, i_points_window: int, i_points_out: int,
+                arr_offsets: np.ndarray) -> Tuple[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Find points and windows fulfilling Rule 05 and Rule 06 (see find_k_of_m_windows and mark_k_of_m_points).
+    The last window of each segment is not taken into account.
+    :param arr_directions: array of directions compared to the mean (-1, 0, 1)
+    :param arr_outof_std: boolean array, points out of std
+    :param i_points_window: int, number of points for window of interest (m, at least 1)
+    :param i_points_out: int, number of points within this window that fulfill the condition (n)
+    :param arr_offsets: array of segment boundaries, e.g. [0, 20, 40] for two series of 20 points
+    :return: boolean array of points and arrays of start indices and (exclusive) end indices of merged windows.
+    """
+    arr_valid = valid_windows(arr_offsets, i_points_window, i_skip_last=1)
+    arr_sides = find_k_of_m_windows(arr_directions, arr_outof_std, i_points_window, i_points_out, arr_valid)
+    arr_points = mark_k_of_m_points(arr_directions, arr_outof_std, arr_sides, i_points_window)
+    return arr_points, find_windows(arr_sides != 0, i_points_window)
+
+
+def split_intervals(arr_starts: np.ndarray, arr_ends: np.ndarray,
+                    arr_offsets: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Split non-overlapping intervals at segment boundaries.
+    :param arr_starts: sorted array of start indices
+    :param arr_ends: array of (exclusive) end indices
+    :param arr_offsets: array of segment boundaries, e.g. [0, 20, 40] for two series of 20 points
+    :return: arrays of start indices and (exclusive) end indices, of which none crosses a segment boundary.
+    """
+    arr_bounds = np.unique(arr_offsets[1:-1])
+    if (arr_starts.shape[0] == 0) or (arr_bounds.shape[0] == 0):
+        return arr_starts, arr_ends
+    arr_intervals = np.searchsorted(arr_starts, arr_bounds, side="right") - 1
+    arr_inside = (arr_intervals >= 0) & (arr_bounds < arr_ends[arr_intervals]) & \
+                 (arr_bounds > arr_starts[arr_intervals])
+    if not arr_inside.any():
+        return arr_starts, arr_ends
+    return np.sort(np.concatenate((arr_starts, arr_bounds[arr_inside]))), \
+           np.sort(np.concatenate((arr_ends, arr_bounds[arr_inside])))
+
+
+def mark_intervals(arr_starts: np.ndarray, arr_ends: np.ndarray, i_length: int, dtype: type = int) -> np.ndarray:
+    """
+    Convert non-overlapping intervals into a binary result array.
+    :param arr_starts: array of start indices
+    :param arr_ends: array of (exclusive) end indices
+    :param i_length: int, length of the result array
+    :param dtype: integer data type of the result array
+    :return: array containing classification info.
+    """
+    ## with unsigned data types, the decrements wrap around and are undone by the cumulative sum
+    arr_result = np.zeros(i_length, dtype=dtype)
+    arr_result[arr_starts] += 1
+    arr_result[arr_ends[arr_ends < i_length]] -= 1
+    return np.cumsum(arr_result, out=arr_result)
+
+
+##### ZONE AND DIRECTION KERNELS ##################################################
+
+def direction_to_mean(arr: np.ndarray, f_mean: float) -> np.ndarray:
+    """
+    Classify the side of the mean each point is on.
+    :param arr: 1D array of input data
+    :param f_mean: float, mean value
+    :return: array of directions: -1 (below), 0 (on the mean or NaN), 1 (above).
+    """
+    arr_directions = (arr > f_mean).astype(int)
+    arr_directions -= (arr < f_mean)
+    return arr_directions
+
+
+def direction_to_previous(arr: np.ndarray, arr_offsets: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Classify the direction of each point compared to the previous point.
+    :param arr: 1D array of input data
+    :param arr_offsets: array of segment boundaries; the first point of each segment has no previous point
+    :return: array of directions: -1 (decreasing), 0 (unchanged, NaN or first point), 1 (increasing).
+    """
+    arr_directions = np.zeros(arr.shape[0], dtype=int)
+    arr_directions[1:] = arr[1:] > arr[:-1]
+    arr_directions[1:] -= arr[1:] < arr[:-1]
+    if arr_offsets is not None:
+        arr_directions[arr_offsets[arr_offsets < arr.shape[0]]] = 0
+    return arr_directions
+
+
+def outof_std(arr: np.ndarray, f_mean: float, f_std: float, f_std_value: float) -> np.ndarray:
+    """
+    Classify the points that are more than n standard deviations (f_std_value) away from the mean.
+    :param arr: 1D array of input data
+    :param f_mean: float, mean value
+    :param f_std: float, one standard deviation
+    :param f_std_value: float, number of standard deviations, e.g. 3.0 for 3 std
+    :return: boolean array containing classification info.
+    """
+    arr_outof_std = arr < (f_mean - (f_std_value * f_std))
+    arr_outof_std |= arr > (f_mean + (f_std_value * f_std))
+    return arr_outof_std
+
+
+def zone_index(arr: np.ndarray, f_mean: float, f_std: float) -> np.ndarray:
+    """
+    Classify the zone of each point: 0 (within 1 std), 1 (1-2 std), 2 (2-3 std), 3 (beyond 3 std).
+    :param arr: 1D array of input data
+    :param f_mean: float, mean value
+    :param f_std: float, one standard deviation
+    :return: array of zone indices.
+    """
+    arr_zones = np.zeros(arr.shape[0], dtype=np.int8)
+    for f_std_value in (1.0, 2.0, 3.0):
+        arr_zones += outof_std(arr, f_mean, f_std, f_std_value)
+    return arr_zones
+
+
+def zscore(arr: np.ndarray, f_mean: float, f_std: float) -> np.ndarray:
+    """
+    Evaluate z-scores: How far are the data points away from the mean?
+    :param arr: 1D array of input data
+    :param f_mean: float, mean value
+    :param f_std: float, one standard deviation
+    :return: array of z-scores.
+    """
+    return (arr - f_mean) / f_std
+
+
+##### SEGMENTED REDUCTIONS ########################################################
+
+def segment_mean_std(arr: np.ndarray, arr_offsets: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Evaluate mean and standard deviation of each segment of a 1D array.
+    :param arr: 1D array of input data of all segments
+    :param arr_offsets: array of segment boundaries, e.g. [0, 20, 40] for two series of 20 points
+    :return: arrays of the mean and the standard deviation of each segment.
+    """
+    arr_lengths = np.diff(arr_offsets)
+    arr_segments = np.repeat(np.arange(arr_lengths.shape[0]), arr_lengths)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        arr_mean = np.bincount(arr_segments, weights=arr, minlength=arr_lengths.shape[0]) / arr_lengths
+        arr_deviations = arr - np.repeat(arr_mean, arr_lengths)
+        arr_variance = np.bincount(arr_segments, weights=arr_deviations * arr_deviations,
+                                   minlength=arr_lengths.shape[0]) / arr_lengths
+    return arr_mean, np.sqrt(arr_variance)
+
+
+def _block_moments(arr: np.ndarray, arr_rows: np.ndarray, arr_cols: np.ndarray, arr_centers: np.ndarray,
+                   i_block: int, b_suffix: bool) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Evaluate count, mean and sum of squared deviations (M2) of the prefix (or suffix) of its block ending
+    (or starting) at each element. The values of each block are centered on a value of the block,
+    so that the sums of deviations stay small unless the values within the prefix (or suffix) differ.
+    :param arr: 1D array
+    :param arr_rows: array of the block of each element
+    :param arr_cols: array of the position of each element within its block
+    :param arr_centers: array of the center of each block, e.g. its first value for prefixes and its last for suffixes
+    :param i_block: int, block size
+    :param b_suffix: bool, evaluate suffixes instead of prefixes
+    :return: arrays of count, mean and M2 at each element.
+    """
+    arr_deviations = np.zeros((arr_centers.shape[0], i_block))
+    arr_deviations[arr_rows, arr_cols] = arr - arr_centers[arr_rows]
+    if b_suffix:
+        ## padding at the end of the last block of a segment has no deviation
+        arr_sums = np.cumsum(arr_deviations[:, ::-1], axis=1)[:, ::-1]
+        arr_sums_squares = np.cumsum(np.square(arr_deviations)[:, ::-1], axis=1)[:, ::-1]
+    else:
+        arr_sums = np.cumsum(arr_deviations, axis=1)
+        arr_sums_squares = np.cumsum(np.square(arr_deviations), axis=1)
+    arr_sum, arr_sum_squares = arr_sums[arr_rows, arr_cols], arr_sums_squares[arr_rows, arr_cols]
+
+    if b_suffix:
+        arr_block_ends = np.concatenate((np.flatnonzero(np.diff(arr_rows)), [arr_rows.shape[0] - 1]))
+        arr_counts = arr_block_ends[arr_rows] - np.arange(arr_rows.shape[0]) + 1
+    else:
+        arr_counts = arr_cols + 1
+    arr_mean = arr_centers[arr_rows] + arr_sum / arr_counts
+    arr_m2 = np.maximum(arr_sum_squares - arr_sum * arr_sum / arr_counts, 0.0)
+    return arr_counts, arr_mean, arr_m2
+
+
+def rolling_mean_std(arr: np.ndarray, i_window: int, arr_offsets: Optional[np.ndarray] = None,
+                     i_min_points: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Evaluate mean and standard deviation of the trailing window of i_window points ending at each point, in O(n).
+    Each segment is split into blocks of i_window points, so that each window is a suffix of one block followed
+    by a prefix of the next block. The moments (count, mean, M2) of all prefixes and suffixes are evaluated
+    from sums of deviations from a value of their block, and merged for each window (Chan et al.).
+    This avoids the cancellation of sums of squares over values far from the window (e.g. before a level shift).
+    :param arr: 1D array of input data of all segments
+    :param i_window: int, number of points per window (at least 1)
+    :param arr_offsets: array of segment boundaries, e.g. [0, 20, 40] for two series of 20 points;
+            windows do not cross segment boundaries
+    :param i_min_points: int, minimum number of points of a window at the start of a segment, default: i_window;
+            mean and std of points with fewer points in their window are NaN
+    :return: arrays of the mean and the standard deviation at each point.
+    """
+    arr = np.asarray(arr, dtype=np.float64)
+    i_length = arr.shape[0]
+    if arr_offsets is None:
+        arr_offsets = np.array([0, i_length])
+    i_min_points = i_window if i_min_points is None else i_min_points
+    if i_length == 0:
+        return np.zeros(0), np.zeros(0)
+
+    ## blocks of i_window points from the start of each segment
+    arr_lengths = np.diff(arr_offsets)
+    arr_segment_starts = np.repeat(arr_offsets[:-1], arr_lengths)
+    arr_local = np.arange(i_length) - arr_segment_starts
+    arr_blocks = -(-arr_lengths // i_window)
+    arr_rows = np.repeat(np.cumsum(arr_blocks) - arr_blocks, arr_lengths) + arr_local // i_window
+    arr_cols = arr_local % i_window
+    arr_block_starts = np.flatnonzero(arr_cols == 0)
+    arr_block_ends = np.concatenate((arr_block_starts[1:], [i_length])) - 1
+
+    arr_counts, arr_mean, arr_m2 = _block_moments(arr, arr_rows, arr_cols, arr[arr_block_starts], i_window, False)
+    arr_suffix_counts, arr_suffix_mean, arr_suffix_m2 = _block_moments(arr, arr_rows, arr_cols,
+                                                                       arr[arr_block_ends], i_window, True)
+
+    ## windows that start in the previous block: merge the suffix of that block with the prefix
+    arr_starts = np.maximum(np.arange(i_length) - i_window + 1, arr_segment_starts)
+    arr_split = arr_rows[arr_starts] != arr_rows
+    arr_starts = arr_starts[arr_split]
+    arr_counts_a, arr_mean_a, arr_m2_a = arr_suffix_counts[arr_starts], arr_suffix_mean[arr_starts], \
+                                         arr_suffix_m2[arr_starts]
+    arr_counts_b, arr_mean_b, arr_m2_b = arr_counts[arr_split], arr_mean[arr_split], arr_m2[arr_split]
+    arr_counts_ab = arr_counts_a + arr_counts_b
+    arr_delta = arr_mean_b - arr_mean_a
+    arr_counts[arr_split] = arr_counts_ab
+    arr_mean[arr_split] = arr_mean_a + arr_delta * arr_counts_b / arr_counts_ab
+    arr_m2[arr_split] = arr_m2_a + arr_m2_b + arr_delta * arr_delta * arr_counts_a * arr_counts_b / arr_counts_ab
+
+    arr_std = np.sqrt(arr_m2 / arr_counts)
+    arr_incomplete = arr_counts < max(i_min_points, 1)
+    arr_mean[arr_incomplete] = np.nan
+    arr_std[arr_incomplete] = np.nan
+    return arr_mean, arr_std
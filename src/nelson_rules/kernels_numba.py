@@ -0,0 +1,170 @@
+import numpy as np
+from typing import Optional, Tuple
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+## Compiled single-pass counterparts of the run-length and window kernels (see kernels.py),
+## with identical results. numba is optional: without it, b_available is False.
+
+b_available = numba is not None
+
+
+## no on-disk cache: it records the name of the importing module, and the package may be imported under
+## several names (e.g. nelson_rules and src.nelson_rules), whose cached kernels fail to load in the other
+def _njit(func):
+    return numba.njit(nogil=True)(func) if b_available else func
+
+
+##### RUN-LENGTH ENGINE ##########################################################
+
+@_njit
+def _find_runs(arr_states, i_points, arr_offsets):
+    i_length = arr_states.shape[0]
+    arr_starts = np.empty(i_length // max(i_points, 1) + 1, dtype=np.int64)
+    arr_ends = np.empty_like(arr_starts)
+    i_runs = 0
+    i_segment = 1
+    i_start = 0
+    for i in range(1, i_length + 1):
+        ## a run ends at a change of state, at a segment boundary or at the end of the array
+        while (i_segment < arr_offsets.shape[0] - 1) and (arr_offsets[i_segment] < i):
+            i_segment += 1
+        b_boundary = (i == i_length) or (arr_states[i] != arr_states[i - 1]) or \
+                     ((i_segment < arr_offsets.shape[0]) and (arr_offsets[i_segment] == i))
+        if b_boundary:
+            if (arr_states[i_start] != 0) and (i - i_start >= i_points):
+                arr_starts[i_runs] = i_start
+                arr_ends[i_runs] = i
+                i_runs += 1
+            i_start = i
+    return arr_starts[:i_runs], arr_ends[:i_runs]
+
+
+def find_runs(arr_states: np.ndarray, i_points: int,
+              arr_offsets: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find runs of equal, non-zero states that are at least i_points elements long (see kernels.find_runs).
+    """
+    i_length = arr_states.shape[0]
+    if (i_points < 1) or (i_length < i_points):
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+    if arr_offsets is None:
+        arr_offsets = np.array([0, i_length])
+    return _find_runs(arr_states, i_points, np.asarray(arr_offsets, dtype=np.int64))
+
+
+##### WINDOW ENGINE ##############################################################
+
+@_njit
+def _find_mixed_windows(arr_directions, arr_condition, i_points, arr_offsets, i_skip_last):
+    i_length = arr_directions.shape[0]
+    arr_starts = np.empty(i_length // i_points + 1, dtype=np.int64)
+    arr_ends = np.empty_like(arr_starts)
+    i_intervals = 0
+    i_below = 0
+    i_above = 0
+    i_condition = 0
+    i_segment = 1
+    for i in range(i_length):
+        ## point i enters the window, point i - i_points leaves it
+        i_below += arr_directions[i] == -1
+        i_above += arr_directions[i] == 1
+        i_condition += arr_condition[i]
+        i_window = i - i_points + 1
+        if i_window < 0:
+            continue
+        if i_window > 0:
+            i_below -= arr_directions[i_window - 1] == -1
+            i_above -= arr_directions[i_window - 1] == 1
+            i_condition -= arr_condition[i_window - 1]
+        while arr_offsets[i_segment] <= i_window:
+            i_segment += 1
+
+        ## windows within a single segment, except for the last ones
+        if (i_window + i_points + i_skip_last <= arr_offsets[i_segment]) and (i_below >= 1) and \
+                (i_above >= 1) and (i_condition == i_points):
+            if (i_intervals > 0) and (i_window <= arr_ends[i_intervals - 1]):
+                arr_ends[i_intervals - 1] = i_window + i_points
+            else:
+                arr_starts[i_intervals] = i_window
+                arr_ends[i_intervals] = i_window + i_points
+                i_intervals += 1
+    return arr_starts[:i_intervals], arr_ends[:i_intervals]
+
+
+def find_mixed_windows(arr_directions: np.ndarray, arr_condition: np.ndarray, i_points: int,
+                       arr_offsets: np.ndarray, i_skip_last: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find windows with points on both sides of the mean, all fulfilling a condition (see kernels.find_mixed_windows).
+    """
+    if (i_points < 1) or (arr_directions.shape[0] < i_points):
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+    return _find_mixed_windows(arr_directions, arr_condition, i_points,
+                               np.asarray(arr_offsets, dtype=np.int64), i_skip_last)
+
+
+@_njit
+def _find_k_of_m(arr_directions, arr_outof_std, i_points_window, i_points_out, arr_offsets):
+    i_length = arr_directions.shape[0]
+    arr_points = np.zeros(i_length, dtype=np.bool_)
+    arr_starts = np.empty(i_length // i_points_window + 1, dtype=np.int64)
+    arr_ends = np.empty_like(arr_starts)
+    i_intervals = 0
+    i_below = 0
+    i_above = 0
+    i_below_out = 0
+    i_above_out = 0
+    i_segment = 1
+    for i in range(i_length):
+        ## point i enters the window, point i - i_points_window leaves it
+        i_below += arr_directions[i] == -1
+        i_above += arr_directions[i] == 1
+        i_below_out += (arr_directions[i] == -1) and arr_outof_std[i]
+        i_above_out += (arr_directions[i] == 1) and arr_outof_std[i]
+        i_window = i - i_points_window + 1
+        if i_window < 0:
+            continue
+        if i_window > 0:
+            i_old = i_window - 1
+            i_below -= arr_directions[i_old] == -1
+            i_above -= arr_directions[i_old] == 1
+            i_below_out -= (arr_directions[i_old] == -1) and arr_outof_std[i_old]
+            i_above_out -= (arr_directions[i_old] == 1) and arr_outof_std[i_old]
+        while arr_offsets[i_segment] <= i_window:
+            i_segment += 1
+
+        ## the side below the mean is checked first; the last window of each segment is not taken into account
+        if i_window + i_points_window + 1 > arr_offsets[i_segment]:
+            continue
+        i_side = 0
+        if i_below >= i_points_out:
+            if i_below_out >= i_points_out:
+                i_side = -1
+        elif (i_above >= i_points_out) and (i_above_out >= i_points_out):
+            i_side = 1
+        if i_side == 0:
+            continue
+
+        ## the latest qualifying window decides about each point
+        for j in range(i_window, i_window + i_points_window):
+            arr_points[j] = arr_outof_std[j] and (arr_directions[j] == i_side)
+        if (i_intervals > 0) and (i_window <= arr_ends[i_intervals - 1]):
+            arr_ends[i_intervals - 1] = i_window + i_points_window
+        else:
+            arr_starts[i_intervals] = i_window
+            arr_ends[i_intervals] = i_window + i_points_window
+            i_intervals += 1
+    return arr_points, (arr_starts[:i_intervals], arr_ends[:i_intervals])
+
+
+def find_k_of_m(arr_directions: np.ndarray, arr_outof_std: np.ndarray, i_points_window: int, i_points_out: int,
+                arr_offsets: np.ndarray) -> Tuple[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Find points and windows fulfilling Rule 05 and Rule 06 (see kernels.find_k_of_m).
+    """
+    return _find_k_of_m(arr_directions, arr_outof_std, i_points_window, i_points_out,
+                        np.asarray(arr_offsets, dtype=np.int64))
@@ -0,0 +1,152 @@
+import numpy as np
+from typing import NamedTuple, Optional, Union
+
+from .kernels import rolling_mean_std
+
+
+## bias correction constant d2 of the average moving range of 2 consecutive points
+f_d2_moving_range = 1.128
+
+
+class ControlLimits(NamedTuple):
+    """
+    Center line (mean) and standard deviation of a process, e.g. estimated once from a reference window
+    (phase I) and then used to check new data (phase II) without evaluating mean and std again.
+    Mean and std are numbers, or arrays with one value per data point (see from_rolling).
+    """
+
+    f_mean: Union[float, np.ndarray]
+    f_std: Union[float, np.ndarray]
+
+
+    @classmethod
+    def from_data(cls, arr: np.ndarray) -> "ControlLimits":
+        """
+        Estimate control limits from reference data by mean and (population) standard deviation.
+        :param arr: 1D array of reference data
+        :return: control limits.
+        """
+        arr = np.asarray(arr)
+        return cls(float(np.mean(arr)), float(np.std(arr)))
+
+
+    @classmethod
+    def from_moving_range(cls, arr: np.ndarray) -> "ControlLimits":
+        """
+        Estimate control limits from reference data by mean and the average moving range of consecutive points
+        (std = mean(|x[i] - x[i-1]|) / 1.128). Unlike the standard deviation, this estimate is robust against
+        shifts and trends in the reference data.
+        :param arr: 1D array of reference data (at least 2 data points)
+        :return: control limits.
+        """
+        arr = np.asarray(arr)
+        return cls(float(np.mean(arr)), float(np.mean(np.abs(np.diff(arr))) / f_d2_moving_range))
+
+
+    @classmethod
+    def from_rolling(cls, arr: np.ndarray, i_window: int, i_min_points: Optional[int] = None) -> "ControlLimits":
+        """
+        Estimate control limits of each data point from a trailing window (rolling baseline), e.g. for slowly
+        drifting processes: mean and (population) standard deviation of the i_window data points up to and
+        including each data point. These are evaluated in O(n), see kernels.rolling_mean_std.
+        :param arr: 1D array of input data, the limits are valid for this data only
+        :param i_window: int, number of data points per window (at least 1)
+        :param i_min_points: int, minimum number of data points of the windows at the start of the data,
+                default: i_window; data points with fewer points in their window have no limits (NaN)
+                and fulfill no rule that relates to the mean (rules 3 and 4 do not use the limits)
+        :return: control limits with arrays of mean and std.
+        """
+        if i_window < 1:
+            raise ValueError(f"i_window must be at least 1, got {i_window!r}")
+        arr_mean, arr_std = rolling_mean_std(np.asarray(arr, dtype=np.float64), i_window, i_min_points=i_min_points)
+        return cls(arr_mean, arr_std)
+
+
+class LimitAccumulator:
+    """
+    One-pass estimate of mean and (population) standard deviation that is updated chunk by chunk
+    and merged with the estimates of other chunks, files or processes (Welford, Chan et al.).
+    Only the count, mean and sum of squared deviations (M2) are kept, so the data does not need to fit
+    into memory, and merging partial estimates gives the limits of all data (as np.mean and np.std,
+    up to rounding). The accumulator is passed as limits to NelsonRules directly, or see to_limits.
+    """
+
+    __slots__ = ("i_count", "f_mean", "f_m2")
+
+    def __init__(self, i_count: int = 0, f_mean: float = 0.0, f_m2: float = 0.0) -> None:
+        """
+        :param i_count: int, number of data points
+        :param f_mean: float, mean of the data points
+        :param f_m2: float, sum of squared deviations from the mean
+        """
+        self.i_count = i_count
+        self.f_mean = f_mean
+        self.f_m2 = f_m2
+
+
+    @classmethod
+    def from_data(cls, arr: np.ndarray, i_chunk_size: Optional[int] = None) -> "LimitAccumulator":
+        """
+        Estimate mean and standard deviation in one pass over chunks of the data.
+        :param arr: 1D array of data, e.g. np.memmap
+        :param i_chunk_size: int, number of data points per chunk, default: all data at once
+        :return: accumulator of the data.
+        """
+        acc = cls()
+        i_chunk_size = i_chunk_size or max(arr.shape[0], 1)
+        for i_start in range(0, arr.shape[0], i_chunk_size):
+            acc.update(arr[i_start : i_start + i_chunk_size])
+        return acc
+
+
+    def update(self, arr: np.ndarray) -> "LimitAccumulator":
+        """
+        Add a chunk of data points.
+        :param arr: 1D array of data points
+        :return: the accumulator itself.
+        """
+        arr = np.asarray(arr, dtype=np.float64)
+        if arr.shape[0] == 0:
+            return self
+        f_mean_chunk = float(np.mean(arr))
+        arr_deviations = arr - f_mean_chunk
+        return self.merge(LimitAccumulator(arr.shape[0], f_mean_chunk, float(np.dot(arr_deviations, arr_deviations))))
+
+
+    def merge(self, other: "LimitAccumulator") -> "LimitAccumulator":
+        """
+        Add the data points of another accumulator, e.g. of another file or process.
+        :param other: accumulator
+        :return: the accumulator itself.
+        """
+        if other.i_count == 0:
+            return self
+        i_count = self.i_count + other.i_count
+        f_delta = other.f_mean - self.f_mean
+        self.f_mean += f_delta * other.i_count / i_count
+        self.f_m2 += other.f_m2 + f_delta * f_delta * self.i_count * other.i_count / i_count
+        self.i_count = i_count
+        return self
+
+
+    @property
+    def f_std(self) -> float:
+        """
+        :return: population standard deviation, NaN without data points.
+        """
+        if self.i_count == 0:
+            return np.nan
+        return float(np.sqrt(self.f_m2 / self.i_count))
+
+
+    def to_limits(self) -> ControlLimits:
+        """
+        :return: control limits (mean, std), NaN without data points.
+        """
+        if self.i_count == 0:
+            return ControlLimits(np.nan, np.nan)
+        return ControlLimits(self.f_mean, self.f_std)
+
+
+    def __repr__(self) -> str:
+        return f"LimitAccumulator(i_count={self.i_count}, f_mean={self.f_mean}, f_m2={self.f_m2})"
@@ -1,72 +1,197 @@
 
+import itertools
 import numpy as np
 import pandas as pd
-from typing import Dict, Union
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+from .backends import get_backend
+from .config import RuleConfig, RuleSettings, d_rules
+from .export import to_record_batch, write_parquet
+from .instrumentation import instrumented, measure
+from .kernels import (direction_to_mean, direction_to_previous, find_runs, mark_intervals, outof_std, split_intervals,
+                      zone_index, zscore)
+from .limits import ControlLimits, LimitAccumulator
+
+
+l_rules = ["rule1", "rule2", "rule3", "rule4", "rule5", "rule6", "rule7", "rule8"]
+
+l_rule_results = [
+    "rule1", "rule2", "rule3", "rule4", "rule5_points", "rule5_windows",
+    "rule6_points", "rule6_windows", "rule7", "rule8",
+]
+
+## bit of each rule result in the compact flags output
+d_rule_bits = {s_key: i_bit for i_bit, s_key in enumerate(l_rule_results)}
+
+## start indices and (exclusive) end indices of runs of points
+Intervals = Tuple[np.ndarray, np.ndarray]
+
+## record of a run of points fulfilling a rule, see NelsonRules.apply_rules(s_output="intervals")
+dtype_intervals = np.dtype([("rule", "U13"), ("start", np.int64), ("end", np.int64)])
+
+
+def summary_frame(d_summary: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """
+    Convert summary columns (see NelsonRules.summarize) into a DataFrame.
+    :param d_summary: dictionary of summary columns; first and last are -1 for results without any points
+    :return: DataFrame, with missing values for first and last of results without any points.
+    """
+    d_columns = dict(d_summary)
+    for s_column in ["first", "last"]:
+        d_columns[s_column] = pd.arrays.IntegerArray(d_summary[s_column], d_summary[s_column] < 0)
+    return pd.DataFrame(d_columns)
+
+
+def as_input_array(arr, dtype: Optional[np.dtype] = None) -> np.ndarray:
+    """
+    Convert input data into a 1D numeric array. Arrays, pd.Series and other objects exposing the buffer protocol
+    or __array__ are used without copying them, and their data type is kept unless dtype is given.
+    The data type is checked instead of each element.
+    :param arr: input data
+    :param dtype: data type of the array, default: data type of the input data
+    :return: 1D array of booleans, integers or floats.
+    """
+    if isinstance(arr, pd.Series) and pd.api.types.is_extension_array_dtype(arr.dtype) and \
+            pd.api.types.is_numeric_dtype(arr.dtype):
+        ## nullable data types: missing values become NaN
+        arr = arr.to_numpy(dtype=np.float64, na_value=np.nan)
+    arr_input = np.asarray(arr)
+
+    ## object arrays (e.g. lists of mixed numbers or pd.Series of Python objects) are converted once
+    if (arr_input.dtype.kind == "O") and \
+            (pd.api.types.infer_dtype(arr_input, skipna=True) in ["floating", "integer", "mixed-integer-float"]):
+        arr_input = arr_input.astype(np.float64)
+    if (arr_input.ndim != 1) or (arr_input.dtype.kind not in "biuf"):
+        raise Exception("Please provide 1D numpy array as input data!")
+    if dtype is not None:
+        arr_input = arr_input.astype(dtype, copy=False)
+    return arr_input
 
 
-d_rules = {
-    "rule1": {"f_std": 3.0},
-    "rule2": {"i_points": 9},
-    "rule3": {"i_points": 6},
-    "rule4": {"i_points": 14},
-    "rule5": {"i_points": 3, "i_points_window": 2, "f_std": 2.0},
-    "rule6": {"i_points": 5, "i_points_window": 4, "f_std": 1.0},
-    "rule7": {"i_points": 15, "f_std": 1.0},
-    "rule8": {"i_points": 8, "f_std": 1.0},
-}
+class NelsonRules:
 
+    def __init__(self, arr: np.ndarray, d_rule_settings: RuleSettings = d_rules,
+                 limits: Union[ControlLimits, LimitAccumulator, None] = None, backend: str = "numpy",
+                 dtype: Optional[np.dtype] = None) -> None:
+        """
+        :param arr: 1D array of input data, or any object exposing the buffer protocol or __array__
+                (e.g. list, pd.Series, Arrow array) with numeric values
+        :param d_rule_settings: RuleConfig or dictionary of rule settings (merged into the default settings)
+        :param limits: fixed control limits (mean, std), e.g. ControlLimits.from_data(<reference_data>)
+                or a LimitAccumulator, default: mean and std of the input data
+        :param backend: str, "numpy" or "numba" (compiled single-pass run-length and window kernels, if installed)
+        :param dtype: data type to evaluate the rules in, e.g. np.float32, default: data type of the input data
+        """
+        self.arr: np.ndarray = as_input_array(arr, dtype=dtype)
 
-class NelsonRules:
+        if limits is None:
+            self.f_mean = np.mean(self.arr)
+            self.f_std = np.std(self.arr)
+        else:
+            self.f_mean, self.f_std = limits.f_mean, limits.f_std
+        self.b_fixed_limits = limits is not None
+        self.d_results = {"input_data": self.arr}
 
-    def __init__(self, arr: np.ndarray, d_rule_settings: Dict[str, Dict[str, Union[float, int]]] = d_rules) -> None:
+        ## buffers with spare capacity of the input data and results, see extend
+        self._d_buffers: Dict[str, np.ndarray] = {}
 
-        if isinstance(arr, np.ndarray):
-            self.arr: np.ndarray = arr
+        self.d_rules = RuleConfig.from_settings(d_rule_settings)
+        self.backend = backend
+        self._kernels = get_backend(backend)
 
-        elif isinstance(arr, list):
-            if (all(isinstance(x, float) for x in arr)) or (all(isinstance(x, int) for x in arr)):
-                self.arr: np.ndarray = np.array(arr)
-            elif (isinstance(x, str) for x in arr):
-                raise Exception("Please provide 1D numpy array as input data!")
 
-        elif isinstance(arr, pd.Series):
-            if (all(isinstance(x, float) for x in arr)) or (all(isinstance(x, int) for x in arr)):
-                self.arr: np.ndarray = arr.to_numpy(arr)
-            elif (isinstance(x, str) for x in arr):
-                raise Exception("Please provide 1D numpy array as input data!")
+    ##### FEATURE CACHE ##########################################################
 
-        self.arr_length: int = self.arr.shape[0]
-        self.f_mean = np.mean(self.arr)
-        self.f_std = np.std(self.arr)
-        self.d_results = {"input_data": self.arr}
+    @property
+    def arr(self) -> np.ndarray:
+        return self._arr
+
+
+    @arr.setter
+    def arr(self, arr: np.ndarray) -> None:
+        self._arr = arr
+        self.arr_length: int = arr.shape[0]
+        self._arr_offsets = np.array([0, self.arr_length])
+        self._d_features = {}
+
+
+    @property
+    def arr_offsets(self) -> np.ndarray:
+        return self._arr_offsets
+
+
+    @arr_offsets.setter
+    def arr_offsets(self, arr_offsets: np.ndarray) -> None:
+        self._arr_offsets = arr_offsets
+        self._d_features = {}
+
+
+    @property
+    def f_mean(self) -> float:
+        return self._f_mean
+
+
+    @f_mean.setter
+    def f_mean(self, f_mean: float) -> None:
+        self._f_mean = f_mean
+        self._d_features = {}
+
+
+    @property
+    def f_std(self) -> float:
+        return self._f_std
+
+
+    @f_std.setter
+    def f_std(self, f_std: float) -> None:
+        self._f_std = f_std
+        self._d_features = {}
 
-        self.d_rules = d_rules
-        if (self.d_rules != d_rule_settings) and (len(d_rule_settings) != 0):
-            self.d_rules.update(d_rule_settings)
+
+    def _get_feature(self, s_feature: str, func, *args) -> np.ndarray:
+        """
+        Get a feature array that is shared by several rules. It is evaluated on first access and kept
+        until the input data or the limits (mean, std) change.
+        :param s_feature: str, name of the feature
+        :param func: function evaluating the feature
+        :param args: arguments passed to func
+        :return: read-only feature array.
+        """
+        if s_feature not in self._d_features:
+            arr_feature = measure(s_feature, self.arr_length, func, *args)
+            arr_feature.flags.writeable = False
+            self._d_features[s_feature] = arr_feature
+        return self._d_features[s_feature]
 
 
-    def _check_if_point_outof_std(self, x, f_std_value: float) -> np.array:
+    def _check_if_point_outof_std(self, f_std_value: float) -> np.array:
         """
-        Check if data point (x) is out of n standard deviations (f_std_value).
-        :param x: value to be checked
+        Check if data points are out of n standard deviations (f_std_value).
+        For 1, 2 and 3 std, this is looked up from the zone index of each data point.
         :param f_std_value: float, number of standard deviations, e.g. 3.0 for 3 std
-        :return: array containing classification info.
+        :return: boolean array containing classification info.
         """
-        if x < (self.f_mean - (f_std_value * self.f_std)):
-            return 1
-        elif x > (self.f_mean + (f_std_value * self.f_std)):
-            return 1
-        else:
-            return 0
+        if f_std_value in (1.0, 2.0, 3.0):
+            arr_zones = self._get_zone_index()
+            return self._get_feature(f"outof_std_{float(f_std_value)}", np.greater_equal, arr_zones, f_std_value)
+        return self._get_feature(f"outof_std_{float(f_std_value)}",
+                                 outof_std, self.arr, self.f_mean, self.f_std, f_std_value)
 
 
-    def _evaluate_zscore(self, x):
+    def _get_zone_index(self) -> np.array:
+        """
+        Get zone of each data point: 0 (within 1 std), 1 (1-2 std), 2 (2-3 std), 3 (beyond 3 std).
+        :return: array of zone indices.
+        """
+        return self._get_feature("zone_index", zone_index, self.arr, self.f_mean, self.f_std)
+
+
+    def _evaluate_zscore(self) -> np.array:
         """
         Evaluate z-score: How far is a data point away from the mean?
-        :param x: value to be checked
-        :return: z-score
+        :return: array of z-scores
         """
-        return (x - self.f_mean) / self.f_std
+        return self._get_feature("zscore", zscore, self.arr, self.f_mean, self.f_std)
 
 
     def _check_direction_comparedTo_mean(self) -> np.array:
@@ -74,13 +199,7 @@ class NelsonRules:
         Check direction of points related to the mean value.
         :return: array containing classification info.
         """
-        arr_directions = np.zeros(self.arr_length, dtype=int)
-        for i in range(self.arr_length):
-            if self.arr[i] < self.f_mean:
-                arr_directions[i] = -1
-            elif self.arr[i] > self.f_mean:
-                arr_directions[i] = 1
-        return arr_directions
+        return self._get_feature("direction_mean", direction_to_mean, self.arr, self.f_mean)
 
 
     def _check_direction_comparedTo_previousValue(self) -> np.array:
@@ -88,21 +207,27 @@ class NelsonRules:
         Check direction of points related to the previous value.
         :return: array containing classification info.
         """
-        arr_directions = np.zeros(self.arr_length, dtype=int)
-        for i in range(1, self.arr_length):
+        return self._get_feature("direction_previous", direction_to_previous, self.arr, self.arr_offsets)
 
-                ## decreasing
-                if self.arr[i] < self.arr[i - 1]:
-                    arr_directions[i] = -1
 
-                ## increasing
-                elif self.arr[i] > self.arr[i - 1]:
-                    arr_directions[i] = 1
+    def _set_first_directions(self, arr_directions: np.ndarray, i_points: int, i_decreasing: int) -> None:
+        """
+        The first value of each series has no previous value. It is updated according to the second value,
+        if the series is long enough to contain i_points.
+        :param arr_directions: array of directions compared to the previous value, updated in place
+        :param i_points: int, minimum number of points to fulfill the condition
+        :param i_decreasing: int, direction of the first value if the second value is smaller
+        """
+        arr_lengths = np.diff(self.arr_offsets)
+        arr_starts = self.arr_offsets[:-1][(1 < arr_lengths) & (i_points <= arr_lengths)]
+        arr_directions[arr_starts] = np.where(self.arr[arr_starts + 1] < self.arr[arr_starts],
+                                              i_decreasing, -i_decreasing)
 
-        return arr_directions
 
+    ##### RULES ##################################################################
 
-    def _check_direction_and_if_outof_std(self, i_points_window: int, i_points_out: int, f_std_value: float) -> np.array:
+    def _check_direction_and_if_outof_std(self, i_points_window: int, i_points_out: int,
+                                          f_std_value: float) -> Tuple[np.ndarray, Intervals]:
         """
         This function relates to Rule 05 and Rule 06.
         e.g. Check if 2 out of 3 elements in a row are more than 2 std away from the mean in the same direction.
@@ -110,37 +235,181 @@ class NelsonRules:
         :param i_points_out: int, number of points within this window that fulfill a certain condition,
                 e.g. 2 in "2 out of 3 points in a row"
         :param f_std_value: float, number of standard deviations, e.g. 3.0 for 3 std
-        :return: array containing classification info.
+        :return: boolean array of points and intervals of windows fulfilling the condition.
         """
+        if i_points_window < 1:
+            return np.zeros(self.arr_length, dtype=bool), (np.zeros(0, dtype=int), np.zeros(0, dtype=int))
         arr_directions = self._check_direction_comparedTo_mean()
-        vfunc = np.vectorize(self._check_if_point_outof_std, excluded=["f_std_value"])
-        arr_outof_std = vfunc(self.arr, f_std_value)
-        arr_result_points = np.zeros(self.arr_length, dtype=int)
-        arr_result_windows = np.zeros(self.arr_length, dtype=int)
-        for i in range(i_points_window, self.arr_length):
-
-            ##### CONDITION 1
-            ## convert directions (-1, 0, 1) into True and False
-            arr_window = arr_directions[i - i_points_window: i]
-            if (arr_window == -1).sum() >= i_points_out:
-                arr_cond1 = (arr_window == -1)
-            elif (arr_window == 1).sum() >= i_points_out:
-                arr_cond1 = (arr_window == 1)
-            else:
-                arr_cond1 = i_points_window * [False]
-
-            ##### CONDITION 2
-            arr_window = arr_outof_std[i - i_points_window: i]
-            if (arr_window == 1).sum() >= i_points_out:
-                arr_cond2 = (arr_window == 1)
-
-                ## overwrite values
-                res_window = arr_cond1 * arr_cond2
-                if res_window.sum() >= i_points_out:
-                    arr_result_points[i - i_points_window : i] = res_window
-                    arr_result_windows[i - i_points_window : i] = i_points_window * [1]
-
-        return arr_result_points, arr_result_windows
+        arr_outof_std = self._check_if_point_outof_std(f_std_value)
+        return self._kernels.find_k_of_m(arr_directions, arr_outof_std, i_points_window, i_points_out,
+                                         self.arr_offsets)
+
+
+    @instrumented("rule1")
+    def _find_rule1(self, f_std_value: float = 3.0) -> np.ndarray:
+        """
+        Rule 1, see rule1.
+        :return: boolean array of points fulfilling the condition.
+        """
+        return self._check_if_point_outof_std(f_std_value)
+
+
+    @instrumented("rule2")
+    def _find_rule2(self, i_points: int = 9) -> Intervals:
+        """
+        Rule 2, see rule2.
+        :return: start indices and (exclusive) end indices of runs fulfilling the condition.
+        """
+        arr_directions = self._check_direction_comparedTo_mean()
+        return self._kernels.find_runs(arr_directions, i_points, self.arr_offsets)
+
+
+    @instrumented("rule3")
+    def _find_rule3(self, i_points: int = 6) -> Intervals:
+        """
+        Rule 3, see rule3.
+        :return: start indices and (exclusive) end indices of runs fulfilling the condition.
+        """
+        arr_directions = self._check_direction_comparedTo_previousValue().copy()
+        self._set_first_directions(arr_directions, i_points, i_decreasing=-1)
+        return self._kernels.find_runs(arr_directions, i_points, self.arr_offsets)
+
+
+    @instrumented("rule4")
+    def _find_rule4(self, i_points: int = 14) -> Intervals:
+        """
+        Rule 4, see rule4.
+        :return: start indices and (exclusive) end indices of runs fulfilling the condition.
+        """
+        arr_directions = self._check_direction_comparedTo_previousValue().copy()
+        self._set_first_directions(arr_directions, i_points, i_decreasing=1)
+
+        ## flipping every second direction turns alternating directions into runs of equal states
+        arr_directions[1::2] *= -1
+        return self._kernels.find_runs(arr_directions, i_points, self.arr_offsets)
+
+
+    @instrumented("rule5")
+    def _find_rule5(self, i_points_window: int = 3, i_points_out: int = 2,
+                    f_std_value: float = 2.0) -> Tuple[np.ndarray, Intervals]:
+        """
+        Rule 5, see rule5.
+        :return: boolean array of points and intervals of windows fulfilling the condition.
+        """
+        return self._check_direction_and_if_outof_std(i_points_window=i_points_window, i_points_out=i_points_out,
+                                                      f_std_value=f_std_value)
+
+
+    @instrumented("rule6")
+    def _find_rule6(self, i_points_window: int = 5, i_points_out: int = 4,
+                    f_std_value: float = 1.0) -> Tuple[np.ndarray, Intervals]:
+        """
+        Rule 6, see rule6.
+        :return: boolean array of points and intervals of windows fulfilling the condition.
+        """
+        return self._check_direction_and_if_outof_std(i_points_window=i_points_window, i_points_out=i_points_out,
+                                                      f_std_value=f_std_value)
+
+
+    @instrumented("rule7")
+    def _find_rule7(self, i_points: int = 15, f_std_value: float = 1.0) -> Intervals:
+        """
+        Rule 7, see rule7.
+        :return: start indices and (exclusive) end indices of windows fulfilling the condition.
+        """
+        arr_directions = self._check_direction_comparedTo_mean()
+        arr_within_std = ~self._check_if_point_outof_std(f_std_value)
+
+        ## points without limits (e.g. at the start of rolling limits) are not within std
+        arr_within_std &= ~np.isnan(self.f_std)
+        return self._kernels.find_mixed_windows(arr_directions, arr_within_std, i_points, self.arr_offsets)
+
+
+    @instrumented("rule8")
+    def _find_rule8(self, i_points: int = 8, f_std_value: float = 1) -> Intervals:
+        """
+        Rule 8, see rule8.
+        :return: start indices and (exclusive) end indices of windows fulfilling the condition.
+        """
+        arr_directions = self._check_direction_comparedTo_mean()
+        arr_outof_std = self._check_if_point_outof_std(f_std_value)
+
+        ## the last window of each series is not taken into account
+        return self._kernels.find_mixed_windows(arr_directions, arr_outof_std, i_points, self.arr_offsets,
+                                                i_skip_last=1)
+
+
+    def _find_rules(self, rules: Optional[List[str]] = None) -> Iterator[Tuple[str, Union[np.ndarray, Intervals]]]:
+        """
+        Find the points fulfilling each rule according to the rule settings, one rule after the other.
+        Only the shared features required by these rules are evaluated.
+        :param rules: list of rules to evaluate, e.g. ["rule1", "rule2"], default: all rules
+        :return: iterator of result names (see l_rule_results) and boolean arrays or intervals.
+        """
+        for s_rule in self._check_rules(rules):
+            yield from self._find_rule(s_rule, self.d_rules[s_rule])
+
+
+    def _find_rule(self, s_rule: str,
+                   d_settings: Mapping[str, Union[float, int]]) -> Iterator[Tuple[str, Union[np.ndarray, Intervals]]]:
+        """
+        Find the points fulfilling a rule according to the given settings of this rule.
+        :param s_rule: str, rule, e.g. "rule5"
+        :param d_settings: settings of the rule, e.g. {"i_points": 2, "i_points_window": 3, "f_std": 2.0}
+        :return: iterator of result names (see l_rule_results) and boolean arrays or intervals.
+        """
+        if s_rule == "rule1":
+            yield "rule1", self._find_rule1(f_std_value=d_settings["f_std"])
+        elif s_rule in ["rule2", "rule3", "rule4"]:
+            yield s_rule, getattr(self, f"_find_{s_rule}")(i_points=d_settings["i_points"])
+        elif s_rule in ["rule5", "rule6"]:
+            arr_points, t_windows = getattr(self, f"_find_{s_rule}")(
+                i_points_out=d_settings["i_points"],
+                i_points_window=d_settings["i_points_window"],
+                f_std_value=d_settings["f_std"])
+            yield s_rule + "_points", arr_points
+            yield s_rule + "_windows", t_windows
+        else:
+            yield s_rule, getattr(self, f"_find_{s_rule}")(i_points=d_settings["i_points"],
+                                                           f_std_value=d_settings["f_std"])
+
+
+    @staticmethod
+    def _check_rules(rules: Optional[List[str]]) -> List[str]:
+        """
+        Check the names of rules to evaluate.
+        :param rules: list of rules, e.g. ["rule1", "rule2"], or None for all rules
+        :return: list of rules in the order of evaluation.
+        """
+        if rules is None:
+            return l_rules
+        for s_rule in rules:
+            if s_rule not in l_rules:
+                raise ValueError(f"Unknown rule: {s_rule}, choose from {l_rules}")
+        return [s_rule for s_rule in l_rules if s_rule in rules]
+
+
+    def _to_result_array(self, result: Union[np.ndarray, Intervals], dtype: type = int) -> np.ndarray:
+        """
+        Convert a boolean array or intervals into a binary result array.
+        :param result: boolean array or intervals (start indices, exclusive end indices)
+        :param dtype: data type of the result array
+        :return: array containing classification info.
+        """
+        if isinstance(result, tuple):
+            return mark_intervals(*result, self.arr_length, dtype=dtype)
+        return result.astype(dtype)
+
+
+    def _to_intervals(self, result: Union[np.ndarray, Intervals]) -> Intervals:
+        """
+        Convert a boolean array or intervals into intervals that do not cross the boundary between two series.
+        :param result: boolean array or intervals (start indices, exclusive end indices)
+        :return: start indices and (exclusive) end indices of runs of points.
+        """
+        if isinstance(result, tuple):
+            return split_intervals(*result, self.arr_offsets)
+        return find_runs(result, 1, self.arr_offsets)
 
 
     def rule1(self, f_std_value: float = 3.0):
@@ -149,9 +418,7 @@ class NelsonRules:
         :param f_std_value: float, number of standard deviations, e.g. 3.0 for 3 std
         :return: array containing classification info.
         """
-        vfunc = np.vectorize(self._check_if_point_outof_std, excluded=["f_std_value"])
-        arr_result = vfunc(self.arr, f_std_value)
-        self.d_results["rule1"] = arr_result
+        self.d_results["rule1"] = self._to_result_array(self._find_rule1(f_std_value=f_std_value))
 
 
     def rule2(self, i_points: int = 9):
@@ -160,13 +427,7 @@ class NelsonRules:
         :param i_points: int, minimum number of points to fulfill the condition
         :return: array containing classification info.
         """
-        arr_result = np.zeros(self.arr_length, dtype=int)
-        arr_directions = self._check_direction_comparedTo_mean()
-        for i in range(i_points, self.arr_length + 1):
-            arr_window = arr_directions[i - i_points: i]
-            if ((arr_window == -1).sum() == i_points) or ((arr_window == 1).sum() == i_points):
-                arr_result[i - i_points: i] = 1
-        self.d_results["rule2"] = arr_result
+        self.d_results["rule2"] = self._to_result_array(self._find_rule2(i_points=i_points))
 
 
     def rule3(self, i_points: int = 6):
@@ -175,23 +436,7 @@ class NelsonRules:
         :param i_points: int, minimum number of points to fulfill the condition
         :return: array containing classification info.
         """
-        arr_result = np.zeros(self.arr_length, dtype=int)
-        arr_directions = self._check_direction_comparedTo_previousValue()
-        for i in range(i_points, self.arr_length + 1):
-
-            ## first value of array is zero and needs to be updated according to the second value
-            if (i == i_points):
-                if self.arr[1] < self.arr[0]:
-                    arr_directions[0] = -1
-                else:
-                    arr_directions[0] = 1
-
-            ## result array is being updated
-            arr_window = arr_directions[i - i_points: i]
-            if (arr_window.sum() == i_points * (-1)) or (arr_window.sum() == i_points):
-                arr_result[i - i_points: i] = i_points * [1]
-
-        self.d_results["rule3"] = arr_result
+        self.d_results["rule3"] = self._to_result_array(self._find_rule3(i_points=i_points))
 
 
     def rule4(self, i_points: int = 14):
@@ -200,25 +445,7 @@ class NelsonRules:
         :param i_points: int, minimum number of points to fulfill the condition
         :return: array containing classification info.
         """
-        res_a = ([-1, 1] * (int(i_points / 2) + 1))[ : i_points]
-        res_b = ([1, -1] * (int(i_points / 2) + 1))[ : i_points]
-        arr_result = np.zeros(self.arr_length, dtype=int)
-        arr_directions = self._check_direction_comparedTo_previousValue()
-        for i in range(i_points, self.arr_length + 1):
-
-            ## first value of array is zero and needs to be updated according to the second value
-            if (i == i_points):
-                if self.arr[1] < self.arr[0]:
-                    arr_directions[0] = 1
-                else:
-                    arr_directions[0] = -1
-
-            ## result array is being updated
-            arr_window = arr_directions[i - i_points: i]
-            if np.array_equal(arr_window, res_a) or np.array_equal(arr_window, res_b):
-                arr_result[i - i_points: i] = i_points * [1]
-
-        self.d_results["rule4"] = arr_result
+        self.d_results["rule4"] = self._to_result_array(self._find_rule4(i_points=i_points))
 
 
     def rule5(self, i_points_window: int = 3, i_points_out: int = 2, f_std_value: float = 2.0):
@@ -230,10 +457,10 @@ class NelsonRules:
         :param f_std_value: float, number of standard deviations, e.g. 2.0 for 2 std
         :return: array containing classification info.
         """
-        arr_result_points, arr_result_windows = self._check_direction_and_if_outof_std(
+        arr_points, t_windows = self._find_rule5(
             i_points_window=i_points_window, i_points_out=i_points_out, f_std_value=f_std_value)
-        self.d_results["rule5_points"] = arr_result_points
-        self.d_results["rule5_windows"] = arr_result_windows
+        self.d_results["rule5_points"] = self._to_result_array(arr_points)
+        self.d_results["rule5_windows"] = self._to_result_array(t_windows)
 
 
     def rule6(self, i_points_window: int = 5, i_points_out: int = 4, f_std_value: float = 1.0):
@@ -245,10 +472,10 @@ class NelsonRules:
         :param f_std_value: float, number of standard deviations, e.g. 2.0 for 2 std
         :return: array containing classification info.
         """
-        arr_result_points, arr_result_windows = self._check_direction_and_if_outof_std(
+        arr_points, t_windows = self._find_rule6(
             i_points_window=i_points_window, i_points_out=i_points_out, f_std_value=f_std_value)
-        self.d_results["rule6_points"] = arr_result_points
-        self.d_results["rule6_windows"] = arr_result_windows
+        self.d_results["rule6_points"] = self._to_result_array(arr_points)
+        self.d_results["rule6_windows"] = self._to_result_array(t_windows)
 
 
     def rule7(self, i_points: int = 15, f_std_value: float = 1.0):
@@ -258,18 +485,7 @@ class NelsonRules:
         :param f_std_value: float, number of standard deviations, e.g. 2 for 2 std
         :return: array containing classification info.
         """
-        arr_directions = self._check_direction_comparedTo_mean()
-        vfunc = np.vectorize(self._check_if_point_outof_std, excluded=["f_std_value"])
-        arr_outof_std = vfunc(self.arr, f_std_value)
-        arr_within_std = ~arr_outof_std + 2
-        arr_result = np.zeros(self.arr_length, dtype=int)
-        for i in range(i_points, self.arr_length + 1):
-            condition_1 = (arr_directions[i - i_points: i] == -1).sum() >= 1 and \
-                          (arr_directions[i - i_points: i] == 1).sum() >= 1
-            condition_2 = (arr_within_std[i - i_points: i] == 1).sum() == i_points
-            if condition_1 and condition_2:
-                arr_result[i - i_points : i] = i_points * [1]
-        self.d_results["rule7"] = arr_result
+        self.d_results["rule7"] = self._to_result_array(self._find_rule7(i_points=i_points, f_std_value=f_std_value))
 
 
     def rule8(self, i_points: int = 8, f_std_value: float = 1):
@@ -280,43 +496,343 @@ class NelsonRules:
         :param f_std_value: float, number of standard deviations, e.g. 2.0 for 2 std
         :return: array containing classification info.
         """
-        arr_directions = self._check_direction_comparedTo_mean()
-        vfunc = np.vectorize(self._check_if_point_outof_std, excluded=["f_std_value"])
-        arr_outof_std = vfunc(self.arr, f_std_value)
-        arr_result = np.zeros(self.arr_length, dtype=int)
-        for i in range(i_points, self.arr_length):
-            condition_1 = np.count_nonzero(arr_directions[i - i_points : i] == 1) > 0
-            condition_2 = np.count_nonzero(arr_directions[i - i_points : i] == -1) > 0
-            condition_3 = arr_outof_std[i - i_points : i].sum() == i_points
-            if condition_1 and condition_2 and condition_3:
-                arr_result[i - i_points : i] = i_points * [1]
-        self.d_results["rule8"] = arr_result
+        self.d_results["rule8"] = self._to_result_array(self._find_rule8(i_points=i_points, f_std_value=f_std_value))
 
 
-    def apply_rules(self) -> Dict[str, np.array]:
+    def _to_columns(self, rules: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
         """
-        Apply all rules and load results to result dictionary.
-        :return: result dictionary.
+        Evaluate z-scores and rule results as narrow columns: float64 z-scores and one int8 array (0/1)
+        per rule result, without input data.
+        :param rules: list of rules to evaluate, e.g. ["rule1", "rule2"], default: all rules
+        :return: dictionary of result columns.
+        """
+        d_columns = {"zscore": self._evaluate_zscore()}
+        for s_key, result in self._find_rules(rules):
+            d_columns[s_key] = self._to_result_array(result, dtype=np.int8)
+        return d_columns
+
+
+    def apply_rules(self, s_output: str = "dict",
+                    rules: Optional[List[str]] = None) -> Union[Dict[str, np.array], np.ndarray, pd.DataFrame]:
         """
-        ## evaluate z score for each value
-        vfunc = np.vectorize(self._evaluate_zscore)
-        arr_result = vfunc(self.arr)
+        Apply all rules (or the selected rules) and load results to result dictionary.
+        :param s_output: str, "dict" for the result dictionary, "flags" for a compact uint16 array
+                with one bit per rule result for each point (see flags.unpack_rule), "intervals"
+                for a structured array of runs of points (rule, start, exclusive end) fulfilling each rule,
+                "frame" for a DataFrame or "arrow" for a pa.RecordBatch (requires pyarrow) of z-scores
+                and int8 rule results, sharing the memory of the result arrays
+        :param rules: list of rules to evaluate, e.g. ["rule1", "rule2"], default: all rules
+        :return: result dictionary, array of flags, array of intervals, DataFrame or pa.RecordBatch.
+        """
+        if s_output == "frame":
+            return pd.DataFrame(self._to_columns(rules), copy=False)
+
+        if s_output == "arrow":
+            return to_record_batch(self._to_columns(rules))
+
+        if s_output == "flags":
+            arr_flags = np.zeros(self.arr_length, dtype=np.uint16)
+            for s_key, result in self._find_rules(rules):
+                arr_flags |= self._to_result_array(result, dtype=np.uint16) << d_rule_bits[s_key]
+            return arr_flags
+
+        if s_output == "intervals":
+            l_intervals = [np.empty(0, dtype=dtype_intervals)]
+            for s_key, result in self._find_rules(rules):
+                arr_starts, arr_ends = self._to_intervals(result)
+                arr_intervals = np.empty(arr_starts.shape[0], dtype=dtype_intervals)
+                arr_intervals["rule"], arr_intervals["start"], arr_intervals["end"] = s_key, arr_starts, arr_ends
+                l_intervals.append(arr_intervals)
+            return np.concatenate(l_intervals)
+
+        if s_output != "dict":
+            raise ValueError(f"Unknown output: {s_output}")
+
+        ## evaluate z score for each value; the result is a writable copy of the (read-only) cached feature
+        arr_result = self._evaluate_zscore().copy()
         self.d_results["zscore"] = arr_result
 
         ## apply rules
-        self.rule1(f_std_value=self.d_rules["rule1"]["f_std"])
-        self.rule2(i_points=self.d_rules["rule2"]["i_points"])
-        self.rule3(i_points=self.d_rules["rule3"]["i_points"])
-        self.rule4(i_points=self.d_rules["rule4"]["i_points"])
-        self.rule5(i_points_out=self.d_rules["rule5"]["i_points"],
-                   i_points_window=self.d_rules["rule5"]["i_points_window"],
-                   f_std_value=self.d_rules["rule5"]["f_std"])
-        self.rule6(i_points_out=self.d_rules["rule6"]["i_points"],
-                   i_points_window=self.d_rules["rule6"]["i_points_window"],
-                   f_std_value=self.d_rules["rule6"]["f_std"])
-        self.rule7(i_points=self.d_rules["rule7"]["i_points"],
-                   f_std_value=self.d_rules["rule7"]["f_std"])
-        self.rule8(i_points=self.d_rules["rule8"]["i_points"],
-                   f_std_value=self.d_rules["rule8"]["f_std"])
+        for s_key, result in self._find_rules(rules):
+            self.d_results[s_key] = self._to_result_array(result)
+
+        return self.d_results
+
+
+    def write_parquet(self, path, rules: Optional[List[str]] = None, **kwargs) -> None:
+        """
+        Apply all rules (or the selected rules) and write z-scores and int8 rule results to a Parquet file
+        (requires pyarrow), see apply_rules(s_output="arrow").
+        :param path: path of the Parquet file
+        :param rules: list of rules to evaluate, e.g. ["rule1", "rule2"], default: all rules
+        :param kwargs: further arguments of pyarrow.parquet.write_table, e.g. compression="zstd"
+        """
+        write_parquet(self.apply_rules(s_output="arrow", rules=rules), path, **kwargs)
+
+
+    ##### SUMMARY ################################################################
+
+    def _summarize(self, rules: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Aggregate the results of each rule per series from the runs of points fulfilling it,
+        without result arrays per point.
+        :param rules: list of rules to evaluate, e.g. ["rule1", "rule2"], default: all rules
+        :return: dictionary of summary columns with one row per series and rule result: series, result,
+                points, events, first, last (indices relative to the start of the series, -1 without any points).
+        """
+        i_series = self.arr_offsets.shape[0] - 1
+        l_keys, l_points, l_events, l_first, l_last = [], [], [], [], []
+        for s_key, result in self._find_rules(rules):
+            arr_starts, arr_ends = self._to_intervals(result)
+            arr_series = np.searchsorted(self.arr_offsets, arr_starts, side="right") - 1
+            arr_events = np.bincount(arr_series, minlength=i_series)
+            arr_first, arr_last = np.full(i_series, -1, dtype=np.int64), np.full(i_series, -1, dtype=np.int64)
+            if arr_starts.shape[0] > 0:
+                ## intervals are sorted, so the first and last interval of each series are found by position
+                arr_has = arr_events > 0
+                arr_first_interval = np.searchsorted(arr_series, np.arange(i_series), side="left")[arr_has]
+                arr_last_interval = np.searchsorted(arr_series, np.arange(i_series), side="right")[arr_has] - 1
+                arr_first[arr_has] = arr_starts[arr_first_interval] - self.arr_offsets[:-1][arr_has]
+                arr_last[arr_has] = arr_ends[arr_last_interval] - 1 - self.arr_offsets[:-1][arr_has]
+            l_keys.append(s_key)
+            l_points.append(np.bincount(arr_series, weights=arr_ends - arr_starts, minlength=i_series))
+            l_events.append(arr_events)
+            l_first.append(arr_first)
+            l_last.append(arr_last)
+
+        ## one row per series and rule result, ordered by series
+        return {"series": np.repeat(np.arange(i_series), len(l_keys)),
+                "result": np.tile(np.array(l_keys, dtype="U13"), i_series),
+                **{s_column: np.array(l_column, dtype=np.int64).T.reshape(-1) for s_column, l_column in
+                   [("points", l_points), ("events", l_events), ("first", l_first), ("last", l_last)]}}
+
+
+    def summarize(self, rules: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Apply all rules (or the selected rules) and aggregate their results, e.g. for reports. The aggregates
+        are evaluated from the runs of points fulfilling each rule, without result arrays per point.
+        :param rules: list of rules to evaluate, e.g. ["rule1", "rule2"], default: all rules
+        :return: DataFrame with one row per rule result (see l_rule_results): number of points ("points")
+                and runs of points ("events", see apply_rules(s_output="intervals")) fulfilling it,
+                and the index of the first and last point fulfilling it ("first", "last").
+        """
+        d_summary = self._summarize(rules)
+        del d_summary["series"]
+        return summary_frame(d_summary)
+
 
+    ##### PARAMETER SWEEP ########################################################
+
+    @staticmethod
+    def _filter_runs(t_runs: Intervals, i_points: int) -> Intervals:
+        """
+        Get the runs of Rule 02, 03 or 04 of at least i_points points among all runs of this rule.
+        All runs are found with the first value of each series updated (see _set_first_directions); this only
+        differs from an evaluation with i_points in series shorter than i_points, which cannot contain such runs.
+        :param t_runs: start indices and (exclusive) end indices of all runs of the rule (at least 1 point)
+        :param i_points: int, minimum number of points to fulfill the condition
+        :return: start indices and (exclusive) end indices of runs fulfilling the condition.
+        """
+        arr_starts, arr_ends = t_runs
+        arr_keep = ((arr_ends - arr_starts) >= i_points) & (i_points >= 1)
+        return arr_starts[arr_keep], arr_ends[arr_keep]
+
+
+    def sweep(self, d_grid: Dict[str, Dict[str, Iterable[Union[float, int]]]], b_masks: bool = False) -> pd.DataFrame:
+        """
+        Evaluate rules for a grid of settings at once, e.g. for tuning. Shared features (directions, zones,
+        points out of std) are evaluated once, and the runs of Rule 02, 03 and 04 are found once for all
+        numbers of points. Settings not given in the grid are taken from the rule settings.
+        :param d_grid: dictionary of values of each setting of each rule,
+                e.g. {"rule2": {"i_points": range(7, 13)}, "rule5": {"i_points": [2, 3], "f_std": [1.5, 2.0]}}
+        :param b_masks: bool, add a column "mask" with the boolean array of points fulfilling each result
+        :return: DataFrame with one row per rule result and combination of settings, containing the settings,
+                the number of points ("points") and the number of runs of points ("events", see
+                apply_rules(s_output="intervals")) fulfilling the result.
+        """
+        l_records = []
+        for s_rule in self._check_rules(list(d_grid)):
+            d_values = {s_setting: [values] if np.isscalar(values) else list(values)
+                        for s_setting, values in d_grid[s_rule].items()}
+            t_runs = getattr(self, f"_find_{s_rule}")(i_points=1) if s_rule in ["rule2", "rule3", "rule4"] else None
+
+            for t_values in itertools.product(*d_values.values()):
+                d_settings = self.d_rules.replace({s_rule: dict(zip(d_values, t_values))})[s_rule]
+                if t_runs is None:
+                    l_results = self._find_rule(s_rule, d_settings)
+                else:
+                    l_results = [(s_rule, self._filter_runs(t_runs, d_settings["i_points"]))]
+
+                for s_key, result in l_results:
+                    arr_starts, arr_ends = self._to_intervals(result)
+                    d_record = {"rule": s_rule, "result": s_key, **d_settings,
+                                "points": int(np.sum(arr_ends - arr_starts)), "events": arr_starts.shape[0]}
+                    if b_masks:
+                        d_record["mask"] = self._to_result_array(result, dtype=np.uint8).view(bool)
+                    l_records.append(d_record)
+
+        l_columns = ["rule", "result", "i_points", "i_points_window", "f_std", "points", "events"]
+        df_sweep = pd.DataFrame(l_records, columns=l_columns + (["mask"] if b_masks else []))
+        return df_sweep.astype({"i_points": "Int64", "i_points_window": "Int64"})
+
+
+    ##### INCREMENTAL APPEND #####################################################
+
+    def _get_buffer(self, s_key: str, arr_current: np.ndarray, i_length: int, dtype: np.dtype) -> np.ndarray:
+        """
+        Get the buffer of an array (input data or result) with capacity for i_length elements. If the array is not
+        a view of its buffer (e.g. after apply_rules) or the buffer is full, a new buffer is allocated with twice
+        the length of the array, so that the arrays are copied O(log n) times while appending n points.
+        :param s_key: str, key of the array, e.g. "input_data" or "rule2"
+        :param arr_current: current array
+        :param i_length: int, number of elements required
+        :param dtype: data type of the buffer
+        :return: buffer whose first elements are the current array.
+        """
+        arr_buffer = self._d_buffers.get(s_key)
+        if (arr_buffer is None) or (arr_current.base is not arr_buffer) or (arr_buffer.shape[0] < i_length) or \
+                (arr_buffer.dtype != dtype):
+            arr_buffer = np.empty(max(i_length, 2 * arr_current.shape[0]), dtype=dtype)
+            arr_buffer[:arr_current.shape[0]] = arr_current
+            self._d_buffers[s_key] = arr_buffer
+        return arr_buffer
+
+
+    def extend(self, arr_new: np.ndarray) -> Dict[str, np.array]:
+        """
+        Append new data points and update the results in the result dictionary (see apply_rules), e.g. for a
+        series that grows every minute. Requires fixed control limits. Only the results of the last points are
+        evaluated again: the largest window of the rules before the new points, which may now be completed
+        (or no longer be the last window of the series), and the new points. The cost therefore depends on the
+        number of new points, not on the length of the series.
+        :param arr_new: 1D array of new data points
+        :return: result dictionary.
+        """
+        if isinstance(self.f_mean, np.ndarray) or isinstance(self.f_std, np.ndarray) or not self.b_fixed_limits:
+            raise ValueError("Please provide fixed control limits (mean, std) to extend the input data!")
+        ## float data keep their data type (e.g. float32), other data are promoted if required (e.g. to floats)
+        if self.arr.dtype.kind == "f":
+            arr_new = as_input_array(arr_new, dtype=self.arr.dtype)
+        else:
+            arr_new = as_input_array(arr_new)
+        i_length_old = self.arr_length
+        i_length = i_length_old + arr_new.shape[0]
+
+        arr_buffer = self._get_buffer("input_data", self.arr, i_length, np.result_type(self.arr, arr_new))
+        arr_buffer[i_length_old:i_length] = arr_new
+        self.arr = arr_buffer[:i_length]
+        self.d_results["input_data"] = self.arr
+
+        l_keys = [s_key for s_key in self.d_results if s_key in l_rule_results]
+        if "zscore" in self.d_results:
+            arr_zscore = self._get_buffer("zscore", self.d_results["zscore"], i_length, self.d_results["zscore"].dtype)
+            arr_zscore[i_length_old:i_length] = zscore(self.arr[i_length_old:i_length], self.f_mean, self.f_std)
+            self.d_results["zscore"] = arr_zscore[:i_length]
+        if len(l_keys) == 0:
+            return self.d_results
+
+        ## points whose results may change, and the points before them that windows and runs may start at
+        i_halo = self.d_rules.i_max_window
+        i_update_start = max(i_length_old - i_halo, 0)
+        i_chunk_start = max(i_update_start - i_halo, 0)
+        nr = self._get_chunk(i_chunk_start, i_length)
+        l_rules_checked = [s_rule for s_rule in l_rules if any(s_key.startswith(s_rule) for s_key in l_keys)]
+        for s_key, result in nr._find_rules(l_rules_checked):
+            if s_key not in l_keys:
+                continue
+            arr_result = self._get_buffer(s_key, self.d_results[s_key], i_length, self.d_results[s_key].dtype)
+            arr_result[i_update_start:i_length] = \
+                nr._to_result_array(result, dtype=arr_result.dtype)[i_update_start - i_chunk_start:]
+            self.d_results[s_key] = arr_result[:i_length]
         return self.d_results
+
+
+    ##### EARLY EXIT #############################################################
+
+    def _get_chunk(self, i_start: int, i_end: int) -> "NelsonRules":
+        """
+        Get the evaluation of a slice of the data with the same limits, rule settings and series boundaries.
+        :param i_start: int, first data point of the slice
+        :param i_end: int, (exclusive) last data point of the slice
+        :return: NelsonRules of the slice.
+        """
+        f_mean = self.f_mean[i_start:i_end] if isinstance(self.f_mean, np.ndarray) else self.f_mean
+        f_std = self.f_std[i_start:i_end] if isinstance(self.f_std, np.ndarray) else self.f_std
+        nr = NelsonRules(self.arr[i_start:i_end], self.d_rules, limits=ControlLimits(f_mean, f_std),
+                         backend=self.backend)
+        nr.arr_offsets = np.unique(np.clip(self.arr_offsets, i_start, i_end)) - i_start
+        return nr
+
+
+    @staticmethod
+    def _first_point(result: Union[np.ndarray, Intervals], i_start: int, i_end: int) -> Optional[int]:
+        """
+        Get the first point between i_start and i_end that fulfills a rule.
+        :param result: boolean array or intervals (start indices, exclusive end indices)
+        :param i_start: int, first data point
+        :param i_end: int, (exclusive) last data point
+        :return: int, index of the point, or None.
+        """
+        if isinstance(result, tuple):
+            arr_starts, arr_ends = result
+            arr_overlap = (arr_starts < i_end) & (arr_ends > i_start)
+            return int(max(arr_starts[arr_overlap][0], i_start)) if arr_overlap.any() else None
+        arr_points = np.flatnonzero(result[i_start:i_end])
+        return int(arr_points[0]) + i_start if arr_points.shape[0] > 0 else None
+
+
+    def _find_first_violation(self, rules: Optional[List[str]], b_any: bool,
+                              i_chunk_size: int) -> Optional[Tuple[int, str]]:
+        """
+        Evaluate the rules on chunks of growing size, until a chunk contains a point fulfilling a rule.
+        Each chunk is extended by the largest window on both sides (see chunked.apply_rules_chunked).
+        :param rules: list of rules to evaluate, default: all rules
+        :param b_any: bool, stop at the first rule fulfilled within a chunk instead of evaluating all rules
+        :param i_chunk_size: int, number of points of the first chunk
+        :return: index of the first point fulfilling a rule and the name of the result, or None.
+        """
+        l_rules_checked = self._check_rules(rules)
+        i_halo = self.d_rules.i_max_window
+        i_start = 0
+        while i_start < self.arr_length:
+            i_end = min(i_start + i_chunk_size, self.arr_length)
+            i_halo_start, i_halo_end = max(i_start - i_halo, 0), min(i_end + i_halo, self.arr_length)
+            nr = self if (i_halo_start, i_halo_end) == (0, self.arr_length) else \
+                self._get_chunk(i_halo_start, i_halo_end)
+
+            t_first = None
+            for s_key, result in nr._find_rules(l_rules_checked):
+                i_point = self._first_point(result, i_start - i_halo_start, i_end - i_halo_start)
+                if (i_point is not None) and ((t_first is None) or (i_point + i_halo_start < t_first[0])):
+                    t_first = (i_point + i_halo_start, s_key)
+                    if b_any:
+                        break
+            if t_first is not None:
+                return t_first
+            i_start = i_end
+            i_chunk_size *= 2
+        return None
+
+
+    def first_violation(self, rules: Optional[List[str]] = None,
+                        i_chunk_size: int = 4096) -> Optional[Tuple[int, str]]:
+        """
+        Find the first data point that fulfills any rule (or any of the selected rules). The data is evaluated
+        in chunks of growing size, and the evaluation stops after the first chunk containing such a point.
+        :param rules: list of rules to evaluate, e.g. ["rule1", "rule2"], default: all rules
+        :param i_chunk_size: int, number of points of the first chunk
+        :return: index of the data point and name of the rule result (see l_rule_results), e.g. (17, "rule2"),
+                or None if no data point fulfills any rule.
+        """
+        return self._find_first_violation(rules, b_any=False, i_chunk_size=i_chunk_size)
+
+
+    def any_violation(self, rules: Optional[List[str]] = None, i_chunk_size: int = 4096) -> bool:
+        """
+        Check if any data point fulfills any rule (or any of the selected rules). The evaluation stops at the
+        first rule fulfilled in the first chunk containing such a point (see first_violation).
+        :param rules: list of rules to evaluate, e.g. ["rule1", "rule2"], default: all rules
+        :param i_chunk_size: int, number of points of the first chunk
+        :return: True if the process is out of control.
+        """
+        return self._find_first_violation(rules, b_any=True, i_chunk_size=i_chunk_size) is not None
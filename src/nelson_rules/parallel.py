@@ -0,0 +1,213 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from .batch import BatchNelsonRules
+from .config import RuleConfig, RuleSettings, d_rules
+from .nelson_rules import l_rule_results, summary_frame
+
+
+def _attach(s_name: str) -> SharedMemory:
+    """
+    Attach to a shared memory block created by the parent process, which remains responsible for unlinking it.
+    Before Python 3.13, worker processes share the resource tracker of the parent process, which keeps track
+    of each block only once.
+    :param s_name: str, name of the shared memory block
+    :return: shared memory block.
+    """
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=s_name, track=False)
+    return SharedMemory(name=s_name)
+
+
+def _evaluate_chunk(arr_input: np.ndarray, arr_zscore: np.ndarray, arr_results: np.ndarray,
+                    arr_offsets: np.ndarray, d_rule_settings: RuleConfig) -> None:
+    """
+    Apply all rules to a chunk of consecutive series and write the results to the result arrays.
+    :param arr_input: 1D array of all series one after the other
+    :param arr_zscore: 1D array to write z-scores to
+    :param arr_results: 2D array (rule results x points) to write rule results to
+    :param arr_offsets: array of the series boundaries of the chunk
+    :param d_rule_settings: rule configuration
+    """
+    i_start, i_end = arr_offsets[0], arr_offsets[-1]
+    d_results = BatchNelsonRules(arr_input[i_start:i_end], arr_offsets=arr_offsets - i_start,
+                                 d_rule_settings=d_rule_settings).apply_rules()
+    arr_zscore[i_start:i_end] = d_results["zscore"]
+    for i_rule, s_key in enumerate(l_rule_results):
+        arr_results[i_rule, i_start:i_end] = d_results[s_key]
+
+
+def _apply_chunk(t_task: Tuple[str, str, str, int, np.ndarray, RuleConfig]) -> None:
+    """
+    Worker process: apply all rules to a chunk of consecutive series in shared memory.
+    :param t_task: tuple of the names of the shared memory blocks (input data, z-scores, rule results),
+            the total number of points, the series boundaries of the chunk and the rule configuration
+    """
+    s_input, s_zscore, s_results, i_total, arr_offsets, d_rule_settings = t_task
+    l_shm = [_attach(s_input), _attach(s_zscore), _attach(s_results)]
+    try:
+        _evaluate_chunk(np.ndarray((i_total,), dtype=np.float64, buffer=l_shm[0].buf),
+                        np.ndarray((i_total,), dtype=np.float64, buffer=l_shm[1].buf),
+                        np.ndarray((len(l_rule_results), i_total), dtype=np.int8, buffer=l_shm[2].buf),
+                        arr_offsets, d_rule_settings)
+    finally:
+        for shm in l_shm:
+            shm.close()
+
+
+def _summarize_series(arr_input: np.ndarray, arr_offsets: np.ndarray, d_rule_settings: RuleConfig,
+                      rules: Optional[List[str]]) -> Dict[str, np.ndarray]:
+    """
+    Aggregate the rule results of a chunk of consecutive series.
+    :param arr_input: 1D array of all series one after the other
+    :param arr_offsets: array of the series boundaries of the chunk
+    :param d_rule_settings: rule configuration
+    :param rules: list of rules to evaluate, default: all rules
+    :return: dictionary of summary columns with series numbered from 0, see NelsonRules._summarize.
+    """
+    i_start, i_end = arr_offsets[0], arr_offsets[-1]
+    return BatchNelsonRules(arr_input[i_start:i_end], arr_offsets=arr_offsets - i_start,
+                            d_rule_settings=d_rule_settings)._summarize(rules)
+
+
+def _summarize_chunk(t_task: Tuple[str, int, np.ndarray, RuleConfig, Optional[List[str]]]) -> Dict[str, np.ndarray]:
+    """
+    Worker process: aggregate the rule results of a chunk of consecutive series in shared memory.
+    :param t_task: tuple of the name of the shared memory block of input data, the total number of points,
+            the series boundaries of the chunk, the rule configuration and the rules to evaluate
+    :return: dictionary of summary columns with series numbered from 0.
+    """
+    s_input, i_total, arr_offsets, d_rule_settings, rules = t_task
+    shm = _attach(s_input)
+    try:
+        return _summarize_series(np.ndarray((i_total,), dtype=np.float64, buffer=shm.buf),
+                                 arr_offsets, d_rule_settings, rules)
+    finally:
+        shm.close()
+
+
+def _split_chunks(arr_offsets: np.ndarray, i_chunks: int) -> List[np.ndarray]:
+    """
+    Split series into chunks of consecutive series with similar numbers of points.
+    :param arr_offsets: array of series boundaries
+    :param i_chunks: int, number of chunks
+    :return: list of the series boundaries of each chunk.
+    """
+    arr_targets = np.linspace(0, arr_offsets[-1], i_chunks + 1)[1:-1]
+    arr_bounds = np.unique(np.concatenate(([0], np.searchsorted(arr_offsets, arr_targets),
+                                           [arr_offsets.shape[0] - 1])))
+    return [arr_offsets[i_first : i_last + 1] for i_first, i_last in zip(arr_bounds[:-1], arr_bounds[1:])]
+
+
+def apply_many(l_series: Iterable[Union[np.ndarray, List[float]]],
+               d_rule_settings: RuleSettings = d_rules,
+               i_workers: Optional[int] = None, i_chunks_per_worker: int = 4) -> List[Dict[str, np.ndarray]]:
+    """
+    Apply all rules to many independent series in parallel worker processes.
+    Input data and results are exchanged through shared memory, and each worker evaluates chunks
+    of consecutive series at once (see BatchNelsonRules).
+    :param l_series: iterable of series (1D arrays or lists of numeric values)
+    :param d_rule_settings: RuleConfig or dictionary of rule settings
+    :param i_workers: int, number of worker processes, default: number of CPUs
+    :param i_chunks_per_worker: int, number of chunks per worker for load balancing
+    :return: list of result dictionaries in the order of the input series;
+            rule results are int8 arrays to keep the exchange of results small.
+    """
+    l_series = [np.asarray(arr_series, dtype=np.float64) for arr_series in l_series]
+    config = RuleConfig.from_settings(d_rule_settings)
+    if len(l_series) == 0:
+        return []
+    i_workers = i_workers or os.cpu_count() or 1
+    arr_offsets = np.concatenate(([0], np.cumsum([arr_series.shape[0] for arr_series in l_series])))
+    i_total = int(arr_offsets[-1])
+    l_chunks = _split_chunks(arr_offsets, i_workers * i_chunks_per_worker)
+
+    l_shm = [SharedMemory(create=True, size=max(i_size, 1))
+             for i_size in [8 * i_total, 8 * i_total, len(l_rule_results) * i_total]]
+    try:
+        arr_input = np.ndarray((i_total,), dtype=np.float64, buffer=l_shm[0].buf)
+        arr_zscore = np.ndarray((i_total,), dtype=np.float64, buffer=l_shm[1].buf)
+        arr_results = np.ndarray((len(l_rule_results), i_total), dtype=np.int8, buffer=l_shm[2].buf)
+        for arr_series, i_start in zip(l_series, arr_offsets[:-1]):
+            arr_input[i_start : i_start + arr_series.shape[0]] = arr_series
+
+        if i_workers == 1:
+            for arr_chunk in l_chunks:
+                _evaluate_chunk(arr_input, arr_zscore, arr_results, arr_chunk, config)
+        else:
+            l_tasks = [(l_shm[0].name, l_shm[1].name, l_shm[2].name, i_total, arr_chunk, config)
+                       for arr_chunk in l_chunks]
+            with ProcessPoolExecutor(max_workers=i_workers) as executor:
+                list(executor.map(_apply_chunk, l_tasks))
+
+        ## copy the results out of shared memory before it is released
+        arr_zscore = arr_zscore.copy()
+        arr_results = arr_results.copy()
+        del arr_input
+    finally:
+        for shm in l_shm:
+            shm.close()
+            shm.unlink()
+
+    l_results = []
+    for arr_series, i_start, i_end in zip(l_series, arr_offsets[:-1], arr_offsets[1:]):
+        d_results = {"input_data": arr_series, "zscore": arr_zscore[i_start:i_end]}
+        for i_rule, s_key in enumerate(l_rule_results):
+            d_results[s_key] = arr_results[i_rule, i_start:i_end]
+        l_results.append(d_results)
+    return l_results
+
+
+def summarize_many(l_series: Iterable[Union[np.ndarray, List[float]]],
+                   d_rule_settings: RuleSettings = d_rules, rules: Optional[List[str]] = None,
+                   i_workers: Optional[int] = None, i_chunks_per_worker: int = 4) -> pd.DataFrame:
+    """
+    Apply all rules (or the selected rules) to many independent series in parallel worker processes and
+    aggregate their results per series (see BatchNelsonRules.summarize). Input data is exchanged through
+    shared memory, and only the aggregates are returned by the workers.
+    :param l_series: iterable of series (1D arrays or lists of numeric values)
+    :param d_rule_settings: RuleConfig or dictionary of rule settings
+    :param rules: list of rules to evaluate, e.g. ["rule1", "rule2"], default: all rules
+    :param i_workers: int, number of worker processes, default: number of CPUs
+    :param i_chunks_per_worker: int, number of chunks per worker for load balancing
+    :return: DataFrame with one row per series (in the order of the input series) and rule result.
+    """
+    l_series = [np.asarray(arr_series, dtype=np.float64) for arr_series in l_series]
+    config = RuleConfig.from_settings(d_rule_settings)
+    if len(l_series) == 0:
+        return summary_frame({"series": np.zeros(0, dtype=np.int64), "result": np.zeros(0, dtype="U13"),
+                              **{s_column: np.zeros(0, dtype=np.int64)
+                                 for s_column in ["points", "events", "first", "last"]}})
+    i_workers = i_workers or os.cpu_count() or 1
+    arr_offsets = np.concatenate(([0], np.cumsum([arr_series.shape[0] for arr_series in l_series])))
+    i_total = int(arr_offsets[-1])
+    l_chunks = _split_chunks(arr_offsets, i_workers * i_chunks_per_worker)
+
+    shm = SharedMemory(create=True, size=max(8 * i_total, 1))
+    try:
+        arr_input = np.ndarray((i_total,), dtype=np.float64, buffer=shm.buf)
+        for arr_series, i_start in zip(l_series, arr_offsets[:-1]):
+            arr_input[i_start : i_start + arr_series.shape[0]] = arr_series
+
+        if i_workers == 1:
+            l_summaries = [_summarize_series(arr_input, arr_chunk, config, rules) for arr_chunk in l_chunks]
+        else:
+            l_tasks = [(shm.name, i_total, arr_chunk, config, rules) for arr_chunk in l_chunks]
+            with ProcessPoolExecutor(max_workers=i_workers) as executor:
+                l_summaries = list(executor.map(_summarize_chunk, l_tasks))
+        del arr_input
+    finally:
+        shm.close()
+        shm.unlink()
+
+    ## series of each chunk are numbered from 0
+    arr_first_series = np.searchsorted(arr_offsets, [arr_chunk[0] for arr_chunk in l_chunks], side="left")
+    for d_summary, i_first_series in zip(l_summaries, arr_first_series):
+        d_summary["series"] = d_summary["series"] + i_first_series
+    return summary_frame({s_column: np.concatenate([d_summary[s_column] for d_summary in l_summaries])
+                          for s_column in l_summaries[0]})
@@ -0,0 +1,193 @@
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import Executor
+from typing import AsyncIterator, Callable, Dict, Hashable, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from .config import RuleConfig, RuleSettings, d_rules
+from .limits import ControlLimits
+from .streaming import StreamingNelsonRules
+
+
+class Violation(NamedTuple):
+    """
+    Data point of a stream that fulfills at least one rule.
+    """
+
+    key: Hashable
+    i_index: int
+    f_value: float
+    t_rules: Tuple[str, ...]
+    f_latency: float
+
+
+def _evaluate(snr: StreamingNelsonRules,
+              arr_values: np.ndarray) -> Tuple[StreamingNelsonRules, List[Tuple[int, float, Tuple[str, ...]]]]:
+    """
+    Check a batch of data points of a stream.
+    :param snr: online detector of the stream
+    :param arr_values: array of new data points
+    :return: the updated detector (a copy, if evaluated in another process),
+            and list of the index, value and fired rules of each data point that fulfills a rule.
+    """
+    l_fired = []
+    for x in arr_values.tolist():
+        i_index = snr.i_count
+        t_rules = snr.update(x)
+        if t_rules:
+            l_fired.append((i_index, x, t_rules))
+    return snr, l_fired
+
+
+class SPCService:
+    """
+    In-process asyncio service that checks many live streams at once. Each stream (identified by its key)
+    keeps its own online detector (see StreamingNelsonRules), and batches of measurements are pushed per stream.
+    Streams are spread over worker tasks with bounded queues: push() waits while the queue of a stream is full
+    (backpressure). Large batches are checked in an executor, so that the event loop stays responsive.
+    Violations are emitted as async events, see events(). The events must be consumed while the service runs:
+    once i_queue_size violations are pending, the workers wait for them to be consumed (backpressure).
+    """
+
+    def __init__(self, limits: Union[ControlLimits, Callable[[Hashable], ControlLimits]],
+                 d_rule_settings: RuleSettings = d_rules, i_workers: int = 8, i_queue_size: int = 1024,
+                 i_offload_points: int = 1024, executor: Optional[Executor] = None,
+                 i_latencies: int = 100_000) -> None:
+        """
+        :param limits: control limits of all streams, or function returning the control limits of a new stream key
+        :param d_rule_settings: RuleConfig or dictionary of rule settings
+        :param i_workers: int, number of worker tasks; each stream is always checked by the same worker
+        :param i_queue_size: int, number of batches each worker queue (and the event queue) holds
+        :param i_offload_points: int, batches of at least this number of points are checked in the executor
+        :param executor: executor for large batches, default: default executor of the event loop;
+                in a process pool, the detector of the stream is sent to the process and back with each batch
+        :param i_latencies: int, number of the latest ingest-to-alert latencies kept for percentiles
+        """
+        self.limits = limits
+        self.d_rules = RuleConfig.from_settings(d_rule_settings)
+        self.i_workers = i_workers
+        self.i_queue_size = i_queue_size
+        self.i_offload_points = i_offload_points
+        self.executor = executor
+        self.d_detectors: Dict[Hashable, StreamingNelsonRules] = {}
+        self.dq_latencies = deque(maxlen=i_latencies)
+        self.i_points = 0
+        self.i_violations = 0
+        self._l_queues: List[asyncio.Queue] = []
+        self._l_tasks: List[asyncio.Task] = []
+        self._events: Optional[asyncio.Queue] = None
+        self._b_stopped = False
+
+
+    async def __aenter__(self) -> "SPCService":
+        await self.start()
+        return self
+
+
+    async def __aexit__(self, *args) -> None:
+        await self.stop()
+
+
+    async def start(self) -> None:
+        """
+        Start the worker tasks on the running event loop.
+        """
+        self._events = asyncio.Queue(maxsize=self.i_queue_size)
+        self._b_stopped = False
+        self._l_queues = [asyncio.Queue(maxsize=self.i_queue_size) for _ in range(self.i_workers)]
+        self._l_tasks = [asyncio.create_task(self._run_worker(queue)) for queue in self._l_queues]
+
+
+    async def stop(self) -> None:
+        """
+        Check all batches pushed so far, stop the worker tasks and end the events.
+        Up to i_queue_size pending violations can still be consumed after stop(). If more violations are pending,
+        the workers wait for them to be consumed, so stop() waits forever unless events() is consumed concurrently.
+        """
+        for queue in self._l_queues:
+            await queue.put(None)
+        await asyncio.gather(*self._l_tasks)
+        self._l_tasks = []
+        self._b_stopped = True
+        ## end of events; a full queue is ended by events() once it is drained
+        if not self._events.full():
+            self._events.put_nowait(None)
+
+
+    async def push(self, key: Hashable, values: Union[np.ndarray, Iterable[float]]) -> None:
+        """
+        Push a batch of measurements of a stream. Waits while the queue of the stream is full.
+        :param key: key of the stream, e.g. ("machine 1", "diameter")
+        :param values: new data points in the order of measurement
+        """
+        f_ingest = time.perf_counter()
+        queue = self._l_queues[hash(key) % self.i_workers]
+        await queue.put((key, np.asarray(values, dtype=np.float64), f_ingest))
+
+
+    async def events(self) -> AsyncIterator[Violation]:
+        """
+        Iterate over the violations of all streams, until the service is stopped.
+        :return: async iterator of violations.
+        """
+        while True:
+            if self._b_stopped and self._events.empty():
+                return
+            violation = await self._events.get()
+            if violation is None:
+                return
+            yield violation
+
+
+    def _get_detector(self, key: Hashable) -> StreamingNelsonRules:
+        """
+        Get the online detector of a stream, created on the first batch of the stream.
+        :param key: key of the stream
+        :return: online detector.
+        """
+        snr = self.d_detectors.get(key)
+        if snr is None:
+            limits = self.limits(key) if callable(self.limits) else self.limits
+            snr = StreamingNelsonRules(limits.f_mean, limits.f_std, self.d_rules)
+            self.d_detectors[key] = snr
+        return snr
+
+
+    async def _run_worker(self, queue: asyncio.Queue) -> None:
+        """
+        Worker task: check the batches of its streams in the order they were pushed.
+        :param queue: queue of batches (key, data points, time of ingest)
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            t_batch = await queue.get()
+            if t_batch is None:
+                return
+            key, arr_values, f_ingest = t_batch
+            snr = self._get_detector(key)
+            if arr_values.shape[0] >= self.i_offload_points:
+                snr, l_fired = await loop.run_in_executor(self.executor, _evaluate, snr, arr_values)
+                self.d_detectors[key] = snr
+            else:
+                snr, l_fired = _evaluate(snr, arr_values)
+            self.i_points += arr_values.shape[0]
+            for i_index, f_value, t_rules in l_fired:
+                f_latency = time.perf_counter() - f_ingest
+                self.dq_latencies.append(f_latency)
+                self.i_violations += 1
+                await self._events.put(Violation(key, i_index, f_value, t_rules, f_latency))
+
+
+    def latency_percentiles(self, l_percentiles: Iterable[float] = (50, 99)) -> Dict[str, float]:
+        """
+        Get percentiles of the latest ingest-to-alert latencies (from push() to the violation event).
+        :param l_percentiles: percentiles, e.g. (50, 99)
+        :return: dictionary of latencies in seconds, e.g. {"p50": 0.0001, "p99": 0.002}.
+        """
+        arr_latencies = np.fromiter(self.dq_latencies, dtype=np.float64)
+        if arr_latencies.shape[0] == 0:
+            return {f"p{f_percentile:g}": np.nan for f_percentile in l_percentiles}
+        return {f"p{f_percentile:g}": float(np.percentile(arr_latencies, f_percentile))
+                for f_percentile in l_percentiles}
@@ -0,0 +1,184 @@
+from typing import Dict, List, Tuple
+
+from .config import RuleConfig, RuleSettings, d_rules
+
+
+class _KOutOfMWindow:
+    """
+    Counters of the last m points (ring buffer) that relate to Rule 05 and Rule 06.
+    """
+
+    __slots__ = ("i_points_window", "i_points_out", "l_ring", "i_below", "i_above", "i_below_out", "i_above_out")
+
+    def __init__(self, i_points_window: int, i_points_out: int) -> None:
+        self.i_points_window = i_points_window
+        self.i_points_out = i_points_out
+        self.l_ring = [(0, False)] * i_points_window
+        self.i_below = 0
+        self.i_above = 0
+        self.i_below_out = 0
+        self.i_above_out = 0
+
+
+    def push(self, i_index: int, i_side: int, b_outof_std: bool) -> bool:
+        """
+        Add a data point to the window and check if the window fulfills the condition.
+        :param i_index: int, position of the data point in the stream
+        :param i_side: int, direction compared to the mean (-1, 0, 1)
+        :param b_outof_std: bool, whether the data point is out of n standard deviations
+        :return: True if n out of m points in a row are out of std in the same direction.
+        """
+        if self.i_points_window < 1:
+            return False
+        i_position = i_index % self.i_points_window
+
+        ## the oldest data point leaves the window
+        i_side_old, b_outof_std_old = self.l_ring[i_position]
+        if i_side_old == -1:
+            self.i_below -= 1
+            self.i_below_out -= b_outof_std_old
+        elif i_side_old == 1:
+            self.i_above -= 1
+            self.i_above_out -= b_outof_std_old
+
+        self.l_ring[i_position] = (i_side, b_outof_std)
+        if i_side == -1:
+            self.i_below += 1
+            self.i_below_out += b_outof_std
+        elif i_side == 1:
+            self.i_above += 1
+            self.i_above_out += b_outof_std
+
+        if i_index + 1 < self.i_points_window:
+            return False
+        if self.i_below >= self.i_points_out:
+            return self.i_below_out >= self.i_points_out
+        if self.i_above >= self.i_points_out:
+            return self.i_above_out >= self.i_points_out
+        return False
+
+
+class StreamingNelsonRules:
+    """
+    Online evaluation of the Nelson rules on a stream of data points against fixed limits.
+    Every new data point is checked in constant time, and memory is bounded by the largest window.
+    A rule fires for a data point if a window (or run) ending at this data point fulfills the rule.
+    Unlike NelsonRules, the windows of rule 5, 6 and 8 ending at the latest data point are checked, too.
+    """
+
+    def __init__(self, f_mean: float, f_std: float,
+                 d_rule_settings: RuleSettings = d_rules) -> None:
+
+        self.f_mean = float(f_mean)
+        self.f_std = float(f_std)
+        self.d_rules = RuleConfig.from_settings(d_rule_settings)
+
+        ## limits (lower, upper) of each rule that relates to standard deviations
+        self.d_limits: Dict[str, Tuple[float, float]] = {}
+        for s_rule in ["rule1", "rule5", "rule6", "rule7", "rule8"]:
+            f_std_value = self.d_rules[s_rule]["f_std"]
+            self.d_limits[s_rule] = (self.f_mean - (f_std_value * self.f_std),
+                                     self.f_mean + (f_std_value * self.f_std))
+
+        self.i_count = 0
+        self._f_previous = 0.0
+        self._i_side = 0
+        self._i_run_side = 0
+        self._i_trend = 0
+        self._i_run_trend = 0
+        self._i_run_alternation = 0
+        self._i_run_within_std = 0
+        self._i_run_outof_std = 0
+        self._i_last_below = -1
+        self._i_last_above = -1
+        self._rule5 = _KOutOfMWindow(i_points_window=self.d_rules["rule5"]["i_points_window"],
+                                     i_points_out=self.d_rules["rule5"]["i_points"])
+        self._rule6 = _KOutOfMWindow(i_points_window=self.d_rules["rule6"]["i_points_window"],
+                                     i_points_out=self.d_rules["rule6"]["i_points"])
+
+
+    def update(self, x: float) -> Tuple[str, ...]:
+        """
+        Add a new data point to the stream and check all rules.
+        :param x: float, new data point
+        :return: tuple of the rules that fired for this data point, e.g. ("rule1", "rule5").
+        """
+        x = float(x)
+        i_index = self.i_count
+        l_fired: List[str] = []
+
+        ## direction compared to the mean
+        if x > self.f_mean:
+            i_side = 1
+            self._i_last_above = i_index
+        elif x < self.f_mean:
+            i_side = -1
+            self._i_last_below = i_index
+        else:
+            i_side = 0
+
+        ##### RULE 1
+        f_lower, f_upper = self.d_limits["rule1"]
+        if (x < f_lower) or (x > f_upper):
+            l_fired.append("rule1")
+
+        ##### RULE 2
+        if (i_side != 0) and (i_side == self._i_side):
+            self._i_run_side += 1
+        else:
+            self._i_run_side = 1 if i_side != 0 else 0
+        self._i_side = i_side
+        if self._i_run_side >= self.d_rules["rule2"]["i_points"]:
+            l_fired.append("rule2")
+
+        ##### RULE 3 and RULE 4
+        ## direction compared to the previous value
+        if x > self._f_previous:
+            i_trend = 1
+        elif x < self._f_previous:
+            i_trend = -1
+        else:
+            i_trend = 0
+        if (i_index == 0) or (i_trend == 0):
+            self._i_run_trend = 0
+            self._i_run_alternation = 0
+        elif i_index == 1:
+            ## the first value takes the direction that continues the trend (or alternation)
+            self._i_run_trend = 2
+            self._i_run_alternation = 2
+        else:
+            self._i_run_trend = self._i_run_trend + 1 if i_trend == self._i_trend else 1
+            self._i_run_alternation = self._i_run_alternation + 1 if i_trend == -self._i_trend else 1
+        self._i_trend = i_trend if i_index > 0 else 0
+        self._f_previous = x
+        if self._i_run_trend >= self.d_rules["rule3"]["i_points"]:
+            l_fired.append("rule3")
+        if self._i_run_alternation >= self.d_rules["rule4"]["i_points"]:
+            l_fired.append("rule4")
+
+        ##### RULE 5 and RULE 6
+        f_lower, f_upper = self.d_limits["rule5"]
+        if self._rule5.push(i_index, i_side, (x < f_lower) or (x > f_upper)):
+            l_fired.append("rule5")
+        f_lower, f_upper = self.d_limits["rule6"]
+        if self._rule6.push(i_index, i_side, (x < f_lower) or (x > f_upper)):
+            l_fired.append("rule6")
+
+        ##### RULE 7
+        i_points = self.d_rules["rule7"]["i_points"]
+        f_lower, f_upper = self.d_limits["rule7"]
+        self._i_run_within_std = 0 if (x < f_lower) or (x > f_upper) else self._i_run_within_std + 1
+        if (self._i_run_within_std >= i_points) and (self._i_last_below > i_index - i_points) and \
+                (self._i_last_above > i_index - i_points):
+            l_fired.append("rule7")
+
+        ##### RULE 8
+        i_points = self.d_rules["rule8"]["i_points"]
+        f_lower, f_upper = self.d_limits["rule8"]
+        self._i_run_outof_std = self._i_run_outof_std + 1 if (x < f_lower) or (x > f_upper) else 0
+        if (self._i_run_outof_std >= i_points) and (self._i_last_below > i_index - i_points) and \
+                (self._i_last_above > i_index - i_points):
+            l_fired.append("rule8")
+
+        self.i_count += 1
+        return tuple(l_fired)
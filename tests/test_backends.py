@@ -0,0 +1,120 @@
+__author__ = "Regenplatz"
+__version__ = "1.0.0"
+
+
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+from src.nelson_rules import kernels, kernels_numba
+from src.nelson_rules.backends import get_backend
+from src.nelson_rules.batch import BatchNelsonRules
+from src.nelson_rules.nelson_rules import NelsonRules
+from reference_nelson_rules import ReferenceNelsonRules
+from test_kernels import generate_input_data
+
+
+## the parity tests of the numba backend need numba to be installed
+requires_numba = pytest.mark.skipif(not kernels_numba.b_available, reason="numba is not installed")
+
+
+##### NUMBA BACKEND ###############################################################
+
+@requires_numba
+@pytest.mark.parametrize("i_seed", range(5))
+def test_numbaBackend_parityWithReference(i_seed: int) -> None:
+    """
+    Test numba backend: results of all rules are identical to the loop-based reference.
+    :return: Not applicable
+    """
+    arr_input = generate_input_data(i_seed=i_seed, i_length=300)
+    tr = NelsonRules(arr_input, backend="numba")
+    tr_reference = ReferenceNelsonRules(arr_input)
+    for s_rule, i_points in [("rule2", 1), ("rule2", 9), ("rule3", 2), ("rule3", 6), ("rule4", 1), ("rule4", 14),
+                             ("rule7", 2), ("rule7", 15), ("rule8", 1), ("rule8", 8), ("rule8", 400)]:
+        getattr(tr, s_rule)(i_points=i_points)
+        getattr(tr_reference, s_rule)(i_points=i_points)
+        assert np.array_equal(tr.d_results[s_rule], tr_reference.d_results[s_rule]), (s_rule, i_points)
+    for i_points_window in range(1, 7):
+        for i_points_out in range(i_points_window + 2):
+            for f_std_value in [0.5, 1.0, 2.0]:
+                tr.rule5(i_points_window=i_points_window, i_points_out=i_points_out, f_std_value=f_std_value)
+                tr_reference.rule5(i_points_window=i_points_window, i_points_out=i_points_out,
+                                   f_std_value=f_std_value)
+                for s_key in ["rule5_points", "rule5_windows"]:
+                    assert tr.d_results[s_key].dtype == tr_reference.d_results[s_key].dtype
+                    assert np.array_equal(tr.d_results[s_key], tr_reference.d_results[s_key]), \
+                        (i_points_window, i_points_out, f_std_value)
+
+
+@requires_numba
+@pytest.mark.parametrize("s_output", ["dict", "flags", "intervals"])
+def test_numbaBackend_batchIdenticalToNumpy(s_output: str) -> None:
+    """
+    Test numba backend: runs and windows do not cross series, and all outputs equal the numpy backend.
+    :return: Not applicable
+    """
+    l_series = [generate_input_data(i_seed=i_series, i_length=300)[-i_length:]
+                for i_series, i_length in enumerate([40, 300, 2, 0, 150, 9, 77, 1])]
+    results = BatchNelsonRules(l_series, backend="numba").apply_rules(s_output=s_output)
+    results_expected = BatchNelsonRules(l_series).apply_rules(s_output=s_output)
+    if s_output == "dict":
+        for s_key, arr_expected in results_expected.items():
+            assert np.array_equal(results[s_key], arr_expected, equal_nan=True), s_key
+    else:
+        assert np.array_equal(results, results_expected)
+
+
+@requires_numba
+@pytest.mark.parametrize("i_points", [1, 2, 3, 5, 8])
+def test_numbaBackend_kernelsIdenticalToNumpy(i_points: int) -> None:
+    """
+    Test numba backend: raw intervals of the run-length and window kernels equal the numpy kernels.
+    :return: Not applicable
+    """
+    rng = np.random.default_rng(i_points)
+    arr_directions = rng.integers(-1, 2, size=500)
+    arr_condition = rng.random(500) < 0.8
+    arr_offsets = np.array([0, 3, 3, 120, 121, 400, 500])
+    for t_results, t_expected in [
+            (kernels_numba.find_runs(arr_directions, i_points, arr_offsets),
+             kernels.find_runs(arr_directions, i_points, arr_offsets)),
+            (kernels_numba.find_mixed_windows(arr_directions, arr_condition, i_points, arr_offsets, 1),
+             kernels.find_mixed_windows(arr_directions, arr_condition, i_points, arr_offsets, 1)),
+            (kernels_numba.find_k_of_m(arr_directions, arr_condition, i_points, i_points - 1, arr_offsets)[1],
+             kernels.find_k_of_m(arr_directions, arr_condition, i_points, i_points - 1, arr_offsets)[1])]:
+        assert np.array_equal(t_results[0], t_expected[0])
+        assert np.array_equal(t_results[1], t_expected[1])
+
+
+@requires_numba
+def test_numbaBackend_importedUnderBothNames() -> None:
+    """
+    Test numba backend: the package is used as src.nelson_rules (tests) and as nelson_rules (README)
+    one after the other, in both orders, e.g. in a development checkout.
+    :return: Not applicable
+    """
+    s_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    s_code = "import numpy as np\n" \
+             "from {0}nelson_rules import NelsonRules\n" \
+             "NelsonRules(np.arange(100.0) % 7, backend='numba').apply_rules()\n"
+    ## only the path of the respective name is importable, as in a user's or a test environment
+    for s_prefix, s_path in [("", "src"), ("src.", ""), ("", "src")]:
+        d_env = dict(os.environ, PYTHONPATH=os.path.join(s_root, s_path))
+        process = subprocess.run([sys.executable, "-c", s_code.format(s_prefix)], cwd=os.path.join(s_root, s_path),
+                                 env=d_env, capture_output=True, text=True)
+        assert process.returncode == 0, process.stderr
+
+
+def test_backends_fallbackAndUnknown(monkeypatch) -> None:
+    """
+    Test backend selection: without numba, the numpy backend is used with a warning; unknown backends are rejected.
+    :return: Not applicable
+    """
+    monkeypatch.setattr(kernels_numba, "b_available", False)
+    with pytest.warns(RuntimeWarning):
+        assert get_backend("numba") is kernels
+    with pytest.raises(ValueError):
+        NelsonRules(np.array([1.0, 2.0]), backend="fortran")
@@ -0,0 +1,102 @@
+__author__ = "Regenplatz"
+__version__ = "1.0.0"
+
+
+import numpy as np
+import pandas as pd
+from src.nelson_rules.batch import BatchNelsonRules
+from src.nelson_rules.nelson_rules import NelsonRules
+from test_kernels import generate_input_data
+
+
+##### BATCH #######################################################################
+
+def test_batch_2DArray_identicalToSingleSeries() -> None:
+    """
+    Test batch: each row of a 2D array is evaluated like a single series.
+    :return: Not applicable
+    """
+    arr_input = np.stack([generate_input_data(i_seed=i_seed, i_length=150) for i_seed in range(12)])
+    d_results = BatchNelsonRules(arr_input).apply_rules()
+    for i_row in range(arr_input.shape[0]):
+        d_results_row = NelsonRules(arr_input[i_row]).apply_rules()
+        for s_key, arr_expected in d_results_row.items():
+            assert d_results[s_key].shape == arr_input.shape
+            assert d_results[s_key].dtype == arr_expected.dtype
+            assert np.array_equal(d_results[s_key][i_row], arr_expected), (s_key, i_row)
+
+
+def test_batch_raggedSeries_runsDoNotCrossSeries() -> None:
+    """
+    Test batch: series of different lengths are evaluated like single series.
+    :return: Not applicable
+    """
+    l_series = [generate_input_data(i_seed=i_seed, i_length=300)[-i_length:]
+                for i_seed, i_length in enumerate([1, 2, 9, 40, 150, 17, 300, 3])]
+    br = BatchNelsonRules(l_series)
+    d_results = br.apply_rules()
+    assert np.allclose(br.arr_mean, [np.mean(arr_series) for arr_series in l_series])
+    assert np.allclose(br.arr_std, [np.std(arr_series) for arr_series in l_series])
+    for i_series, arr_series in enumerate(l_series):
+        tr = NelsonRules(arr_series)
+        tr.f_mean, tr.f_std = br.arr_mean[i_series], br.arr_std[i_series]
+        d_results_series = tr.apply_rules()
+        i_start, i_end = br.arr_offsets[i_series], br.arr_offsets[i_series + 1]
+        for s_key, arr_expected in d_results_series.items():
+            assert np.array_equal(d_results[s_key][i_start:i_end], arr_expected, equal_nan=True), (s_key, i_series)
+
+
+def test_batch_flatArrayWithOffsets() -> None:
+    """
+    Test batch: a run on the same side of the mean does not continue into the next series.
+    :return: Not applicable
+    """
+    arr_input = np.array([1.0, 2.0, 1.0, 2.0, 1.0, 2.0, 5.0, 5.1, 5.2, 5.3, 5.4, 5.5])
+    br = BatchNelsonRules(arr_input, arr_offsets=np.array([0, 6, 12]))
+    br.rule3(i_points=4)
+    assert (br.d_results["rule3"] == np.array([0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1])).all()
+    br.rule4(i_points=6)
+    assert (br.d_results["rule4"] == np.array([1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0])).all()
+
+
+##### DATAFRAME ###################################################################
+
+def test_batch_fromFrame_alignedToRows() -> None:
+    """
+    Test DataFrame evaluation: each group is evaluated as series in the given order,
+    and results are aligned to the rows of the shuffled input DataFrame.
+    :return: Not applicable
+    """
+    l_frames = []
+    for i_series, (s_machine, s_characteristic) in enumerate([("m1", "a"), ("m1", "b"), ("m2", "a")]):
+        arr_series = generate_input_data(i_seed=i_series, i_length=300)[-(100 + 50 * i_series):]
+        l_frames.append(pd.DataFrame({"machine": s_machine, "characteristic": s_characteristic,
+                                      "time": np.arange(arr_series.shape[0]), "value": arr_series}))
+    df = pd.concat(l_frames).sample(frac=1.0, random_state=0)
+    df.index = np.arange(df.shape[0]) * 10
+
+    br = BatchNelsonRules.from_frame(df, by=["machine", "characteristic"], value="value", order="time")
+    df_results = br.apply_rules(s_output="frame")
+    assert df_results.index.equals(df.index)
+    assert br.df_groups.shape == (3, 2)
+
+    for (s_machine, s_characteristic), df_group in df.groupby(["machine", "characteristic"]):
+        df_group = df_group.sort_values("time")
+        d_expected = NelsonRules(df_group["value"].to_numpy()).apply_rules()
+        assert np.allclose(df_results.loc[df_group.index, "zscore"].to_numpy(), d_expected["zscore"])
+        for s_key, arr_expected in d_expected.items():
+            if s_key not in ["input_data", "zscore"]:
+                assert np.array_equal(df_results.loc[df_group.index, s_key].to_numpy(), arr_expected), s_key
+
+
+def test_batch_fromFrame_rowOrderWithoutOrderColumn() -> None:
+    """
+    Test DataFrame evaluation: without order column, data points of each group keep the order of the rows.
+    :return: Not applicable
+    """
+    df = pd.DataFrame({"group": ["a", "b", "a", "b", "a", "b"], "value": [1.0, 9.0, 2.0, 8.0, 3.0, 7.0]})
+    br = BatchNelsonRules.from_frame(df, by="group", value="value")
+    assert (br.arr == np.array([1.0, 2.0, 3.0, 9.0, 8.0, 7.0])).all()
+    assert list(br.df_groups["group"]) == ["a", "b"]
+    df_results = br.apply_rules(s_output="frame")
+    assert np.allclose(df_results["zscore"].to_numpy(), np.array([-1.0, 1.0, 0.0, 0.0, 1.0, -1.0]) * np.sqrt(1.5))
@@ -0,0 +1,66 @@
+__author__ = "Regenplatz"
+__version__ = "1.0.0"
+
+
+import numpy as np
+import pytest
+from src.nelson_rules.chunked import apply_rules_chunked
+from src.nelson_rules.limits import LimitAccumulator
+from src.nelson_rules.nelson_rules import NelsonRules
+from test_kernels import generate_input_data
+
+
+##### CHUNKED #####################################################################
+
+@pytest.mark.parametrize("i_chunk_size", [1, 7, 16, 37, 300, 1000])
+def test_applyRulesChunked_identicalToInMemory(tmp_path, i_chunk_size: int) -> None:
+    """
+    Test chunked evaluation: flags of a memory-mapped file equal the flags of the data in memory,
+    also for runs and windows crossing chunk boundaries.
+    :return: Not applicable
+    """
+    arr_input = generate_input_data(i_seed=5, i_length=300)
+    arr_input.tofile(tmp_path / "input.bin")
+    arr_memmap = np.memmap(tmp_path / "input.bin", dtype=np.float64, mode="r")
+    arr_flags = apply_rules_chunked(arr_memmap, arr_output=str(tmp_path / "flags.bin"), i_chunk_size=i_chunk_size)
+
+    tr = NelsonRules(arr_input)
+    arr_expected = tr.apply_rules(s_output="flags")
+    assert np.array_equal(np.fromfile(tmp_path / "flags.bin", dtype=np.uint16), arr_expected)
+    assert np.array_equal(arr_flags, arr_expected)
+
+
+def test_applyRulesChunked_bufferInput() -> None:
+    """
+    Test chunked evaluation: objects with buffer interface are read as float64 values.
+    :return: Not applicable
+    """
+    arr_input = generate_input_data(i_seed=1, i_length=120)
+    arr_flags = apply_rules_chunked(arr_input.tobytes(), i_chunk_size=25)
+    assert arr_flags.dtype == np.uint16
+    assert np.array_equal(arr_flags, NelsonRules(arr_input).apply_rules(s_output="flags"))
+
+
+@pytest.mark.parametrize("s_dtype", ["float32", "int16"])
+def test_applyRulesChunked_typedBufferInput(s_dtype: str) -> None:
+    """
+    Test chunked evaluation: objects with buffer interface of another data type than float64 are read in their
+    own format.
+    :param s_dtype: str, data type of the buffer
+    :return: Not applicable
+    """
+    arr_input = (generate_input_data(i_seed=2, i_length=1000) * 10.0).astype(s_dtype)
+    arr_flags = apply_rules_chunked(memoryview(arr_input), i_chunk_size=300)
+    assert arr_flags.shape == (1000,)
+    assert np.array_equal(arr_flags, NelsonRules(arr_input).apply_rules(s_output="flags"))
+
+
+@pytest.mark.parametrize("i_chunk_size", [1, 3, 64, 500])
+def test_meanStd_onePassOverChunks(i_chunk_size: int) -> None:
+    """
+    Test one-pass limits: merging the statistics of chunks gives the mean and std of all data.
+    :return: Not applicable
+    """
+    arr_input = np.random.default_rng(0).normal(loc=1e6, scale=2.0, size=500)
+    np.testing.assert_allclose(LimitAccumulator.from_data(arr_input, i_chunk_size).to_limits(),
+                               (np.mean(arr_input), np.std(arr_input)), rtol=1e-9)
@@ -0,0 +1,81 @@
+__author__ = "Regenplatz"
+__version__ = "1.0.0"
+
+
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from src.nelson_rules.config import RuleConfig, d_rules
+from src.nelson_rules.nelson_rules import NelsonRules
+from test_kernels import generate_input_data
+
+
+##### RULE CONFIGURATION ##########################################################
+
+def test_ruleConfig_mergedIntoDefaultsWithoutMutatingThem() -> None:
+    """
+    Test rule configuration: settings are merged into the defaults, which stay unchanged for later instances.
+    :return: Not applicable
+    """
+    d_defaults = {s_rule: dict(d_rule) for s_rule, d_rule in d_rules.items()}
+    tr = NelsonRules(np.array([1.0, 2.0, 3.0]), {"rule2": {"i_points": 2}, "rule5": {"i_points_window": 7}})
+    assert tr.d_rules["rule2"]["i_points"] == 2
+    assert tr.d_rules["rule5"] == {"i_points": 3, "i_points_window": 7, "f_std": 2.0}
+    assert d_rules == d_defaults
+    assert NelsonRules(np.array([1.0, 2.0, 3.0])).d_rules == d_defaults
+
+
+def test_ruleConfig_immutableAndHashable() -> None:
+    """
+    Test rule configuration: settings cannot be changed, equal settings are equal and have the same hash.
+    :return: Not applicable
+    """
+    config = RuleConfig({"rule7": {"i_points": 10}})
+    with pytest.raises(AttributeError):
+        config.i_max_window = 3
+    with pytest.raises(TypeError):
+        config["rule7"]["i_points"] = 3
+    with pytest.raises(TypeError):
+        config["rule1"] = {"f_std": 2.0}
+    assert config == RuleConfig({"rule7": {"i_points": np.int64(10)}})
+    assert hash(config) == hash(RuleConfig({"rule7": {"i_points": 10}}))
+    assert config != RuleConfig()
+    assert config.replace({"rule7": {"i_points": 15}}) == RuleConfig()
+    assert pickle.loads(pickle.dumps(config)) == config
+    assert NelsonRules(np.array([1.0]), config).d_rules is config
+    assert RuleConfig({"rule2": {"i_points": 20}}).i_max_window == 20
+
+
+@pytest.mark.parametrize("d_rule_settings", [
+    {"rule9": {"i_points": 3}},
+    {"rule2": {"f_std": 3}},
+    {"rule2": {"i_points": -1}},
+    {"rule2": {"i_points": 2.5}},
+    {"rule3": {"i_points": True}},
+    {"rule1": {"f_std": -1.0}},
+    {"rule1": {"f_std": float("nan")}},
+    {"rule5": {"i_points_window": "3"}}])
+def test_ruleConfig_invalidSettings(d_rule_settings: dict) -> None:
+    """
+    Test rule configuration: unknown rules and settings and invalid values are rejected.
+    :return: Not applicable
+    """
+    with pytest.raises(ValueError):
+        RuleConfig(d_rule_settings)
+
+
+def test_ruleConfig_concurrentEvaluationInThreads() -> None:
+    """
+    Test rule configuration: evaluations with different settings in a thread pool equal sequential evaluations.
+    :return: Not applicable
+    """
+    l_tasks = [(generate_input_data(i_seed=i_task % 5, i_length=300),
+                RuleConfig({"rule2": {"i_points": 5 + i_task % 4}, "rule7": {"i_points": 8 + i_task % 3}}))
+               for i_task in range(40)]
+    l_expected = [NelsonRules(arr_input, config).apply_rules(s_output="flags") for arr_input, config in l_tasks]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        l_results = list(executor.map(lambda t_task: NelsonRules(*t_task).apply_rules(s_output="flags"), l_tasks))
+    for arr_result, arr_expected in zip(l_results, l_expected):
+        assert np.array_equal(arr_result, arr_expected)
@@ -0,0 +1,88 @@
+__author__ = "Regenplatz"
+__version__ = "1.0.0"
+
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.nelson_rules import export
+from src.nelson_rules.batch import BatchNelsonRules
+from src.nelson_rules.nelson_rules import NelsonRules
+from test_kernels import generate_input_data
+
+
+requires_pyarrow = pytest.mark.skipif(not export.b_available, reason="pyarrow is not installed")
+
+
+def test_frame_identicalToDict() -> None:
+    """
+    Test that the DataFrame output contains the results of the dictionary output as narrow columns,
+    without input data, and shares the memory of the z-scores.
+    :return: Not applicable
+    """
+    nr = NelsonRules(generate_input_data(i_seed=0, i_length=500))
+    df_results = nr.apply_rules(s_output="frame")
+    d_results = NelsonRules(generate_input_data(i_seed=0, i_length=500)).apply_rules()
+
+    assert list(df_results.columns) == [s_key for s_key in d_results if s_key != "input_data"]
+    assert np.array_equal(df_results["zscore"].to_numpy(), d_results["zscore"])
+    assert np.shares_memory(df_results["zscore"].to_numpy(), nr._evaluate_zscore())
+    for s_key in df_results.columns[1:]:
+        assert df_results[s_key].dtype == np.int8
+        assert np.array_equal(df_results[s_key].to_numpy(), d_results[s_key]), s_key
+
+
+def test_frame_selectedRules() -> None:
+    """
+    Test that the DataFrame output contains the selected rules only.
+    :return: Not applicable
+    """
+    df_results = NelsonRules(generate_input_data(i_seed=1, i_length=100)).apply_rules("frame", rules=["rule5"])
+    assert list(df_results.columns) == ["zscore", "rule5_points", "rule5_windows"]
+
+
+@requires_pyarrow
+def test_arrow_zeroCopy() -> None:
+    """
+    Test that the Arrow output contains the results of the dictionary output and uses the result buffers.
+    :return: Not applicable
+    """
+    pa = export.pa
+    nr = NelsonRules(generate_input_data(i_seed=2, i_length=500))
+    rb = nr.apply_rules(s_output="arrow")
+    d_results = NelsonRules(generate_input_data(i_seed=2, i_length=500)).apply_rules()
+
+    assert isinstance(rb, pa.RecordBatch)
+    assert rb.schema.field("zscore").type == pa.float64()
+    assert rb.column(0).buffers()[1].address == nr._evaluate_zscore().ctypes.data
+    for s_key in rb.schema.names[1:]:
+        assert rb.schema.field(s_key).type == pa.int8()
+        assert np.array_equal(rb.column(s_key).to_numpy(), d_results[s_key]), s_key
+
+
+@requires_pyarrow
+def test_batch_arrowAlignedToRows() -> None:
+    """
+    Test that the Arrow output of a DataFrame evaluation is aligned to the rows like the DataFrame output.
+    :return: Not applicable
+    """
+    df = pd.DataFrame({"group": np.repeat(["a", "b"], 150), "value": generate_input_data(i_seed=3, i_length=300)})
+    df = df.sample(frac=1.0, random_state=0)
+    br = BatchNelsonRules.from_frame(df, by="group", value="value")
+    df_results = br.apply_rules(s_output="frame")
+    df_arrow = br.apply_rules(s_output="arrow").to_pandas()
+    assert np.array_equal(df_arrow.to_numpy(), df_results.to_numpy())
+
+
+@requires_pyarrow
+def test_writeParquet(tmp_path) -> None:
+    """
+    Test writing results to a Parquet file.
+    :return: Not applicable
+    """
+    pq = export.pq
+    nr = NelsonRules(generate_input_data(i_seed=4, i_length=300))
+    nr.write_parquet(tmp_path / "results.parquet", rules=["rule1", "rule2"])
+    table = pq.read_table(tmp_path / "results.parquet")
+    assert table.column_names == ["zscore", "rule1", "rule2"]
+    assert np.array_equal(table.column("rule2").to_numpy(), nr.apply_rules()["rule2"])
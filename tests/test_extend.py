@@ -0,0 +1,106 @@
+__author__ = "Regenplatz"
+__version__ = "1.0.0"
+
+
+import numpy as np
+import pytest
+from src.nelson_rules.limits import ControlLimits
+from src.nelson_rules.nelson_rules import NelsonRules
+from test_kernels import generate_input_data
+
+
+d_rule_settings = {
+    "rule2": {"i_points": 3},
+    "rule3": {"i_points": 3},
+    "rule4": {"i_points": 4},
+    "rule5": {"i_points": 2, "i_points_window": 3},
+    "rule7": {"i_points": 4},
+    "rule8": {"i_points": 2},
+}
+
+
+@pytest.mark.parametrize("d_settings", [{}, d_rule_settings])
+def test_extend_identicalToNewEvaluation(d_settings: dict) -> None:
+    """
+    Test appending: after each append, the results equal the evaluation of all data points so far.
+    :return: Not applicable
+    """
+    arr_input = generate_input_data(i_seed=0, i_length=2000)
+    limits = ControlLimits.from_data(arr_input)
+    nr = NelsonRules(arr_input[:50], d_settings, limits=limits)
+    nr.apply_rules()
+    rng = np.random.default_rng(1)
+    i_length = 50
+    while i_length < arr_input.shape[0]:
+        i_new = int(rng.integers(0, 30))
+        d_results = nr.extend(arr_input[i_length : i_length + i_new])
+        i_length = min(i_length + i_new, arr_input.shape[0])
+        d_expected = NelsonRules(arr_input[:i_length], d_settings, limits=limits).apply_rules()
+        assert list(d_results) == list(d_expected)
+        for s_key, arr_expected in d_expected.items():
+            assert np.array_equal(d_results[s_key], arr_expected), (s_key, i_length)
+
+
+def test_extend_capacityDoubling() -> None:
+    """
+    Test appending: buffers are allocated rarely, and the input data of the caller is not changed.
+    :return: Not applicable
+    """
+    arr_input = generate_input_data(i_seed=2, i_length=100)
+    arr_copy = arr_input.copy()
+    nr = NelsonRules(arr_input, limits=ControlLimits(0.0, 1.0))
+    nr.apply_rules(rules=["rule2"])
+    l_buffers = []
+    for i in range(1000):
+        nr.extend([float(i % 7 - 3)])
+        l_buffers.append(nr._d_buffers["rule2"])
+    assert len({id(arr_buffer) for arr_buffer in l_buffers}) <= 5
+    assert np.array_equal(arr_input, arr_copy)
+    assert nr.arr_length == 1100
+    assert np.shares_memory(nr.d_results["input_data"], nr._d_buffers["input_data"])
+    assert sorted(nr.d_results) == ["input_data", "rule2", "zscore"]
+
+
+def test_extend_dataOnlyAndDataTypes() -> None:
+    """
+    Test appending: without results, only the input data is extended; integers are promoted to floats.
+    :return: Not applicable
+    """
+    nr = NelsonRules(np.array([1, 2, 3]), limits=ControlLimits(2.0, 1.0))
+    d_results = nr.extend(np.array([4.5, 5.5]))
+    assert list(d_results) == ["input_data"]
+    assert d_results["input_data"].dtype == np.float64
+    assert np.array_equal(nr.arr, [1.0, 2.0, 3.0, 4.5, 5.5])
+    assert np.array_equal(nr.apply_rules()["rule1"], NelsonRules(nr.arr, limits=ControlLimits(2.0, 1.0)
+                                                                 ).apply_rules()["rule1"])
+
+
+def test_extend_float32() -> None:
+    """
+    Test appending: float32 data and z-scores stay float32, also when appending float64 values or lists,
+    and the results equal the evaluation of all float32 data points.
+    :return: Not applicable
+    """
+    arr_input = generate_input_data(i_seed=4, i_length=300).astype(np.float32)
+    limits = ControlLimits(0.0, 1.0)
+    nr = NelsonRules(arr_input[:100], limits=limits)
+    nr.apply_rules()
+    nr.extend(arr_input[100:200].astype(np.float64))
+    d_results = nr.extend(arr_input[200:].tolist())
+    d_expected = NelsonRules(arr_input, limits=limits).apply_rules()
+    assert d_results["input_data"].dtype == np.float32
+    assert d_results["zscore"].dtype == d_expected["zscore"].dtype == np.float32
+    for s_key, arr_expected in d_expected.items():
+        assert np.array_equal(d_results[s_key], arr_expected), s_key
+
+
+def test_extend_requiresFixedLimits() -> None:
+    """
+    Test appending: limits evaluated from the input data or limits per point are rejected.
+    :return: Not applicable
+    """
+    arr_input = generate_input_data(i_seed=3, i_length=100)
+    with pytest.raises(ValueError):
+        NelsonRules(arr_input).extend([0.0])
+    with pytest.raises(ValueError):
+        NelsonRules(arr_input, limits=ControlLimits.from_rolling(arr_input, 10)).extend([0.0])
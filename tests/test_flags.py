@@ -0,0 +1,52 @@
+__author__ = "Regenplatz"
+__version__ = "1.0.0"
+
+
+import numpy as np
+from src.nelson_rules.batch import BatchNelsonRules
+from src.nelson_rules.flags import pack_flags, unpack_flags, unpack_rule
+from src.nelson_rules.nelson_rules import NelsonRules, l_rule_results
+from test_kernels import generate_input_data
+
+
+##### COMPACT FLAGS ###############################################################
+
+def test_flags_identicalToResultDictionary() -> None:
+    """
+    Test compact flags: each bit expands to the result array of its rule.
+    :return: Not applicable
+    """
+    arr_input = generate_input_data(i_seed=2, i_length=300)
+    arr_flags = NelsonRules(arr_input).apply_rules(s_output="flags")
+    d_results = NelsonRules(arr_input).apply_rules()
+    assert arr_flags.dtype == np.uint16
+    assert np.array_equal(arr_flags, pack_flags(d_results))
+    for s_key in l_rule_results:
+        assert np.array_equal(unpack_rule(arr_flags, s_key), d_results[s_key])
+    d_unpacked = unpack_flags(arr_flags, dtype=bool)
+    assert sorted(d_unpacked) == sorted(l_rule_results)
+    assert d_unpacked["rule2"].dtype == bool
+
+
+def test_flags_batchKeepsShape() -> None:
+    """
+    Test compact flags: flags of a 2D batch are 2D.
+    :return: Not applicable
+    """
+    arr_input = np.stack([generate_input_data(i_seed=i_seed, i_length=100) for i_seed in range(4)])
+    arr_flags = BatchNelsonRules(arr_input).apply_rules(s_output="flags")
+    d_results = BatchNelsonRules(arr_input).apply_rules()
+    assert arr_flags.shape == (4, 100)
+    assert np.array_equal(unpack_rule(arr_flags, "rule4"), d_results["rule4"])
+
+
+def test_flags_unknownOutput() -> None:
+    """
+    Test output: unknown output raises an exception.
+    :return: Not applicable
+    """
+    try:
+        NelsonRules(np.array([1.0, 2.0, 3.0])).apply_rules(s_output="csv")
+        raise Exception("Test is excepting the module to raise an exception!")
+    except ValueError as e:
+        assert str(e) == "Unknown output: csv"
@@ -4,6 +4,7 @@ __version__ = "1.0.0"
 
 import numpy as np
 import pandas as pd
+import pytest
 from src.nelson_rules.nelson_rules import NelsonRules
 
 
@@ -130,3 +131,60 @@ def test_rule1_withNANs_nothing_conspicuous() -> None:
         0, 0, 0, 0, 0, 0, 0, 0, 0, 0
     ])
     assert (tr.d_results["rule1"] == arr_expected_result_rule1).all()
+
+
+##### ZERO-COPY INPUT DATA ########################################################
+
+def test_inputData_zeroCopyAndDtypePreserved() -> None:
+    """
+    Test input data: arrays, pd.Series and buffers are used without copying them, and their data type is kept.
+    :return: Not applicable
+    """
+    arr_input = np.linspace(-1.0, 1.0, 50, dtype=np.float32)
+    for arr in [arr_input, pd.Series(arr_input, copy=False), memoryview(arr_input)]:
+        tr = NelsonRules(arr)
+        assert tr.arr.dtype == np.float32
+        assert np.shares_memory(tr.arr, arr_input)
+    assert tr.apply_rules()["zscore"].dtype == np.float32
+
+    tr = NelsonRules(arr_input.astype(np.float64), dtype=np.float32)
+    assert tr.arr.dtype == np.float32
+    assert NelsonRules(np.arange(20, dtype=np.int16)).arr.dtype == np.int16
+
+
+def test_inputData_objectAndNullableData() -> None:
+    """
+    Test input data: lists of mixed numbers, object Series and nullable Series are converted to float64.
+    :return: Not applicable
+    """
+    tr = NelsonRules([1, 2.5, 3, 4.5])
+    assert tr.arr.dtype == np.float64
+    tr = NelsonRules(pd.Series([1.0, None, 3.0], dtype=object))
+    assert np.array_equal(tr.arr, [1.0, np.nan, 3.0], equal_nan=True)
+    tr = NelsonRules(pd.Series([1, None, 3], dtype="Int64"))
+    assert np.array_equal(tr.arr, [1.0, np.nan, 3.0], equal_nan=True)
+
+
+@pytest.mark.parametrize("arr_input", [
+    pd.Series(["1.22", "3.54"], dtype=object),
+    np.array(["1.22", "3.54"]),
+    np.zeros((3, 3)),
+    np.array(1.0),
+    b"bytes"])
+def test_inputData_invalidDtypeOrShape(arr_input) -> None:
+    """
+    Test input data: strings, 2D arrays and scalars are rejected.
+    :return: Not applicable
+    """
+    with pytest.raises(Exception, match="Please provide 1D numpy array as input data!"):
+        NelsonRules(arr_input)
+
+
+def test_inputData_arrowArray() -> None:
+    """
+    Test input data: Arrow arrays are accepted.
+    :return: Not applicable
+    """
+    pa = pytest.importorskip("pyarrow")
+    tr = NelsonRules(pa.array([1.0, 2.0, 3.0, 4.0]))
+    assert np.array_equal(tr.arr, [1.0, 2.0, 3.0, 4.0])
@@ -0,0 +1,62 @@
+__author__ = "Regenplatz"
+__version__ = "1.0.0"
+
+
+import numpy as np
+from src.nelson_rules.instrumentation import Instrumentation
+from src.nelson_rules.nelson_rules import NelsonRules
+from test_kernels import generate_input_data
+
+
+##### INSTRUMENTATION #############################################################
+
+def test_instrumentation_recordsRulesAndPrePasses() -> None:
+    """
+    Test instrumentation: each rule and each shared pre-pass is recorded once per evaluation of all rules.
+    :return: Not applicable
+    """
+    tr = NelsonRules(generate_input_data(i_seed=0, i_length=300))
+    l_calls = []
+    with Instrumentation(callback=lambda *args: l_calls.append(args)) as ins:
+        tr.apply_rules()
+    d_steps = ins.to_dict()
+    assert sorted(d_steps) == sorted(["rule1", "rule2", "rule3", "rule4", "rule5", "rule6", "rule7", "rule8",
+                                      "zscore", "direction_mean", "direction_previous", "zone_index",
+                                      "outof_std_1.0", "outof_std_2.0", "outof_std_3.0"])
+    assert len(l_calls) == len(d_steps)
+    for d_step in d_steps.values():
+        assert d_step["calls"] == 1
+        assert d_step["points"] == 300
+        assert d_step["seconds"] >= 0.0
+    assert d_steps["zscore"]["bytes"] == 300 * 8
+    assert d_steps["zone_index"]["bytes"] == 300
+
+
+def test_instrumentation_disabledOutsideContext() -> None:
+    """
+    Test instrumentation: nothing is recorded outside of the context, and cached pre-passes are not recorded again.
+    :return: Not applicable
+    """
+    tr = NelsonRules(generate_input_data(i_seed=0, i_length=300))
+    ins = Instrumentation()
+    tr.rule1()
+    with ins:
+        tr.rule1()
+        tr.rule1()
+    tr.rule2()
+    assert ins.to_dict() == {"rule1": {"calls": 2, "seconds": ins.d_steps["rule1"]["seconds"], "points": 600,
+                                       "bytes": 600}}
+
+
+def test_instrumentation_prometheusFormat() -> None:
+    """
+    Test instrumentation: export in Prometheus text format with one label per step.
+    :return: Not applicable
+    """
+    with Instrumentation() as ins:
+        NelsonRules(np.array([1.0, 2.0, 3.0, 4.0])).rule2(i_points=2)
+    l_lines = ins.to_prometheus().splitlines()
+    assert "# TYPE nelson_rules_step_seconds_total counter" in l_lines
+    assert 'nelson_rules_step_calls_total{step="rule2"} 1' in l_lines
+    assert 'nelson_rules_step_points_total{step="direction_mean"} 4' in l_lines
+    assert 'nelson_rules_step_bytes_total{step="rule2"} 32' in l_lines
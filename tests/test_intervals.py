@@ -0,0 +1,55 @@
+__author__ = "Regenplatz"
+__version__ = "1.0.0"
+
+
+import numpy as np
+from src.nelson_rules.batch import BatchNelsonRules
+from src.nelson_rules.nelson_rules import NelsonRules, l_rule_results
+from test_kernels import generate_input_data
+
+
+def intervals_to_result_array(arr_intervals: np.ndarray, i_length: int) -> np.ndarray:
+    """
+    Expand intervals into a binary result array.
+    :return: array containing classification info
+    """
+    arr_result = np.zeros(i_length, dtype=int)
+    for i_start, i_end in zip(arr_intervals["start"], arr_intervals["end"]):
+        assert arr_result[i_start:i_end].sum() == 0
+        arr_result[i_start:i_end] = 1
+    return arr_result
+
+
+##### INTERVALS ###################################################################
+
+def test_intervals_identicalToResultDictionary() -> None:
+    """
+    Test intervals: intervals cover the points of each result array, one interval per run (or merged windows).
+    :return: Not applicable
+    """
+    arr_input = generate_input_data(i_seed=4, i_length=300)
+    arr_intervals = NelsonRules(arr_input).apply_rules(s_output="intervals")
+    d_results = NelsonRules(arr_input).apply_rules()
+    for s_key in l_rule_results:
+        arr_rule = arr_intervals[arr_intervals["rule"] == s_key]
+        assert np.array_equal(intervals_to_result_array(arr_rule, arr_input.shape[0]), d_results[s_key])
+        assert (np.diff(arr_rule["start"]) > 0).all()
+        assert (arr_rule["start"][1:] >= arr_rule["end"][:-1]).all()
+    assert arr_intervals.shape[0] > 0
+
+
+def test_intervals_batchDoNotCrossSeries() -> None:
+    """
+    Test intervals: intervals of a batch refer to single series.
+    :return: Not applicable
+    """
+    arr_input = np.array([[1.0, 1.1] * 5 + [9.0, 9.1] * 5, [9.0, 9.1] * 5 + [1.0, 1.1] * 5])
+    br = BatchNelsonRules(arr_input)
+    arr_intervals = br.apply_rules(s_output="intervals")
+    d_results = BatchNelsonRules(arr_input).apply_rules()
+    arr_rule2 = arr_intervals[arr_intervals["rule"] == "rule2"]
+    assert arr_rule2.tolist() == [(0, "rule2", 0, 10), (0, "rule2", 10, 20), (1, "rule2", 0, 10), (1, "rule2", 10, 20)]
+    for i_series in range(2):
+        for s_key in l_rule_results:
+            arr_rule = arr_intervals[(arr_intervals["rule"] == s_key) & (arr_intervals["series"] == i_series)]
+            assert np.array_equal(intervals_to_result_array(arr_rule, 20), d_results[s_key][i_series])
@@ -0,0 +1,186 @@
+__author__ = "Regenplatz"
+__version__ = "1.0.0"
+
+
+import numpy as np
+import pytest
+from src.nelson_rules.nelson_rules import NelsonRules
+from reference_nelson_rules import ReferenceNelsonRules
+
+
+def generate_input_data(i_seed: int, i_length: int) -> np.ndarray:
+    """
+    Generate input data that contains ties, trends, alternations and shifts.
+    :param i_seed: int, seed of the random generator
+    :param i_length: int, number of data points
+    :return: array of input data.
+    """
+    rng = np.random.default_rng(i_seed)
+    arr = np.round(rng.normal(size=i_length), 1)
+    i_part = i_length // 4
+    arr[:i_part] += np.linspace(0.0, 3.0, i_part)
+    arr[i_part : 2 * i_part : 2] += 2.5
+    arr[2 * i_part : 3 * i_part] += 1.5
+    arr[3 * i_part : 3 * i_part + 10] = np.linspace(-1.0, 1.0, 10)
+    return arr
+
+
+##### RUN-LENGTH ENGINE ###########################################################
+
+@pytest.mark.parametrize("i_seed", range(10))
+@pytest.mark.parametrize("s_rule, i_points", [
+    ("rule2", 1), ("rule2", 3), ("rule2", 9), ("rule3", 2), ("rule3", 6),
+    ("rule4", 1), ("rule4", 4), ("rule4", 14), ("rule7", 2), ("rule7", 15),
+    ("rule8", 1), ("rule8", 3), ("rule8", 8), ("rule8", 400)])
+def test_runLengthEngine_parityWithReference(i_seed: int, s_rule: str, i_points: int) -> None:
+    """
+    Test run-length engine: results are identical to the loop-based reference.
+    :return: Not applicable
+    """
+    arr_input = generate_input_data(i_seed=i_seed, i_length=300)
+    tr = NelsonRules(arr_input)
+    tr_reference = ReferenceNelsonRules(arr_input)
+    getattr(tr, s_rule)(i_points=i_points)
+    getattr(tr_reference, s_rule)(i_points=i_points)
+    assert tr.d_results[s_rule].dtype == tr_reference.d_results[s_rule].dtype
+    assert np.array_equal(tr.d_results[s_rule], tr_reference.d_results[s_rule])
+
+
+def test_runLengthEngine_windowsLongerThanInput() -> None:
+    """
+    Test run-length engine: windows longer than the input data do not mark any point.
+    :return: Not applicable
+    """
+    tr = NelsonRules(np.array([1.0, 2.0, 3.0, 4.0]))
+    for s_rule in ["rule2", "rule3", "rule4", "rule7", "rule8"]:
+        getattr(tr, s_rule)(i_points=5)
+        assert (tr.d_results[s_rule] == np.zeros(4, dtype=int)).all()
+
+
+##### K-OF-M WINDOW ENGINE ########################################################
+
+@pytest.mark.parametrize("i_seed", range(4))
+@pytest.mark.parametrize("i_points_window", range(1, 8))
+def test_kOfMWindowEngine_parityWithReference(i_seed: int, i_points_window: int) -> None:
+    """
+    Test k-of-m window engine (rule 5 and rule 6): points and windows are identical to the loop-based reference
+    for any number of points out of the window and any number of standard deviations.
+    :return: Not applicable
+    """
+    arr_input = generate_input_data(i_seed=i_seed, i_length=300)
+    tr = NelsonRules(arr_input)
+    tr_reference = ReferenceNelsonRules(arr_input)
+    for i_points_out in range(i_points_window + 2):
+        for f_std_value in [0.5, 1.0, 2.0]:
+            for s_rule in ["rule5", "rule6"]:
+                getattr(tr, s_rule)(i_points_window=i_points_window, i_points_out=i_points_out,
+                                    f_std_value=f_std_value)
+                getattr(tr_reference, s_rule)(i_points_window=i_points_window, i_points_out=i_points_out,
+                                              f_std_value=f_std_value)
+                for s_key in [f"{s_rule}_points", f"{s_rule}_windows"]:
+                    assert tr.d_results[s_key].dtype == tr_reference.d_results[s_key].dtype
+                    assert np.array_equal(tr.d_results[s_key], tr_reference.d_results[s_key]), \
+                        (s_key, i_points_out, f_std_value)
+
+
+@pytest.mark.parametrize("arr_input", [
+    np.array([3.0, 3.0, -3.0, -3.0, 3.0]),
+    np.array([5.0, 5.0, 5.0, 5.0]),
+    np.array([1.0, np.nan, 9.0, 9.0, np.nan, 9.0, -9.0, -9.0]),
+    np.array([9.0, 9.0])])
+def test_kOfMWindowEngine_edgeCases(arr_input: np.ndarray) -> None:
+    """
+    Test k-of-m window engine: ties with the mean, constant data, NaNs and windows longer than the input data.
+    :return: Not applicable
+    """
+    tr = NelsonRules(arr_input)
+    tr_reference = ReferenceNelsonRules(arr_input)
+    for i_points_window, i_points_out in [(1, 1), (2, 1), (3, 2), (5, 4)]:
+        tr.rule5(i_points_window=i_points_window, i_points_out=i_points_out, f_std_value=0.5)
+        tr_reference.rule5(i_points_window=i_points_window, i_points_out=i_points_out, f_std_value=0.5)
+        assert np.array_equal(tr.d_results["rule5_points"], tr_reference.d_results["rule5_points"])
+        assert np.array_equal(tr.d_results["rule5_windows"], tr_reference.d_results["rule5_windows"])
+
+
+##### ZONE AND DIRECTION KERNELS ##################################################
+
+@pytest.mark.parametrize("s_dtype", ["float64", "int64", "float32"])
+def test_zoneAndDirectionKernels_parityWithReference(s_dtype: str) -> None:
+    """
+    Test zone and direction kernels: results are identical to the per-element reference.
+    :return: Not applicable
+    """
+    arr_input = (generate_input_data(i_seed=7, i_length=300) * 3).astype(s_dtype)
+    tr = NelsonRules(arr_input)
+    tr_reference = ReferenceNelsonRules(arr_input)
+    assert np.array_equal(tr._check_direction_comparedTo_mean(), tr_reference._check_direction_comparedTo_mean())
+    assert np.array_equal(tr._check_direction_comparedTo_previousValue(),
+                          tr_reference._check_direction_comparedTo_previousValue())
+    d_results = tr.apply_rules()
+    d_results_reference = tr_reference.apply_rules()
+    for s_key, arr_expected in d_results_reference.items():
+        assert d_results[s_key].dtype == arr_expected.dtype
+        assert np.array_equal(d_results[s_key], arr_expected)
+
+
+def test_zoneAndDirectionKernels_withNANs() -> None:
+    """
+    Test zone and direction kernels: NaNs are neither classified as out of std nor as a direction.
+    :return: Not applicable
+    """
+    arr_input = np.array([1.0, np.nan, 3.0, 2.0, np.nan, np.nan, 5.0])
+    tr = NelsonRules(arr_input)
+    tr.f_mean, tr.f_std = 3.0, 1.0
+    assert (tr._check_direction_comparedTo_mean() == np.array([-1, 0, 0, -1, 0, 0, 1])).all()
+    assert (tr._check_direction_comparedTo_previousValue() == np.array([0, 0, 0, -1, 0, 0, 0])).all()
+    assert (tr._check_if_point_outof_std(1.5) == np.array([1, 0, 0, 0, 0, 0, 1], dtype=bool)).all()
+
+
+##### FEATURE CACHE ###############################################################
+
+def test_featureCache_sharedByAllRules() -> None:
+    """
+    Test feature cache: shared features are evaluated once per evaluation of all rules.
+    :return: Not applicable
+    """
+    tr = NelsonRules(generate_input_data(i_seed=3, i_length=300))
+    tr.apply_rules()
+    assert sorted(tr._d_features) == [
+        "direction_mean", "direction_previous", "outof_std_1.0", "outof_std_2.0", "outof_std_3.0",
+        "zone_index", "zscore"]
+    arr_zones = tr._get_zone_index()
+    tr.apply_rules()
+    assert tr._get_zone_index() is arr_zones
+    assert not tr._check_direction_comparedTo_mean().flags.writeable
+
+
+def test_featureCache_resultsWritable() -> None:
+    """
+    Test feature cache: the result dictionary holds writable arrays, and changing them does not change
+    the cached features.
+    :return: Not applicable
+    """
+    arr_input = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+    tr = NelsonRules(arr_input)
+    d_results = tr.apply_rules()
+    d_results["zscore"][arr_input > 4.0] = np.nan
+    assert np.isnan(d_results["zscore"][4])
+    assert np.array_equal(tr._evaluate_zscore(), (arr_input - np.mean(arr_input)) / np.std(arr_input))
+    assert not tr._evaluate_zscore().flags.writeable
+    assert np.array_equal(tr.apply_rules()["zscore"], tr._evaluate_zscore())
+
+
+def test_featureCache_invalidatedWhenLimitsChange() -> None:
+    """
+    Test feature cache: features are evaluated again once the data or the limits change.
+    :return: Not applicable
+    """
+    arr_input = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+    tr = NelsonRules(arr_input)
+    assert (tr._check_direction_comparedTo_mean() == np.array([-1, -1, 0, 1, 1])).all()
+    tr.f_mean = 4.0
+    assert (tr._check_direction_comparedTo_mean() == np.array([-1, -1, -1, 0, 1])).all()
+    tr.f_std = 0.5
+    assert (tr._get_zone_index() == np.array([3, 3, 1, 0, 1])).all()
+    tr.arr = arr_input[::-1]
+    assert (tr._check_direction_comparedTo_previousValue() == np.array([0, -1, -1, -1, -1])).all()
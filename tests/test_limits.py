@@ -0,0 +1,209 @@
+__author__ = "Regenplatz"
+__version__ = "1.0.0"
+
+
+import pickle
+
+import numpy as np
+import pytest
+from src.nelson_rules import kernels
+from src.nelson_rules.chunked import apply_rules_chunked
+from src.nelson_rules.limits import ControlLimits, LimitAccumulator
+from src.nelson_rules.nelson_rules import NelsonRules
+from src.nelson_rules.streaming import StreamingNelsonRules
+from test_kernels import generate_input_data
+
+
+##### CONTROL LIMITS ##############################################################
+
+def test_controlLimits_fromData() -> None:
+    """
+    Test control limits: estimated by mean and std of the reference data.
+    :return: Not applicable
+    """
+    arr_reference = generate_input_data(i_seed=0, i_length=300)
+    limits = ControlLimits.from_data(arr_reference)
+    assert limits == (np.mean(arr_reference), np.std(arr_reference))
+    assert isinstance(limits.f_mean, float)
+
+
+def test_controlLimits_fromMovingRange() -> None:
+    """
+    Test control limits: std estimated by the average moving range, robust against a shift in the reference data.
+    :return: Not applicable
+    """
+    limits = ControlLimits.from_moving_range(np.array([1.0, 3.0, 2.0, 2.0, 4.0]))
+    assert limits.f_mean == 2.4
+    assert limits.f_std == 1.25 / 1.128
+
+    arr_reference = np.random.default_rng(0).normal(size=10000)
+    arr_reference[5000:] += 10.0
+    assert abs(ControlLimits.from_moving_range(arr_reference).f_std - 1.0) < 0.05
+    assert ControlLimits.from_data(arr_reference).f_std > 4.0
+
+
+def test_controlLimits_usedInsteadOfInputData() -> None:
+    """
+    Test control limits: new data is checked against the limits of the reference data (phase II).
+    :return: Not applicable
+    """
+    arr_reference = generate_input_data(i_seed=0, i_length=300)
+    arr_input = generate_input_data(i_seed=1, i_length=300) + 0.5
+    limits = ControlLimits.from_data(arr_reference)
+
+    tr = NelsonRules(arr_input, limits=limits)
+    assert (tr.f_mean, tr.f_std) == limits
+    tr_expected = NelsonRules(arr_input)
+    tr_expected.f_mean, tr_expected.f_std = limits
+    arr_expected = tr_expected.apply_rules(s_output="flags")
+    assert np.array_equal(tr.apply_rules(s_output="flags"), arr_expected)
+    assert np.array_equal(apply_rules_chunked(arr_input, i_chunk_size=50, limits=limits), arr_expected)
+
+    snr = StreamingNelsonRules(*limits)
+    assert [("rule1" in snr.update(x)) for x in arr_input] == list(tr.apply_rules()["rule1"] == 1)
+
+
+##### ROLLING LIMITS ##############################################################
+
+def test_controlLimits_fromRolling() -> None:
+    """
+    Test rolling limits: mean and std of the trailing window of each point, NaN until the window is complete.
+    :return: Not applicable
+    """
+    arr_input = generate_input_data(i_seed=4, i_length=500) * 10.0 + 1000.0
+    for i_window, i_min_points in [(1, None), (7, None), (50, None), (50, 2), (600, 10)]:
+        limits = ControlLimits.from_rolling(arr_input, i_window, i_min_points=i_min_points)
+        i_min = i_window if i_min_points is None else i_min_points
+        for i in range(arr_input.shape[0]):
+            arr_window = arr_input[max(i - i_window + 1, 0) : i + 1]
+            if arr_window.shape[0] < i_min:
+                assert np.isnan(limits.f_mean[i]) and np.isnan(limits.f_std[i])
+            else:
+                assert np.isclose(limits.f_mean[i], np.mean(arr_window), rtol=1e-12)
+                assert np.isclose(limits.f_std[i], np.std(arr_window), rtol=1e-9, atol=1e-9)
+    with pytest.raises(ValueError):
+        ControlLimits.from_rolling(arr_input, 0)
+
+
+def test_kernels_rollingMeanStdWithinSegments() -> None:
+    """
+    Test rolling limits of several series: windows do not cross the boundary between two series.
+    :return: Not applicable
+    """
+    arr_input = generate_input_data(i_seed=5, i_length=300)
+    arr_offsets = np.array([0, 2, 100, 100, 300])
+    arr_mean, arr_std = kernels.rolling_mean_std(arr_input, 20, arr_offsets, i_min_points=1)
+    for i_start, i_end in zip(arr_offsets[:-1], arr_offsets[1:]):
+        arr_mean_series, arr_std_series = kernels.rolling_mean_std(arr_input[i_start:i_end], 20, i_min_points=1)
+        assert np.allclose(arr_mean[i_start:i_end], arr_mean_series, rtol=1e-12)
+        assert np.allclose(arr_std[i_start:i_end], arr_std_series, rtol=1e-9)
+
+
+@pytest.mark.parametrize("f_level, f_noise", [(1e5, 1e-3), (1e8, 1.0)])
+@pytest.mark.parametrize("i_window", [1, 7, 50])
+def test_kernels_rollingMeanStdAfterLevelShift(f_level: float, f_noise: float, i_window: int) -> None:
+    """
+    Test rolling limits against the exact mean and std of each window of data with a large level shift,
+    i.e. data far from the overall mean of the series.
+    :param f_level: float, level after the shift
+    :param f_noise: float, standard deviation of the noise
+    :param i_window: int, number of points per window
+    :return: Not applicable
+    """
+    rng = np.random.default_rng(7)
+    arr_input = np.repeat([0.0, f_level], [1000, 19000]) + rng.normal(scale=f_noise, size=20000)
+    arr_mean, arr_std = kernels.rolling_mean_std(arr_input, i_window)
+    arr_windows = np.lib.stride_tricks.sliding_window_view(arr_input, i_window)
+    assert np.isnan(arr_std[:i_window - 1]).all()
+    assert np.allclose(arr_mean[i_window - 1:], arr_windows.mean(axis=1), rtol=1e-12, atol=f_noise * 1e-6)
+    assert np.allclose(arr_std[i_window - 1:], arr_windows.std(axis=1), rtol=1e-6, atol=0.0)
+
+
+def test_controlLimits_rollingLimitsUsedByAllRules() -> None:
+    """
+    Test rolling limits: each data point is checked against the limits of its own window,
+    and points without limits fulfill no rule that relates to the mean.
+    :return: Not applicable
+    """
+    rng = np.random.default_rng(6)
+    arr_input = rng.normal(size=2000) + np.repeat([0.0, 10.0], 1000)
+    limits = ControlLimits.from_rolling(arr_input, 100)
+    nr = NelsonRules(arr_input, limits=limits)
+    d_results = nr.apply_rules()
+
+    arr_zscore = (arr_input - limits.f_mean) / limits.f_std
+    assert np.allclose(d_results["zscore"], arr_zscore, equal_nan=True)
+    assert np.array_equal(d_results["rule1"].astype(bool), np.abs(arr_zscore) > 3.0)
+    for s_key in ["rule1", "rule2", "rule5_points", "rule6_points", "rule7", "rule8"]:
+        assert d_results[s_key][:99].sum() == 0, s_key
+
+    ## after a shift, the points are on one side of the global mean, but the rolling mean follows the shift
+    assert NelsonRules(arr_input).apply_rules()["rule2"][1200:].all()
+    assert d_results["rule2"][1200:].sum() < 100
+
+
+def test_controlLimits_rollingLimitsWarmUp() -> None:
+    """
+    Test rolling limits: points without limits (warm-up) fulfill no rule that relates to the mean,
+    but rules 3 and 4, which do not use the limits, are still applied.
+    :return: Not applicable
+    """
+    arr_input = np.arange(30.0)
+    d_results = NelsonRules(arr_input, limits=ControlLimits.from_rolling(arr_input, 10)).apply_rules()
+    assert np.isnan(d_results["zscore"][:9]).all()
+    for s_key in ["rule1", "rule2", "rule5_points", "rule6_points", "rule7", "rule8"]:
+        assert d_results[s_key][:9].sum() == 0, s_key
+    assert d_results["rule3"][:9].all()
+    assert np.array_equal(d_results["rule3"], NelsonRules(arr_input).apply_rules()["rule3"])
+
+
+##### LIMIT ACCUMULATOR ###########################################################
+
+@pytest.mark.parametrize("i_parts", [1, 2, 7])
+def test_limitAccumulator_mergedPartsEqualAllData(i_parts: int) -> None:
+    """
+    Test the accumulator: parts of the data (e.g. files) accumulated separately, in chunks of any size,
+    and merged give the mean and std of all data.
+    :return: Not applicable
+    """
+    arr_input = np.random.default_rng(7).normal(loc=1e6, scale=2.0, size=10_000)
+    l_parts = np.array_split(arr_input, i_parts)
+    l_accumulators = [LimitAccumulator.from_data(arr_part, i_chunk_size=333 * (i + 1))
+                      for i, arr_part in enumerate(l_parts)]
+    ## e.g. exchanged between processes
+    l_accumulators = [pickle.loads(pickle.dumps(acc)) for acc in l_accumulators]
+    acc = LimitAccumulator()
+    for acc_part in reversed(l_accumulators):
+        acc.merge(acc_part)
+    assert acc.i_count == arr_input.shape[0]
+    assert np.isclose(acc.f_mean, np.mean(arr_input), rtol=1e-15)
+    assert np.isclose(acc.f_std, np.std(arr_input), rtol=1e-9)
+
+
+def test_limitAccumulator_updateChunkByChunk() -> None:
+    """
+    Test the accumulator: updates with chunks (including empty chunks) equal the data at once.
+    :return: Not applicable
+    """
+    arr_input = generate_input_data(i_seed=8, i_length=1000)
+    acc = LimitAccumulator()
+    for arr_chunk in np.split(arr_input, [0, 1, 1, 400, 999]):
+        acc.update(arr_chunk)
+    assert np.allclose(acc.to_limits(), ControlLimits.from_data(arr_input), rtol=1e-12)
+    assert np.isnan(LimitAccumulator().f_std)
+    assert np.isnan(LimitAccumulator().to_limits().f_mean)
+
+
+def test_limitAccumulator_usedAsLimits() -> None:
+    """
+    Test the accumulator: passed as limits, the results equal those of the limits of the input data.
+    :return: Not applicable
+    """
+    arr_input = generate_input_data(i_seed=9, i_length=600)
+    acc = LimitAccumulator().update(arr_input[:250]).merge(LimitAccumulator.from_data(arr_input[250:]))
+    d_results = NelsonRules(arr_input, limits=acc).apply_rules()
+    d_expected = NelsonRules(arr_input).apply_rules()
+    assert np.allclose(d_results["zscore"], d_expected["zscore"])
+    for s_key in d_expected:
+        if s_key not in ["input_data", "zscore"]:
+            assert np.array_equal(d_results[s_key], d_expected[s_key]), s_key
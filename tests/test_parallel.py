@@ -0,0 +1,52 @@
+__author__ = "Regenplatz"
+__version__ = "1.0.0"
+
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.nelson_rules.batch import BatchNelsonRules
+from src.nelson_rules.parallel import apply_many, summarize_many
+from test_kernels import generate_input_data
+
+
+##### PARALLEL ####################################################################
+
+@pytest.mark.parametrize("i_workers", [1, 2])
+def test_applyMany_identicalToBatchInInputOrder(i_workers: int) -> None:
+    """
+    Test parallel evaluation: results are returned in input order and equal the batch evaluation.
+    :return: Not applicable
+    """
+    l_series = [generate_input_data(i_seed=i_seed, i_length=300)[-i_length:]
+                for i_seed, i_length in enumerate([40, 300, 2, 150, 77, 300, 9, 120, 250, 1, 64])]
+    l_results = apply_many(l_series, i_workers=i_workers)
+    br = BatchNelsonRules(l_series)
+    d_results_batch = br.apply_rules()
+    assert len(l_results) == len(l_series)
+    for i_series, d_results in enumerate(l_results):
+        i_start, i_end = br.arr_offsets[i_series], br.arr_offsets[i_series + 1]
+        assert np.array_equal(d_results["input_data"], l_series[i_series])
+        for s_key, arr_expected in d_results_batch.items():
+            assert np.array_equal(d_results[s_key], arr_expected[i_start:i_end], equal_nan=True), (s_key, i_series)
+
+
+def test_applyMany_emptyInput() -> None:
+    """
+    Test parallel evaluation: no series, no results.
+    :return: Not applicable
+    """
+    assert apply_many([]) == []
+
+
+@pytest.mark.parametrize("i_workers", [1, 2])
+def test_summarizeMany_identicalToBatchInInputOrder(i_workers: int) -> None:
+    """
+    Test parallel summary: series are numbered in input order and the aggregates equal the batch summary.
+    :return: Not applicable
+    """
+    l_series = [generate_input_data(i_seed=i_seed, i_length=300)[-i_length:]
+                for i_seed, i_length in enumerate([40, 300, 2, 150, 0, 77, 300, 9, 120, 250, 1, 64])]
+    df_summary = summarize_many(l_series, rules=["rule1", "rule3", "rule6"], i_workers=i_workers)
+    pd.testing.assert_frame_equal(df_summary, BatchNelsonRules(l_series).summarize(rules=["rule1", "rule3", "rule6"]))
+    assert summarize_many([]).shape == (0, 6)
@@ -0,0 +1,92 @@
+__author__ = "Regenplatz"
+__version__ = "1.0.0"
+
+
+import numpy as np
+import pytest
+from src.nelson_rules.batch import BatchNelsonRules
+from src.nelson_rules.nelson_rules import NelsonRules, d_rule_bits, l_rule_results
+from test_kernels import generate_input_data
+
+
+##### SELECTED RULES ##############################################################
+
+def test_applyRules_selectedRulesOnly() -> None:
+    """
+    Test selected rules: only the selected rules and the features they require are evaluated.
+    :return: Not applicable
+    """
+    arr_input = generate_input_data(i_seed=2, i_length=300)
+    tr = NelsonRules(arr_input)
+    d_results = tr.apply_rules(rules=["rule2", "rule1"])
+    assert sorted(d_results) == ["input_data", "rule1", "rule2", "zscore"]
+    assert sorted(tr._d_features) == ["direction_mean", "outof_std_3.0", "zone_index", "zscore"]
+    d_expected = NelsonRules(arr_input).apply_rules()
+    assert np.array_equal(d_results["rule1"], d_expected["rule1"])
+    assert np.array_equal(d_results["rule2"], d_expected["rule2"])
+
+    arr_flags = NelsonRules(arr_input).apply_rules(s_output="flags", rules=["rule6"])
+    arr_mask = (1 << d_rule_bits["rule6_points"]) | (1 << d_rule_bits["rule6_windows"])
+    assert np.array_equal(arr_flags, NelsonRules(arr_input).apply_rules(s_output="flags") & arr_mask)
+    arr_intervals = NelsonRules(arr_input).apply_rules(s_output="intervals", rules=["rule3"])
+    assert set(arr_intervals["rule"]) <= {"rule3"}
+    assert NelsonRules(arr_input).apply_rules(s_output="intervals", rules=[]).shape == (0,)
+
+
+def test_applyRules_unknownRule() -> None:
+    """
+    Test selected rules: unknown rules are rejected.
+    :return: Not applicable
+    """
+    with pytest.raises(ValueError):
+        NelsonRules(np.array([1.0, 2.0])).apply_rules(rules=["rule9"])
+
+
+##### EARLY EXIT ##################################################################
+
+def _first_violation_expected(arr_flags: np.ndarray):
+    """
+    Get the first data point and rule result of the full evaluation.
+    """
+    arr_points = np.flatnonzero(arr_flags)
+    if arr_points.shape[0] == 0:
+        return None
+    i_point = int(arr_points[0])
+    return i_point, [s_key for s_key in l_rule_results if arr_flags[i_point] & (1 << d_rule_bits[s_key])][0]
+
+
+@pytest.mark.parametrize("i_seed", range(6))
+@pytest.mark.parametrize("i_chunk_size", [1, 16, 50, 4096])
+def test_firstViolation_identicalToFullEvaluation(i_seed: int, i_chunk_size: int) -> None:
+    """
+    Test early exit: the first violation found chunk by chunk is the first point flagged by the full evaluation.
+    :return: Not applicable
+    """
+    rng = np.random.default_rng(i_seed)
+    arr_input = np.concatenate((rng.normal(size=200 * i_seed), generate_input_data(i_seed=i_seed, i_length=300)))
+    tr = NelsonRules(arr_input)
+    arr_flags = tr.apply_rules(s_output="flags")
+    for l_rules in [None, ["rule1"], ["rule3", "rule7"], ["rule5", "rule6"]]:
+        arr_selected = NelsonRules(arr_input).apply_rules(s_output="flags", rules=l_rules)
+        t_expected = _first_violation_expected(arr_selected)
+        assert tr.first_violation(rules=l_rules, i_chunk_size=i_chunk_size) == t_expected
+        assert tr.any_violation(rules=l_rules, i_chunk_size=i_chunk_size) == (t_expected is not None)
+    assert tr.first_violation() == _first_violation_expected(arr_flags)
+
+
+def test_firstViolation_inControlAndBatch() -> None:
+    """
+    Test early exit: no violation in data without any flagged point, and series boundaries are kept in batches.
+    :return: Not applicable
+    """
+    arr_input = np.tile([0.1, -0.1, 0.2, -0.2, 0.0], 40)
+    tr = NelsonRules(arr_input)
+    assert not tr.apply_rules(s_output="flags", rules=["rule1", "rule2", "rule3"]).any()
+    assert tr.first_violation(rules=["rule1", "rule2", "rule3"]) is None
+    assert not tr.any_violation(rules=["rule1", "rule2", "rule3"], i_chunk_size=7)
+
+    l_series = [generate_input_data(i_seed=i_series, i_length=300)[-i_length:]
+                for i_series, i_length in enumerate([5, 40, 300, 77])]
+    br = BatchNelsonRules(l_series)
+    t_expected = _first_violation_expected(br.apply_rules(s_output="flags"))
+    assert br.first_violation(i_chunk_size=10) == t_expected
@@ -0,0 +1,170 @@
+__author__ = "Regenplatz"
+__version__ = "1.0.0"
+
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+from src.nelson_rules.limits import ControlLimits
+from src.nelson_rules.service import SPCService, Violation
+from src.nelson_rules.streaming import StreamingNelsonRules
+from test_kernels import generate_input_data
+
+
+def expected_violations(arr: np.ndarray, limits: ControlLimits) -> list:
+    """
+    Evaluate a stream point by point.
+    :param arr: array of data points of the stream
+    :param limits: control limits of the stream
+    :return: list of (index, rules) of the data points that fulfill a rule.
+    """
+    snr = StreamingNelsonRules(limits.f_mean, limits.f_std)
+    l_expected = []
+    for i, x in enumerate(arr):
+        t_rules = snr.update(x)
+        if t_rules:
+            l_expected.append((i, t_rules))
+    return l_expected
+
+
+async def run_service(service: SPCService, d_streams: dict, i_batch_size: int) -> list:
+    """
+    Push all streams concurrently in batches and collect the violations.
+    :param service: service, not started yet
+    :param d_streams: dictionary of the data points of each stream key
+    :param i_batch_size: int, number of data points per batch
+    :return: list of violations.
+    """
+    async def produce(key, arr: np.ndarray) -> None:
+        for i_start in range(0, arr.shape[0], i_batch_size):
+            await service.push(key, arr[i_start : i_start + i_batch_size])
+
+    async def consume() -> list:
+        return [violation async for violation in service.events()]
+
+    async with service:
+        task_consumer = asyncio.create_task(consume())
+        await asyncio.gather(*[produce(key, arr) for key, arr in d_streams.items()])
+    return await task_consumer
+
+
+def test_spcService_identicalToStreaming() -> None:
+    """
+    Test service: the violations of each stream are emitted in the order of its data points.
+    :return: Not applicable
+    """
+    limits = ControlLimits(0.0, 1.0)
+    d_streams = {f"stream-{i}": generate_input_data(i, 300) for i in range(12)}
+    service = SPCService(limits, i_workers=3, i_queue_size=2, i_offload_points=40)
+    l_violations = asyncio.run(run_service(service, d_streams, i_batch_size=50))
+
+    assert all(isinstance(violation, Violation) for violation in l_violations)
+    for key, arr in d_streams.items():
+        l_stream = [violation for violation in l_violations if violation.key == key]
+        assert [(violation.i_index, violation.t_rules) for violation in l_stream] == expected_violations(arr, limits)
+        assert all(violation.f_value == arr[violation.i_index] for violation in l_stream)
+    assert service.i_points == 12 * 300
+    assert service.i_violations == len(l_violations)
+
+
+def test_spcService_limitsPerStream() -> None:
+    """
+    Test service: each new stream gets its own control limits.
+    :return: Not applicable
+    """
+    def limits(key: str) -> ControlLimits:
+        return ControlLimits(100.0, 1.0) if key == "shifted" else ControlLimits(0.0, 1.0)
+
+    arr = generate_input_data(1, 100)
+    d_streams = {"normal": arr, "shifted": arr + 100.0}
+    service = SPCService(limits)
+    l_violations = asyncio.run(run_service(service, d_streams, i_batch_size=10))
+
+    l_normal = [(v.i_index, v.t_rules) for v in l_violations if v.key == "normal"]
+    l_shifted = [(v.i_index, v.t_rules) for v in l_violations if v.key == "shifted"]
+    assert l_normal == l_shifted
+    assert service.d_detectors["shifted"].f_mean == 100.0
+
+
+def test_spcService_backpressure() -> None:
+    """
+    Test service: push() waits while the queue of the stream is full.
+    :return: Not applicable
+    """
+    async def run() -> tuple:
+        ## the executor is busy until the event is set, so the worker is stuck on the first batch
+        event = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=1)
+        executor.submit(event.wait)
+        service = SPCService(ControlLimits(0.0, 1.0), i_workers=1, i_queue_size=1, i_offload_points=1,
+                             executor=executor)
+        await service.start()
+        await service.push("a", [0.0])
+        l_tasks = [asyncio.create_task(service.push("a", [0.0])) for _ in range(2)]
+        for _ in range(10):
+            await asyncio.sleep(0)
+        b_waiting = [task.done() for task in l_tasks] == [True, False]
+        event.set()
+        await asyncio.gather(*l_tasks)
+        await service.stop()
+        executor.shutdown()
+        return b_waiting, service.i_points
+
+    b_waiting, i_points = asyncio.run(run())
+    assert b_waiting
+    assert i_points == 3
+
+
+def test_spcService_processExecutor() -> None:
+    """
+    Test service: a stream keeps its state when its batches are checked in another process.
+    :return: Not applicable
+    """
+    async def run(executor) -> tuple:
+        service = SPCService(ControlLimits(0.0, 1.0), i_workers=1, i_offload_points=4, executor=executor)
+        async with service:
+            await service.push("a", np.full(5, 0.5))
+            await service.push("a", np.full(4, 0.5))
+        l_violations = [(violation.i_index, violation.t_rules) async for violation in service.events()]
+        return l_violations, service.d_detectors["a"].i_count
+
+    ## spawn: forking the multi-threaded test process may deadlock
+    l_executors = [ThreadPoolExecutor(max_workers=1),
+                   ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))]
+    for executor in l_executors:
+        with executor:
+            assert asyncio.run(run(executor)) == ([(8, ("rule2",))], 9)
+
+
+def test_spcService_stopWithoutConsumer() -> None:
+    """
+    Test service: stop() does not wait for the events to be consumed when the event queue is full,
+    and that the pending violations can be consumed afterwards.
+    :return: Not applicable
+    """
+    async def run() -> list:
+        service = SPCService(ControlLimits(0.0, 1.0), i_workers=1, i_queue_size=3)
+        async with service:
+            await service.push("a", [5.0, 5.0, 5.0])
+        return [violation.i_index async for violation in service.events()]
+
+    assert asyncio.run(asyncio.wait_for(run(), timeout=10)) == [0, 1, 2]
+
+
+def test_spcService_latencyPercentiles() -> None:
+    """
+    Test service: percentiles of the ingest-to-alert latencies.
+    :return: Not applicable
+    """
+    service = SPCService(ControlLimits(0.0, 1.0))
+    assert np.isnan(service.latency_percentiles()["p50"])
+
+    arr = np.array([0.0, 5.0, 0.0, -5.0])
+    l_violations = asyncio.run(run_service(service, {"a": arr}, i_batch_size=2))
+    assert [violation.i_index for violation in l_violations] == [1, 3]
+    d_latencies = service.latency_percentiles((50, 99))
+    assert list(d_latencies) == ["p50", "p99"]
+    assert 0 <= d_latencies["p50"] <= d_latencies["p99"]
@@ -0,0 +1,75 @@
+__author__ = "Regenplatz"
+__version__ = "1.0.0"
+
+
+import numpy as np
+from src.nelson_rules.nelson_rules import NelsonRules
+from src.nelson_rules.streaming import StreamingNelsonRules
+from test_kernels import generate_input_data
+
+
+d_rule_settings = {
+    "rule2": {"i_points": 5},
+    "rule3": {"i_points": 3},
+    "rule4": {"i_points": 5},
+    "rule5": {"i_points": 2, "i_points_window": 3, "f_std": 1.0},
+    "rule6": {"i_points": 3, "i_points_window": 4, "f_std": 0.5},
+    "rule7": {"i_points": 4, "f_std": 1.0},
+    "rule8": {"i_points": 2, "f_std": 0.5},
+}
+
+
+def evaluate_prefix(arr: np.ndarray, f_mean: float, f_std: float) -> NelsonRules:
+    """
+    Evaluate all rules on the given data with fixed limits.
+    :return: NelsonRules object containing the results
+    """
+    tr = NelsonRules(arr)
+    tr.f_mean, tr.f_std = f_mean, f_std
+    tr.rule1(f_std_value=3.0)
+    for s_rule in ["rule2", "rule3", "rule4"]:
+        getattr(tr, s_rule)(i_points=d_rule_settings[s_rule]["i_points"])
+    for s_rule in ["rule5", "rule6"]:
+        getattr(tr, s_rule)(i_points_window=d_rule_settings[s_rule]["i_points_window"],
+                            i_points_out=d_rule_settings[s_rule]["i_points"],
+                            f_std_value=d_rule_settings[s_rule]["f_std"])
+    for s_rule in ["rule7", "rule8"]:
+        getattr(tr, s_rule)(i_points=d_rule_settings[s_rule]["i_points"],
+                            f_std_value=d_rule_settings[s_rule]["f_std"])
+    return tr
+
+
+##### STREAMING ###################################################################
+
+def test_streaming_consistentWithBatchEvaluation() -> None:
+    """
+    Test streaming: a rule fires for a data point if the batch evaluation of all data points
+    up to this data point marks it (rules 5, 6 and 8 require one more data point in batch).
+    :return: Not applicable
+    """
+    arr_input = generate_input_data(i_seed=5, i_length=120)
+    f_mean, f_std = float(np.mean(arr_input)), float(np.std(arr_input))
+    sr = StreamingNelsonRules(f_mean=f_mean, f_std=f_std, d_rule_settings=d_rule_settings)
+    d_fired = {s_rule: [] for s_rule in ["rule1", "rule2", "rule3", "rule4", "rule5", "rule6", "rule7", "rule8"]}
+    for i in range(arr_input.shape[0] - 1):
+        t_fired = sr.update(arr_input[i])
+        d_results = evaluate_prefix(arr_input[: i + 1], f_mean, f_std).d_results
+        d_results_next = evaluate_prefix(arr_input[: i + 2], f_mean, f_std).d_results
+        for s_rule in ["rule1", "rule2", "rule3", "rule4", "rule7"]:
+            assert (s_rule in t_fired) == bool(d_results[s_rule][i]), (s_rule, i)
+        for s_rule, s_key in [("rule5", "rule5_windows"), ("rule6", "rule6_windows"), ("rule8", "rule8")]:
+            assert (s_rule in t_fired) == bool(d_results_next[s_key][i]), (s_rule, i)
+        for s_rule in t_fired:
+            d_fired[s_rule].append(i)
+    assert all(len(l_indices) > 0 for l_indices in d_fired.values())
+
+
+def test_streaming_returnsFiredRules() -> None:
+    """
+    Test streaming: Out-Of-Control data point triggers rule 1 only.
+    :return: Not applicable
+    """
+    sr = StreamingNelsonRules(f_mean=0.0, f_std=1.0)
+    assert sr.update(0.5) == ()
+    assert sr.update(-3.5) == ("rule1",)
+    assert sr.i_count == 2
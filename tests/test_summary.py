@@ -0,0 +1,82 @@
+__author__ = "Regenplatz"
+__version__ = "1.0.0"
+
+
+import numpy as np
+import pandas as pd
+from src.nelson_rules.batch import BatchNelsonRules
+from src.nelson_rules.nelson_rules import NelsonRules, l_rule_results
+from test_kernels import generate_input_data
+
+
+def expected_summary(arr_input: np.ndarray) -> pd.DataFrame:
+    """
+    Aggregate the result dictionary and the intervals of a series.
+    :return: DataFrame of expected aggregates per rule result
+    """
+    d_results = NelsonRules(arr_input).apply_rules()
+    arr_intervals = NelsonRules(arr_input).apply_rules(s_output="intervals")
+    l_records = []
+    for s_key in l_rule_results:
+        arr_points = np.flatnonzero(d_results[s_key])
+        l_records.append({"result": s_key, "points": arr_points.shape[0],
+                          "events": int(np.sum(arr_intervals["rule"] == s_key)),
+                          "first": arr_points[0] if arr_points.shape[0] > 0 else pd.NA,
+                          "last": arr_points[-1] if arr_points.shape[0] > 0 else pd.NA})
+    return pd.DataFrame(l_records)
+
+
+def test_summarize_identicalToResults() -> None:
+    """
+    Test that the summary equals the aggregated result dictionary and intervals.
+    :return: Not applicable
+    """
+    for i_seed in range(5):
+        arr_input = generate_input_data(i_seed=i_seed, i_length=600)
+        df_summary = NelsonRules(arr_input).summarize()
+        df_expected = expected_summary(arr_input)
+        for s_column in ["points", "events", "first", "last"]:
+            assert list(df_summary[s_column]) == list(df_expected[s_column]), s_column
+        assert list(df_summary["result"]) == l_rule_results
+
+
+def test_summarize_selectedRules() -> None:
+    """
+    Test that the summary contains the selected rules only, and no result arrays are stored.
+    :return: Not applicable
+    """
+    nr = NelsonRules(generate_input_data(i_seed=1, i_length=200))
+    df_summary = nr.summarize(rules=["rule6", "rule2"])
+    assert list(df_summary["result"]) == ["rule2", "rule6_points", "rule6_windows"]
+    assert list(nr.d_results) == ["input_data"]
+    assert nr.summarize(rules=[]).shape == (0, 5)
+
+
+def test_batch_summarizePerSeries() -> None:
+    """
+    Test that the batch summary equals the summary of each series, with indices relative to each series.
+    :return: Not applicable
+    """
+    arr_input = generate_input_data(i_seed=2, i_length=1000)
+    l_series = np.split(arr_input, [0, 5, 300, 300, 700])
+    df_summary = BatchNelsonRules(l_series).summarize()
+    assert df_summary.shape[0] == len(l_series) * len(l_rule_results)
+    for i_series, arr_series in enumerate(l_series):
+        df_series = df_summary[df_summary["series"] == i_series].drop(columns="series").reset_index(drop=True)
+        if arr_series.shape[0] > 0:
+            pd.testing.assert_frame_equal(df_series, NelsonRules(arr_series).summarize())
+        else:
+            assert (df_series["points"] == 0).all()
+
+
+def test_batch_summarizeFromFrame() -> None:
+    """
+    Test that the summary of a DataFrame evaluation contains the group columns.
+    :return: Not applicable
+    """
+    df = pd.DataFrame({"machine": np.repeat(["m2", "m1"], 150), "value": generate_input_data(i_seed=3, i_length=300)})
+    df_summary = BatchNelsonRules.from_frame(df, by="machine", value="value").summarize(rules=["rule2"])
+    assert list(df_summary.columns) == ["series", "machine", "result", "points", "events", "first", "last"]
+    assert list(df_summary["machine"]) == ["m2", "m1"]
+    assert list(df_summary["points"]) == [NelsonRules(df["value"].to_numpy()[:150]).summarize(["rule2"])["points"][0],
+                                          NelsonRules(df["value"].to_numpy()[150:]).summarize(["rule2"])["points"][0]]
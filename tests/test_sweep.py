@@ -0,0 +1,81 @@
+__author__ = "Regenplatz"
+__version__ = "1.0.0"
+
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.nelson_rules.batch import BatchNelsonRules
+from src.nelson_rules.nelson_rules import NelsonRules
+from test_kernels import generate_input_data
+
+
+d_grid = {
+    "rule1": {"f_std": [2.0, 3.0]},
+    "rule2": {"i_points": range(3, 10)},
+    "rule3": {"i_points": [0, 1, 2, 3, 4, 6]},
+    "rule4": {"i_points": [3, 5, 14]},
+    "rule5": {"i_points": [1, 2], "i_points_window": [2, 3], "f_std": 2.0},
+    "rule6": {"i_points": 3, "f_std": [0.5, 1.0]},
+    "rule7": {"i_points": [4, 15]},
+    "rule8": {"i_points": [2, 8], "f_std": [0.5, 1.0]},
+}
+
+
+def evaluate_cell(nr_new, row: pd.Series) -> None:
+    """
+    Check a row of the sweep against a single evaluation with the settings of this row.
+    :param nr_new: function creating a NelsonRules object with the given rule settings
+    :param row: row of the sweep
+    """
+    d_settings = {s_setting: row[s_setting].item() if hasattr(row[s_setting], "item") else row[s_setting]
+                  for s_setting in ["i_points", "i_points_window", "f_std"] if not pd.isna(row[s_setting])}
+    d_results = nr_new({row["rule"]: d_settings}).apply_rules(rules=[row["rule"]])
+    arr_intervals = nr_new({row["rule"]: d_settings}).apply_rules(s_output="intervals", rules=[row["rule"]])
+    s_message = f"{row['result']} {d_settings}"
+    assert np.array_equal(row["mask"], d_results[row["result"]].astype(bool)), s_message
+    assert row["points"] == d_results[row["result"]].sum(), s_message
+    assert row["events"] == np.sum(arr_intervals["rule"] == row["result"]), s_message
+
+
+def test_sweep_identicalToSingleEvaluations() -> None:
+    """
+    Test that each row of the sweep equals the evaluation with the settings of this row.
+    :return: Not applicable
+    """
+    arr_input = generate_input_data(i_seed=0, i_length=1000)
+    df_sweep = NelsonRules(arr_input).sweep(d_grid, b_masks=True)
+    assert df_sweep.shape[0] == 2 + 7 + 6 + 3 + 2 * 4 + 2 * 2 + 2 + 4
+    for _, row in df_sweep.iterrows():
+        evaluate_cell(lambda d_rule_settings: NelsonRules(arr_input, d_rule_settings), row)
+
+
+def test_sweep_batchShortSeries() -> None:
+    """
+    Test the sweep of series of which some are shorter than the number of points of a rule.
+    :return: Not applicable
+    """
+    arr_input = generate_input_data(i_seed=2, i_length=400)
+    l_series = np.split(arr_input, [1, 3, 7, 14, 100])
+    df_sweep = BatchNelsonRules(l_series).sweep(d_grid, b_masks=True)
+    for _, row in df_sweep.iterrows():
+        evaluate_cell(lambda d_rule_settings: BatchNelsonRules(l_series, d_rule_settings=d_rule_settings), row)
+
+
+def test_sweep_settingsAndColumns() -> None:
+    """
+    Test that settings not in the grid are taken from the rule settings, and that the grid is validated.
+    :return: Not applicable
+    """
+    nr = NelsonRules(generate_input_data(i_seed=1, i_length=200), {"rule5": {"f_std": 1.5}})
+    df_sweep = nr.sweep({"rule5": {"i_points": [2, 3]}})
+    assert list(df_sweep.columns) == ["rule", "result", "i_points", "i_points_window", "f_std", "points", "events"]
+    assert list(df_sweep["f_std"]) == [1.5] * 4
+    assert list(df_sweep["i_points_window"]) == [2] * 4
+
+    with pytest.raises(ValueError):
+        nr.sweep({"rule9": {"i_points": [2]}})
+    with pytest.raises(ValueError):
+        nr.sweep({"rule2": {"f_std": [2.0]}})
+    with pytest.raises(ValueError):
+        nr.sweep({"rule2": {"i_points": [-1]}})